@@ -0,0 +1,109 @@
+"""
+Benchmark of ring buffer ArrayManager against shifting arrays on every bar.
+"""
+
+from datetime import datetime
+from time import perf_counter
+
+import numpy as np
+
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.object import BarData
+from vnpy.trader.utility import ArrayManager
+
+
+BAR_COUNT = 200_000
+
+
+class ShiftArrayManager(ArrayManager):
+    """
+    Previous implementation which shifts all arrays by one element on
+    every bar.
+    """
+
+    def __init__(self, size=100):
+        """"""
+        self.count = 0
+        self.size = size
+        self.inited = False
+
+        self._open_array = np.zeros(size)
+        self._high_array = np.zeros(size)
+        self._low_array = np.zeros(size)
+        self._close_array = np.zeros(size)
+        self._volume_array = np.zeros(size)
+
+    def update_bar(self, bar):
+        """"""
+        self.count += 1
+        if not self.inited and self.count >= self.size:
+            self.inited = True
+
+        self._open_array[:-1] = self._open_array[1:]
+        self._high_array[:-1] = self._high_array[1:]
+        self._low_array[:-1] = self._low_array[1:]
+        self._close_array[:-1] = self._close_array[1:]
+        self._volume_array[:-1] = self._volume_array[1:]
+
+        self._open_array[-1] = bar.open_price
+        self._high_array[-1] = bar.high_price
+        self._low_array[-1] = bar.low_price
+        self._close_array[-1] = bar.close_price
+        self._volume_array[-1] = bar.volume
+
+    @property
+    def close_array(self):
+        """"""
+        return self._close_array
+
+
+def create_bars():
+    """"""
+    bars = []
+    prices = np.random.random(BAR_COUNT) + 100
+
+    for price in prices:
+        bar = BarData(
+            gateway_name="BENCH",
+            symbol="rb2001",
+            exchange=Exchange.SHFE,
+            datetime=datetime.now(),
+            interval=Interval.MINUTE,
+            open_price=price,
+            high_price=price,
+            low_price=price,
+            close_price=price,
+            volume=1
+        )
+        bars.append(bar)
+
+    return bars
+
+
+def run_benchmark(am: ArrayManager, bars: list, indicator: bool):
+    """
+    Update bars, and calculate SMA on every bar like strategies do if
+    indicator is True.
+    """
+    start = perf_counter()
+
+    for bar in bars:
+        am.update_bar(bar)
+        if indicator and am.inited:
+            am.sma(10)
+
+    return (perf_counter() - start) / len(bars) * 1_000_000
+
+
+if __name__ == "__main__":
+    bars = create_bars()
+
+    for size in [100, 1000, 10000]:
+        for am_class in [ShiftArrayManager, ArrayManager]:
+            update_cost = run_benchmark(am_class(size), bars, False)
+            total_cost = run_benchmark(am_class(size), bars, True)
+            print(
+                f"{am_class.__name__}(size={size}): "
+                f"update {update_cost:.2f}us, "
+                f"update and SMA {total_cost:.2f}us per bar"
+            )
@@ -0,0 +1,105 @@
+"""
+Memory and throughput benchmark of slotted TickData.
+
+Compares TickData with a dict based dataclass of the same fields, which
+builds vt_symbol in __post_init__ like the previous implementation.
+"""
+
+import tracemalloc
+from dataclasses import field, fields, make_dataclass, MISSING
+from datetime import datetime
+from time import perf_counter
+
+from vnpy.trader.constant import Exchange
+from vnpy.trader.object import TickData
+
+
+TICK_COUNT = 10_000_000
+MEMORY_COUNT = 100_000
+
+
+def post_init(self):
+    """"""
+    self.vt_symbol = f"{self.symbol}.{self.exchange.value}"
+
+
+def create_dict_class():
+    """
+    Create dataclass with same fields as TickData but without slots.
+    """
+    class_fields = []
+    for f in fields(TickData):
+        if f.default is MISSING:
+            class_fields.append((f.name, f.type))
+        else:
+            class_fields.append((f.name, f.type, field(default=f.default)))
+
+    return make_dataclass(
+        "DictTickData",
+        class_fields,
+        namespace={"__post_init__": post_init}
+    )
+
+
+def run_throughput(tick_class: type):
+    """
+    Create ticks one by one and access vt_symbol like handlers do.
+    """
+    dt = datetime.now()
+    start = perf_counter()
+
+    for i in range(TICK_COUNT):
+        tick = tick_class(
+            gateway_name="BENCH",
+            symbol="rb2001",
+            exchange=Exchange.SHFE,
+            datetime=dt,
+            last_price=i,
+            volume=i
+        )
+        tick.vt_symbol
+
+    return TICK_COUNT / (perf_counter() - start)
+
+
+def run_memory(tick_class: type):
+    """
+    Keep ticks in memory and get average size of each one.
+    """
+    dt = datetime.now()
+
+    tracemalloc.start()
+    ticks = []
+    for i in range(MEMORY_COUNT):
+        tick = tick_class(
+            gateway_name="BENCH",
+            symbol="rb2001",
+            exchange=Exchange.SHFE,
+            datetime=dt,
+            last_price=float(i),
+            volume=float(i)
+        )
+        tick.vt_symbol
+        ticks.append(tick)
+
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return size / MEMORY_COUNT
+
+
+if __name__ == "__main__":
+    tick_classes = {
+        "dict": create_dict_class(),
+        "slots": TickData,
+    }
+
+    for name, tick_class in tick_classes.items():
+        size = run_memory(tick_class)
+        rate = run_throughput(tick_class)
+
+        print(
+            f"{name}: {size:.0f} bytes per tick, "
+            f"{size * TICK_COUNT / 1024 / 1024:.0f} MB for {TICK_COUNT} ticks, "
+            f"{rate:.0f} ticks per second"
+        )
@@ -0,0 +1,93 @@
+"""
+Throughput benchmark of event engines.
+
+Pushes tick events of many symbols through the engine and measures the
+time needed for all of them to be processed, with an empty handler and
+with a handler blocked by IO (e.g. database write) on every event.
+"""
+
+from threading import Event as Signal, Lock
+from time import perf_counter, sleep
+
+from vnpy.event import Event, EventEngine, ShardedEventEngine
+from vnpy.trader.constant import Exchange
+from vnpy.trader.event import EVENT_TICK
+from vnpy.trader.object import TickData
+
+
+SYMBOL_COUNT = 300
+IO_SECONDS = 0.0001
+
+
+def generate_ticks():
+    """"""
+    ticks = []
+    for i in range(SYMBOL_COUNT):
+        tick = TickData(
+            symbol=f"symbol{i}",
+            exchange=Exchange.SHFE,
+            datetime=None,
+            gateway_name="BENCH"
+        )
+        ticks.append(tick)
+    return ticks
+
+
+def run_benchmark(
+    event_engine: EventEngine,
+    ticks: list,
+    tick_count: int,
+    io: bool
+):
+    """"""
+    finished = Signal()
+    lock = Lock()
+    count = 0
+
+    def process_tick_event(event: Event):
+        nonlocal count
+
+        if io:
+            sleep(IO_SECONDS)
+
+        with lock:
+            count += 1
+            if count >= tick_count:
+                finished.set()
+
+    event_engine.register(EVENT_TICK, process_tick_event)
+    event_engine.start()
+
+    start = perf_counter()
+
+    for i in range(tick_count):
+        tick = ticks[i % SYMBOL_COUNT]
+        event_engine.put(Event(EVENT_TICK, tick))
+
+    finished.wait()
+    cost = perf_counter() - start
+
+    event_engine.stop()
+    return cost
+
+
+if __name__ == "__main__":
+    ticks = generate_ticks()
+
+    scenarios = [
+        ("empty handler", 200_000, False),
+        ("io handler", 10_000, True),
+    ]
+
+    for scenario, tick_count, io in scenarios:
+        engines = {
+            "EventEngine": EventEngine(),
+            "ShardedEventEngine(workers=4)": ShardedEventEngine(workers=4),
+        }
+
+        for name, event_engine in engines.items():
+            cost = run_benchmark(event_engine, ticks, tick_count, io)
+            print(
+                f"[{scenario}] {name}: {cost:.3f}s, "
+                f"{tick_count / cost:,.0f} events/s"
+            )
@@ -0,0 +1,80 @@
+"""
+Tick-to-handler latency benchmark of queued and inline event engines.
+
+Pushes tick events from a thread simulating callback thread of gateway
+API, and measures the latency from event put to handler called.
+"""
+
+from threading import Event as Signal, Thread
+from time import perf_counter, sleep
+
+from vnpy.event import Event, EventEngine, InlineEventEngine
+from vnpy.trader.constant import Exchange
+from vnpy.trader.event import EVENT_TICK
+from vnpy.trader.object import TickData
+
+
+TICK_COUNT = 10_000
+TICK_INTERVAL = 0.0001
+
+
+def run_benchmark(event_engine: EventEngine):
+    """"""
+    latencies = []
+    finished = Signal()
+
+    def process_tick_event(event: Event):
+        latencies.append(perf_counter() - event.put_time)
+
+        if len(latencies) >= TICK_COUNT:
+            finished.set()
+
+    def push_ticks():
+        for i in range(TICK_COUNT):
+            tick = TickData(
+                symbol="rb2001",
+                exchange=Exchange.SHFE,
+                datetime=None,
+                gateway_name="BENCH"
+            )
+            event = Event(EVENT_TICK, tick)
+            event.put_time = perf_counter()
+            event_engine.put(event)
+
+            # Ticks come one by one instead of in burst
+            sleep(TICK_INTERVAL)
+
+    event_engine.register(EVENT_TICK, process_tick_event)
+    event_engine.start()
+
+    thread = Thread(target=push_ticks)
+    thread.start()
+    thread.join()
+
+    finished.wait()
+    event_engine.stop()
+
+    latencies.sort()
+    return latencies
+
+
+def percentile(latencies: list, p: float):
+    """"""
+    ix = min(int(len(latencies) * p), len(latencies) - 1)
+    return latencies[ix] * 1_000_000
+
+
+if __name__ == "__main__":
+    engines = {
+        "EventEngine": EventEngine(),
+        "InlineEventEngine": InlineEventEngine(),
+    }
+
+    for name, event_engine in engines.items():
+        latencies = run_benchmark(event_engine)
+        print(
+            f"{name}: "
+            f"p50 {percentile(latencies, 0.5):.1f}us, "
+            f"p99 {percentile(latencies, 0.99):.1f}us, "
+            f"max {latencies[-1] * 1_000_000:.1f}us"
+        )
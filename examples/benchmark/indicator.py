@@ -0,0 +1,76 @@
+"""
+Per-bar cost of streaming indicators compared with talib on ArrayManager.
+"""
+
+import random
+from datetime import datetime
+from time import perf_counter
+
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.indicator import AtrIndicator, MacdIndicator, RsiIndicator
+from vnpy.trader.object import BarData
+from vnpy.trader.utility import ArrayManager
+
+
+BAR_COUNT = 100_000
+SIZE = 1000
+
+
+def create_bars():
+    """"""
+    bars = []
+    price = 100
+    dt = datetime.now()
+
+    for i in range(BAR_COUNT):
+        price += random.gauss(0, 1)
+        bar = BarData(
+            gateway_name="BENCH",
+            symbol="rb2001",
+            exchange=Exchange.SHFE,
+            datetime=dt,
+            interval=Interval.MINUTE,
+            open_price=price,
+            high_price=price + 1,
+            low_price=price - 1,
+            close_price=price
+        )
+        bars.append(bar)
+
+    return bars
+
+
+def run_talib(bars: list):
+    """"""
+    am = ArrayManager(SIZE)
+
+    start = perf_counter()
+    for bar in bars:
+        am.update_bar(bar)
+        am.atr(14)
+        am.rsi(14)
+        am.macd(12, 26, 9)
+
+    return (perf_counter() - start) / BAR_COUNT
+
+
+def run_streaming(bars: list):
+    """"""
+    am = ArrayManager(SIZE)
+    am.add_indicator(AtrIndicator(14))
+    am.add_indicator(RsiIndicator(14))
+    am.add_indicator(MacdIndicator(12, 26, 9))
+
+    start = perf_counter()
+    for bar in bars:
+        am.update_bar(bar)
+
+    return (perf_counter() - start) / BAR_COUNT
+
+
+if __name__ == "__main__":
+    bars = create_bars()
+
+    for name, func in [("talib", run_talib), ("streaming", run_streaming)]:
+        cost = func(bars)
+        print(f"{name}: {cost * 1_000_000:.1f}us per bar")
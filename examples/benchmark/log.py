@@ -0,0 +1,38 @@
+"""
+Cost of processing log event on event engine thread, with log written
+into file by LogEngine.
+"""
+
+from time import perf_counter
+
+from vnpy.event import Event, EventEngine
+from vnpy.trader.engine import MainEngine
+from vnpy.trader.event import EVENT_LOG
+from vnpy.trader.object import LogData
+from vnpy.trader.setting import SETTINGS
+
+
+LOG_COUNT = 100000
+
+
+if __name__ == "__main__":
+    SETTINGS["log.level"] = 0
+    SETTINGS["log.console"] = False
+
+    main_engine = MainEngine(EventEngine())
+    log_engine = main_engine.get_engine("log")
+
+    events = [
+        Event(EVENT_LOG, LogData(msg=f"benchmark log {i}", gateway_name="BENCH"))
+        for i in range(LOG_COUNT)
+    ]
+
+    start = perf_counter()
+    for event in events:
+        log_engine.process_log_event(event)
+    cost = perf_counter() - start
+
+    main_engine.close()
+
+    print(f"process_log_event: {cost / LOG_COUNT * 1e6:.2f}us per log")
+    print(f"written: {log_engine.written_count}, dropped: {log_engine.dropped_count}")
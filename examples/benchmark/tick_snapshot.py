@@ -0,0 +1,103 @@
+"""
+Benchmark of pushing ticks from a gateway with copy and with TickManager.
+
+Simulates depth updates of a websocket gateway: every update changes a
+few fields of the latest tick and pushes it.
+"""
+
+from copy import copy
+from datetime import datetime
+from time import perf_counter
+
+from vnpy.trader.constant import Exchange
+from vnpy.trader.gateway import TickManager
+from vnpy.trader.object import TickData
+
+
+UPDATE_COUNT = 1_000_000
+
+
+class BenchGateway:
+    """"""
+
+    def __init__(self):
+        """"""
+        self.tick = None
+
+    def on_tick(self, tick: TickData):
+        """"""
+        self.tick = tick
+
+
+def create_tick():
+    """"""
+    return TickData(
+        gateway_name="BENCH",
+        symbol="XBTUSD",
+        exchange=Exchange.BITMEX,
+        datetime=datetime.now()
+    )
+
+
+def run_copy(gateway: BenchGateway, count: int):
+    """
+    Update cached tick and push a copy of it, like gateways did before.
+    """
+    tick = create_tick()
+
+    for i in range(count):
+        tick.bid_price_1 = i
+        tick.ask_price_1 = i
+        gateway.on_tick(copy(tick))
+
+
+def run_manager(gateway: BenchGateway, count: int):
+    """
+    Update and push tick with copy-on-write TickManager.
+    """
+    manager = TickManager(gateway)
+    manager.add_tick(create_tick())
+
+    for i in range(count):
+        tick = manager.update_tick("XBTUSD")
+        tick.bid_price_1 = i
+        tick.ask_price_1 = i
+        manager.push_tick("XBTUSD")
+
+
+def run_default_copy(gateway: BenchGateway, count: int):
+    """
+    Same as run_copy, but with copy by reduce protocol like TickData
+    without __copy__.
+    """
+    tick = create_tick()
+    reduce = TickData.__reduce_ex__
+
+    for i in range(count):
+        tick.bid_price_1 = i
+        tick.ask_price_1 = i
+
+        func, args, state, _, _ = reduce(tick, 4)
+        new_tick = func(*args)
+        for slots in state:
+            if slots:
+                for key, value in slots.items():
+                    setattr(new_tick, key, value)
+        gateway.on_tick(new_tick)
+
+
+if __name__ == "__main__":
+    funcs = {
+        "copy by reduce": run_default_copy,
+        "copy": run_copy,
+        "TickManager": run_manager,
+    }
+
+    for name, func in funcs.items():
+        gateway = BenchGateway()
+
+        start = perf_counter()
+        func(gateway, UPDATE_COUNT)
+        cost = (perf_counter() - start) / UPDATE_COUNT * 1_000_000
+
+        print(f"{name}: {cost:.2f}us per update")
@@ -0,0 +1,65 @@
+"""
+Warm-up time of ArrayManager of 15 minute bars with 30 days of 1 minute
+bars, pushed bar by bar or updated in one batch.
+"""
+
+from datetime import datetime, timedelta
+from time import perf_counter
+
+import numpy as np
+
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.object import BarBatch
+from vnpy.trader.utility import ArrayManager, BarGenerator, resample_bar_batch
+
+
+BAR_COUNT = 30 * 24 * 60
+
+
+def create_batch():
+    """"""
+    data = np.zeros(BAR_COUNT, dtype=BarBatch.dtype)
+
+    start = datetime(2019, 1, 1)
+    data["datetime"] = [start + timedelta(minutes=i) for i in range(BAR_COUNT)]
+
+    price = 3000 + np.cumsum(np.random.normal(size=BAR_COUNT))
+    data["open_price"] = price
+    data["high_price"] = price + 1
+    data["low_price"] = price - 1
+    data["close_price"] = price
+    data["volume"] = 100
+
+    return BarBatch("rb2001", Exchange.SHFE, Interval.MINUTE, data, "BENCH")
+
+
+def run_callback(batch: BarBatch):
+    """
+    Like CtaEngine.load_bar, which creates BarData objects and calls
+    on_bar of strategy with each one.
+    """
+    start = perf_counter()
+
+    am = ArrayManager()
+    generator = BarGenerator(None, 15, am.update_bar)
+    for bar in batch:
+        generator.update_bar(bar)
+
+    return perf_counter() - start
+
+
+def run_batch(batch: BarBatch):
+    """"""
+    start = perf_counter()
+
+    am = ArrayManager()
+    am.update_batch(resample_bar_batch(batch, 15))
+
+    return perf_counter() - start
+
+
+if __name__ == "__main__":
+    batch = create_batch()
+
+    print(f"callback: {run_callback(batch) * 1000:.1f}ms")
+    print(f"batch: {run_batch(batch) * 1000:.1f}ms")
@@ -0,0 +1,256 @@
+"""
+Test if shared bar aggregation and backtesting of cta strategy work fine
+"""
+import unittest
+from datetime import datetime, timedelta
+
+from vnpy.app.cta_strategy import CtaTemplate
+from vnpy.app.cta_strategy.aggregator import BarAggregator
+from vnpy.app.cta_strategy.backtesting import BacktestingEngine
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.object import BarData, TickData, BarBatch
+
+
+class TestBarAggregator(unittest.TestCase):
+
+    def setUp(self):
+        self.received = []
+        self.aggregator = BarAggregator(self.dispatch)
+
+    def dispatch(self, strategy, callback, bar):
+        self.received.append((strategy, bar))
+        callback(bar)
+
+    def create_tick(self, dt: datetime, price: float):
+        return TickData(
+            gateway_name="TEST",
+            symbol="rb2001",
+            exchange=Exchange.SHFE,
+            datetime=dt,
+            last_price=price,
+            volume=price
+        )
+
+    def test_shared(self):
+        bars_a = []
+        bars_b = []
+
+        am_a = self.aggregator.subscribe("a", "rb2001.SHFE", bars_a.append, 5, size=10)
+        am_b = self.aggregator.subscribe("b", "rb2001.SHFE", bars_b.append, 5, size=10)
+        self.assertIs(am_a, am_b)
+
+        minute_bars = []
+        self.aggregator.subscribe("c", "rb2001.SHFE", minute_bars.append)
+
+        start = datetime(2019, 12, 2, 9)
+        for i in range(10 * 60):
+            tick = self.create_tick(start + timedelta(seconds=i), i)
+            self.aggregator.update_tick(tick)
+
+        # 9 finished 1 minute bars, 1 finished 5 minute bar
+        self.assertEqual(len(minute_bars), 9)
+        self.assertEqual(len(bars_a), 1)
+        self.assertIs(bars_a[0], bars_b[0])
+        self.assertEqual(bars_a[0].high_price, 299)
+        self.assertEqual(am_a.count, 1)
+
+        self.aggregator.unsubscribe("b")
+        for i in range(10 * 60, 11 * 60):
+            tick = self.create_tick(start + timedelta(seconds=i), i)
+            self.aggregator.update_tick(tick)
+
+        self.assertEqual(len(bars_a), 2)
+        self.assertEqual(len(bars_b), 1)
+
+    def test_history(self):
+        history = []
+        start = datetime(2019, 12, 2, 9)
+        for i in range(30):
+            bar = BarData(
+                gateway_name="TEST",
+                symbol="rb2001",
+                exchange=Exchange.SHFE,
+                datetime=start + timedelta(minutes=i),
+                interval=Interval.MINUTE,
+                close_price=i
+            )
+            history.append(bar)
+
+        loaded = []
+
+        def load_history():
+            loaded.append(1)
+            return BarBatch.from_list(history)
+
+        am = self.aggregator.subscribe(
+            "a", "rb2001.SHFE", print, 15, size=2, load_history=load_history
+        )
+        self.aggregator.subscribe(
+            "b", "rb2001.SHFE", print, 15, size=2, load_history=load_history
+        )
+
+        # History is only loaded once for the shared array manager
+        self.assertEqual(len(loaded), 1)
+        self.assertTrue(am.inited)
+        self.assertEqual(list(am.close), [14, 29])
+        self.assertFalse(self.received)
+
+    def test_continue(self):
+        start = datetime(2019, 12, 2, 9)
+        bars = []
+        for i in range(28):
+            bar = BarData(
+                gateway_name="TEST",
+                symbol="rb2001",
+                exchange=Exchange.SHFE,
+                datetime=start + timedelta(minutes=i),
+                interval=Interval.MINUTE,
+                open_price=i,
+                high_price=i,
+                low_price=i,
+                close_price=i
+            )
+            bars.append(bar)
+
+        window_bars = []
+        am = self.aggregator.subscribe(
+            "a", "rb2001.SHFE", window_bars.append, 4, size=3,
+            load_history=lambda: BarBatch.from_list(bars[:26])
+        )
+        self.assertEqual(list(am.close), [15, 19, 23])
+
+        # Live bars continue from unfinished window bar of history
+        for bar in bars[26:]:
+            self.aggregator.update_bar(bar)
+
+        self.assertEqual(len(window_bars), 1)
+        self.assertEqual(window_bars[0].open_price, 24)
+        self.assertEqual(list(am.close), [19, 23, 27])
+
+    def test_source_interval(self):
+        aggregator = BarAggregator(self.dispatch, Interval.HOUR)
+
+        hour_bars = []
+        aggregator.subscribe("a", "rb2001.SHFE", hour_bars.append, 1, Interval.HOUR)
+
+        # Bars of other timeframes cannot be generated from hour bars
+        with self.assertRaises(ValueError):
+            aggregator.subscribe("a", "rb2001.SHFE", hour_bars.append, 5)
+        with self.assertRaises(ValueError):
+            aggregator.subscribe("a", "rb2001.SHFE", hour_bars.append, 4, Interval.HOUR)
+
+        bar = BarData(
+            gateway_name="TEST",
+            symbol="rb2001",
+            exchange=Exchange.SHFE,
+            datetime=datetime(2019, 12, 2, 9),
+            interval=Interval.HOUR
+        )
+        aggregator.update_bar(bar)
+        self.assertEqual(hour_bars, [bar])
+
+
+class SwingStrategy(CtaTemplate):
+    """
+    Buy with stop order and sell with limit order alternately.
+    """
+
+    def on_init(self):
+        self.load_bar(1)
+
+    def on_bar(self, bar: BarData):
+        self.cancel_all()
+
+        if not self.pos:
+            self.buy(bar.close_price + 1, 1, stop=True)
+        else:
+            self.sell(bar.close_price - 1, 1)
+
+
+class HourStrategy(CtaTemplate):
+    """
+    Record hour bars pushed by on_bar and by subscribed bar stream.
+    """
+
+    def on_init(self):
+        self.bars = []
+        self.subscribed_bars = []
+        self.am = self.subscribe_bar(
+            self.subscribed_bars.append, 1, Interval.HOUR, size=10
+        )
+        self.load_bar(1)
+
+    def on_bar(self, bar: BarData):
+        if self.trading:
+            self.bars.append(bar)
+
+
+class TestBacktesting(unittest.TestCase):
+
+    def create_engine(self, interval: Interval):
+        engine = BacktestingEngine()
+        engine.output = lambda msg: None
+        engine.set_parameters(
+            vt_symbol="rb2001.SHFE",
+            interval=interval,
+            start=datetime(2019, 12, 2),
+            end=datetime(2019, 12, 5),
+            rate=0,
+            slippage=0,
+            size=10,
+            pricetick=1,
+            capital=100000
+        )
+        return engine
+
+    def create_bar(self, dt: datetime, interval: Interval, price: float):
+        return BarData(
+            gateway_name="TEST",
+            symbol="rb2001",
+            exchange=Exchange.SHFE,
+            interval=interval,
+            datetime=dt,
+            open_price=price,
+            high_price=price + 5,
+            low_price=price - 5,
+            close_price=price,
+            volume=1
+        )
+
+    def test_run_backtesting(self):
+        engine = self.create_engine(Interval.MINUTE)
+        engine.add_strategy(SwingStrategy, {})
+
+        start = datetime(2019, 12, 2, 9)
+        for i in range(3 * 24 * 60):
+            price = 3000 + (i % 10) * 2
+            dt = start + timedelta(minutes=i)
+            engine.history_data.append(self.create_bar(dt, Interval.MINUTE, price))
+
+        engine.run_backtesting()
+
+        trades = engine.get_all_trades()
+        self.assertTrue(trades)
+        self.assertIsNotNone(engine.get_all_orders()[0].datetime)
+        self.assertEqual(len(engine.calculate_result()), 3)
+
+    def test_hour_bar(self):
+        engine = self.create_engine(Interval.HOUR)
+        engine.add_strategy(HourStrategy, {})
+
+        start = datetime(2019, 12, 2, 9)
+        for i in range(3 * 24):
+            dt = start + timedelta(hours=i)
+            engine.history_data.append(self.create_bar(dt, Interval.HOUR, 3000 + i))
+
+        engine.run_backtesting()
+
+        # Hour bars pushed as they are instead of aggregated as minute bars
+        strategy = engine.strategy
+        self.assertTrue(strategy.bars)
+        self.assertEqual(strategy.subscribed_bars, strategy.bars)
+        self.assertEqual(strategy.am.close[-1], strategy.bars[-1].close_price)
+
+
+if __name__ == '__main__':
+    unittest.main()
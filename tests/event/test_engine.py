@@ -0,0 +1,600 @@
+"""
+Test if event engines work fine
+"""
+import asyncio
+import os
+import pickle
+import tempfile
+import time
+import unittest
+import weakref
+from threading import Event as Signal, Lock, Thread
+
+from vnpy.event import (
+    AsyncEventEngine,
+    Event,
+    EventEngine,
+    EventJournal,
+    OVERLOAD_CONFLATE,
+    OVERLOAD_DROP_OLDEST,
+    EventReplayer,
+    InlineEventEngine,
+    ShardedEventEngine,
+    PRIORITY_HIGH,
+    PRIORITY_MEDIUM,
+    read_journal
+)
+from vnpy.event.engine import LaneQueue, get_handler_name
+from vnpy.trader.constant import Exchange, Status
+from vnpy.trader.event import EVENT_ORDER, EVENT_TICK
+from vnpy.trader.object import OrderData, TickData
+
+EVENT_TEST = "eTest"
+EVENT_DONE = "eDone"
+WAIT_SECONDS = 5
+
+
+def create_tick(symbol: str):
+    return TickData(
+        gateway_name="TEST",
+        symbol=symbol,
+        exchange=Exchange.SHFE,
+        datetime=None
+    )
+
+
+def create_order(orderid: str, status: Status):
+    return OrderData(
+        gateway_name="TEST",
+        symbol="rb2001",
+        exchange=Exchange.SHFE,
+        orderid=orderid,
+        status=status
+    )
+
+
+class TestEventEngine(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.event_engine = EventEngine()
+        self.event_engine.start()
+
+    def tearDown(self) -> None:
+        self.event_engine.stop()
+
+    def test_register_and_put(self):
+        received = []
+        finished = Signal()
+
+        def handler(event: Event):
+            received.append(event.data)
+            if len(received) == 3:
+                finished.set()
+
+        self.event_engine.register(EVENT_TEST, handler)
+        for i in range(3):
+            self.event_engine.put(Event(EVENT_TEST, i))
+
+        self.assertTrue(finished.wait(WAIT_SECONDS))
+        self.assertEqual(received, [0, 1, 2])
+
+    def test_topic(self):
+        received = []
+        finished = Signal()
+
+        def process_symbol_event(event: Event):
+            received.append(event.data.symbol)
+
+        # Handler registered before topic should also be indexed
+        self.event_engine.register(EVENT_TICK + "a.SHFE", process_symbol_event)
+        self.event_engine.register_topic(EVENT_TICK, "vt_symbol")
+        self.event_engine.register(EVENT_TICK + "b.SHFE", process_symbol_event)
+        self.event_engine.register(EVENT_TEST, lambda event: finished.set())
+
+        for symbol in ["a", "b", "c", "a"]:
+            self.event_engine.put(Event(EVENT_TICK, create_tick(symbol)))
+        self.event_engine.put(Event(EVENT_TEST))
+
+        self.assertTrue(finished.wait(WAIT_SECONDS))
+        self.assertEqual(received, ["a", "b", "a"])
+
+        self.event_engine.unregister(EVENT_TICK + "a.SHFE", process_symbol_event)
+        self.assertNotIn("a.SHFE", self.event_engine._topic_index[EVENT_TICK])
+
+    def test_stats(self):
+        finished = Signal()
+
+        def handler(event: Event):
+            pass
+
+        self.event_engine.start_stats()
+        self.event_engine.register(EVENT_TEST, handler)
+        self.event_engine.register(EVENT_DONE, lambda event: finished.set())
+
+        for i in range(10):
+            self.event_engine.put(Event(EVENT_TEST, i))
+        self.event_engine.put(Event(EVENT_DONE))
+        self.assertTrue(finished.wait(WAIT_SECONDS))
+
+        stats = self.event_engine.get_stats()
+        self.assertEqual(stats["delay"]["count"], 11)
+
+        handler_stats = stats["handlers"][0]
+        self.assertEqual(handler_stats["type"], EVENT_TEST)
+        self.assertIn("handler", handler_stats["handler"])
+        self.assertEqual(handler_stats["count"], 10)
+        self.assertEqual(sum(handler_stats["histogram"].values()), 10)
+
+        # Handlers of the same qualname are not merged
+        lambdas = [lambda event: None for i in range(2)]
+        self.assertNotEqual(get_handler_name(lambdas[0]), get_handler_name(lambdas[1]))
+
+        class Monitor:
+            def process_event(self, event: Event):
+                pass
+
+        monitor_1, monitor_2 = Monitor(), Monitor()
+        self.assertEqual(
+            get_handler_name(monitor_1.process_event),
+            get_handler_name(monitor_1.process_event)
+        )
+        self.assertNotEqual(
+            get_handler_name(monitor_1.process_event),
+            get_handler_name(monitor_2.process_event)
+        )
+        self.assertIn("Monitor.process_event", get_handler_name(monitor_1.process_event))
+
+        # No more statistics recorded after stopped
+        self.event_engine.stop_stats()
+        finished.clear()
+
+        for i in range(10):
+            self.event_engine.put(Event(EVENT_TEST, i))
+        self.event_engine.put(Event(EVENT_DONE))
+        self.assertTrue(finished.wait(WAIT_SECONDS))
+
+        stats = self.event_engine.get_stats()
+        self.assertEqual(stats["handlers"][0]["count"], 10)
+
+    def test_scheduler(self):
+        calls = []
+        finished = Signal()
+
+        def callback():
+            calls.append("every")
+            if len(calls) == 5:
+                timer.cancel()
+                self.event_engine.call_later(0.05, finished.set)
+
+        timer = self.event_engine.call_every(0.01, callback)
+        cancelled = self.event_engine.call_later(0.01, lambda: calls.append("later"))
+        cancelled.cancel()
+
+        self.assertTrue(finished.wait(WAIT_SECONDS))
+        self.assertEqual(calls, ["every"] * 5)
+
+
+class TestBatchEventEngine(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.event_engine = EventEngine(batch_size=1000)
+        self.event_engine.set_conflation(EVENT_TICK, "vt_symbol")
+
+    def tearDown(self) -> None:
+        self.event_engine.stop()
+
+    def test_conflation(self):
+        all_ticks = []
+        latest_ticks = []
+        orders = []
+        finished = Signal()
+
+        self.event_engine.register(
+            EVENT_TICK, lambda event: all_ticks.append(event.data)
+        )
+        self.event_engine.register(
+            EVENT_TICK, lambda event: latest_ticks.append(event.data), conflate=True
+        )
+        self.event_engine.register(
+            EVENT_ORDER, lambda event: orders.append(event.data)
+        )
+        self.event_engine.register(EVENT_TEST, lambda event: finished.set())
+
+        # Put events before start so that they are drained in one batch
+        for i in range(10):
+            for symbol in ["a", "b"]:
+                tick = create_tick(symbol)
+                tick.volume = i
+                self.event_engine.put(Event(EVENT_TICK, tick))
+
+            order = create_order(str(i), Status.SUBMITTING)
+            self.event_engine.put(Event(EVENT_ORDER, order))
+        self.event_engine.put(Event(EVENT_TEST))
+
+        self.event_engine.start()
+        self.assertTrue(finished.wait(WAIT_SECONDS))
+
+        # Handler not registered with conflate receives every tick
+        self.assertEqual(
+            [(tick.symbol, tick.volume) for tick in all_ticks],
+            [(symbol, i) for i in range(10) for symbol in ["a", "b"]]
+        )
+        self.assertEqual(len(orders), 10)
+        self.assertEqual(
+            [(tick.symbol, tick.volume) for tick in latest_ticks],
+            [("a", 9), ("b", 9)]
+        )
+
+
+class TestPriorityEventEngine(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.event_engine = EventEngine(priority=True)
+        self.event_engine.set_priority(EVENT_ORDER, PRIORITY_HIGH)
+        self.event_engine.set_priority(EVENT_TICK, PRIORITY_MEDIUM)
+
+    def tearDown(self) -> None:
+        self.event_engine.stop()
+
+    def test_priority(self):
+        received = []
+        finished = Signal()
+
+        self.event_engine.register(EVENT_TICK, lambda event: received.append("tick"))
+        self.event_engine.register(EVENT_ORDER, lambda event: received.append("order"))
+        self.event_engine.register(EVENT_TEST, lambda event: finished.set())
+
+        # Put events before start so that they are waiting in queue
+        self.event_engine.put(Event(EVENT_TEST))
+        for i in range(3):
+            self.event_engine.put(Event(EVENT_TICK, create_tick("a")))
+        self.event_engine.put(Event(EVENT_ORDER, create_order("1", Status.SUBMITTING)))
+
+        self.event_engine.start()
+        self.assertTrue(finished.wait(WAIT_SECONDS))
+        self.assertEqual(received, ["order", "tick", "tick", "tick"])
+
+        lanes = self.event_engine.get_lane_stats()
+        self.assertEqual([lane["put_count"] for lane in lanes], [1, 3, 1])
+        self.assertEqual([lane["max_size"] for lane in lanes], [1, 3, 1])
+
+
+class TestLaneQueue(unittest.TestCase):
+
+    def test_starvation(self):
+        queue = LaneQueue({EVENT_ORDER: 0}, lane_count=2, starvation_limit=3)
+
+        for i in range(6):
+            queue.put(Event(EVENT_ORDER, i))
+        queue.put(Event(EVENT_TEST, "low"))
+
+        result = [queue.get_nowait().data for i in range(7)]
+        self.assertEqual(result, [0, 1, 2, "low", 3, 4, 5])
+        self.assertEqual(queue.get_stats()[1]["starved_count"], 1)
+
+    def test_overload(self):
+        queue = LaneQueue(
+            {},
+            lane_count=1,
+            maxsize=3,
+            policies={
+                EVENT_TICK: OVERLOAD_CONFLATE,
+                EVENT_TEST: OVERLOAD_DROP_OLDEST
+            },
+            conflation_keys={EVENT_TICK: "vt_symbol"}
+        )
+
+        queue.put(Event(EVENT_TICK, create_tick("rb2001")))
+        queue.put(Event(EVENT_TEST, 0))
+        queue.put(Event(EVENT_TEST, 1))
+
+        # Tick of same key replaces the queued one
+        tick = create_tick("rb2001")
+        queue.put(Event(EVENT_TICK, tick))
+        # Tick of new key is still put
+        queue.put(Event(EVENT_TICK, create_tick("ag2001")))
+        # The oldest event of same type is dropped
+        queue.put(Event(EVENT_TEST, 2))
+
+        result = [queue.get_nowait().data for i in range(4)]
+        self.assertIs(result[0], tick)
+        self.assertEqual(result[1], 1)
+        self.assertEqual(result[2].symbol, "ag2001")
+        self.assertEqual(result[3], 2)
+
+        stats = queue.get_overload_stats()
+        self.assertEqual(stats["conflated"], {EVENT_TICK: 1})
+        self.assertEqual(stats["overflow"], {EVENT_TICK: 1})
+        self.assertEqual(stats["dropped"], {EVENT_TEST: 1})
+
+        # Orders are blocked until queue not full
+        for i in range(3):
+            queue.put(Event(EVENT_ORDER, i))
+
+        thread = Thread(target=queue.put, args=(Event(EVENT_ORDER, 3),))
+        thread.start()
+        thread.join(0.1)
+        self.assertTrue(thread.is_alive())
+
+        self.assertEqual(queue.get_nowait().data, 0)
+        thread.join(WAIT_SECONDS)
+
+        result = [queue.get_nowait().data for i in range(3)]
+        self.assertEqual(result, [1, 2, 3])
+        self.assertEqual(queue.get_overload_stats()["blocked"], {EVENT_ORDER: 1})
+
+
+class TestShardedEventEngine(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.event_engine = ShardedEventEngine(workers=4)
+        self.event_engine.start()
+
+    def tearDown(self) -> None:
+        self.event_engine.stop()
+
+    def test_per_key_order(self):
+        symbols = [f"symbol{i}" for i in range(20)]
+        received = {symbol: [] for symbol in symbols}
+        total = len(symbols) * 50
+        count = 0
+        lock = Lock()
+        finished = Signal()
+
+        def process_tick_event(event: Event):
+            nonlocal count
+            tick = event.data
+            received[tick.symbol].append(tick.volume)
+
+            with lock:
+                count += 1
+                if count == total:
+                    finished.set()
+
+        self.event_engine.register(EVENT_TICK, process_tick_event)
+
+        for i in range(50):
+            for symbol in symbols:
+                tick = create_tick(symbol)
+                tick.volume = i
+                self.event_engine.put(Event(EVENT_TICK, tick))
+
+        self.assertTrue(finished.wait(WAIT_SECONDS))
+        for symbol in symbols:
+            self.assertEqual(received[symbol], list(range(50)))
+
+    def test_routing(self):
+        order = create_order("1", Status.SUBMITTING)
+        ix = self.event_engine.get_worker_index(order.vt_orderid)
+
+        received = []
+        finished = Signal()
+
+        def process_order_event(event: Event):
+            received.append(event.data.status)
+            if len(received) == 2:
+                finished.set()
+
+        self.event_engine.register(EVENT_ORDER, process_order_event)
+        self.event_engine.put(Event(EVENT_ORDER, order))
+        self.event_engine.put(
+            Event(EVENT_ORDER, create_order("1", Status.ALLTRADED))
+        )
+
+        self.assertTrue(finished.wait(WAIT_SECONDS))
+        self.assertEqual(received, [Status.SUBMITTING, Status.ALLTRADED])
+        self.assertEqual(ix, self.event_engine.get_worker_index("TEST.1"))
+        self.assertEqual(self.event_engine.get_worker_index(None), 0)
+
+    def test_stats(self):
+        total = 20 * 500
+        count = 0
+        lock = Lock()
+        finished = Signal()
+
+        class Handler:
+            def process_tick_event(self, event: Event):
+                nonlocal count
+                with lock:
+                    count += 1
+                    if count == total:
+                        finished.set()
+
+        handler = Handler()
+        handler_ref = weakref.ref(handler)
+
+        self.event_engine.start_stats()
+        self.event_engine.register(EVENT_TICK, handler.process_tick_event)
+
+        for i in range(500):
+            for j in range(20):
+                self.event_engine.put(Event(EVENT_TICK, create_tick(f"symbol{j}")))
+
+        self.assertTrue(finished.wait(WAIT_SECONDS))
+
+        # No sample lost with workers updating concurrently
+        stats = self.event_engine.get_stats()
+        self.assertEqual(stats["delay"]["count"], total)
+        self.assertEqual(stats["handlers"][0]["count"], total)
+        self.assertIn("process_tick_event", stats["handlers"][0]["handler"])
+
+        # Handler unregistered is not referenced by stats
+        self.event_engine.unregister(EVENT_TICK, handler.process_tick_event)
+        del handler
+        self.assertIsNone(handler_ref())
+
+
+class TestAsyncEventEngine(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.event_engine = AsyncEventEngine()
+        self.event_engine.start()
+
+    def tearDown(self) -> None:
+        if not self.event_engine.get_loop().is_closed():
+            self.event_engine.stop()
+
+    def test_coroutine_handler(self):
+        received = []
+        finished = Signal()
+
+        def handler(event: Event):
+            received.append(("plain", event.data))
+
+        async def coroutine_handler(event: Event):
+            await asyncio.sleep(0.01)
+            received.append(("coroutine", event.data))
+            if event.data == 2:
+                finished.set()
+
+        self.event_engine.register(EVENT_TEST, coroutine_handler)
+        self.event_engine.register(EVENT_TEST, handler)
+
+        # Put from another thread like a gateway
+        def put_events():
+            for i in range(3):
+                self.event_engine.put(Event(EVENT_TEST, i))
+
+        thread = Thread(target=put_events)
+        thread.start()
+        thread.join()
+
+        self.assertTrue(finished.wait(WAIT_SECONDS))
+        self.assertEqual(
+            received,
+            [
+                ("plain", 0), ("coroutine", 0),
+                ("plain", 1), ("coroutine", 1),
+                ("plain", 2), ("coroutine", 2),
+            ]
+        )
+
+    def test_loop_closed(self):
+        loop = self.event_engine.get_loop()
+        self.event_engine.stop()
+        self.assertTrue(loop.is_closed())
+
+        # Put after stopped is ignored instead of raising RuntimeError
+        self.event_engine.put(Event(EVENT_TEST))
+        self.event_engine.call_later(0.01, lambda: None)
+
+
+class TestInlineEventEngine(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.event_engine = InlineEventEngine()
+        self.event_engine.start()
+
+    def tearDown(self) -> None:
+        self.event_engine.stop()
+
+    def test_inline(self):
+        received = []
+
+        def handler(event: Event):
+            received.append(event.data)
+
+            # Event put by handler is processed after the current one
+            if event.data == 0:
+                self.event_engine.put(Event(EVENT_TEST, 2))
+                received.append(1)
+
+        self.event_engine.register(EVENT_TEST, handler)
+        self.event_engine.put(Event(EVENT_TEST, 0))
+
+        # Processed before put returns
+        self.assertEqual(received, [0, 1, 2])
+        self.assertEqual(self.event_engine.get_queue_size(), 0)
+
+    def test_scheduler(self):
+        called = Signal()
+        self.event_engine.call_later(0.01, called.set)
+        self.assertTrue(called.wait(WAIT_SECONDS))
+
+
+class TestEventJournal(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.event_engine = InlineEventEngine()
+        self.event_engine.start()
+
+        fd, self.path = tempfile.mkstemp()
+        os.close(fd)
+        os.remove(self.path)
+
+    def tearDown(self) -> None:
+        self.event_engine.stop()
+
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def test_record_and_replay(self):
+        journal = EventJournal(self.event_engine, self.path, chunk_size=1024)
+        journal.start()
+
+        for i in range(100):
+            self.event_engine.put(Event(EVENT_TICK, create_tick(f"{i}")))
+
+        # Not serializable data is skipped
+        self.event_engine.put(Event(EVENT_TEST, lambda: None))
+        journal.close()
+
+        self.assertEqual(journal.write_count, 100)
+        self.assertEqual(journal.error_count, 1)
+
+        # New records are appended
+        journal = EventJournal(self.event_engine, self.path)
+        journal.start()
+        self.event_engine.put(Event(EVENT_TEST, "last"))
+        journal.close()
+
+        records = list(read_journal(self.path))
+        self.assertEqual(len(records), 101)
+        self.assertEqual(records[0][1].data.symbol, "0")
+        self.assertEqual(records[-1][1].data, "last")
+
+        timestamps = [timestamp for timestamp, event in records]
+        self.assertEqual(timestamps, sorted(timestamps))
+
+        received = []
+        replay_engine = InlineEventEngine()
+        replay_engine.register(EVENT_TICK, lambda event: received.append(event.data.symbol))
+        replay_engine.start()
+
+        replayer = EventReplayer(replay_engine, self.path)
+        count = replayer.replay(speed=0)
+        replay_engine.stop()
+
+        self.assertEqual(count, 101)
+        self.assertEqual(received, [f"{i}" for i in range(100)])
+
+    def test_timing(self):
+        journal = EventJournal(self.event_engine, self.path)
+        journal.start()
+
+        self.event_engine.put(Event(EVENT_TEST, 0))
+        time.sleep(0.05)
+        self.event_engine.put(Event(EVENT_TEST, 1))
+        journal.close()
+
+        # Session appended one hour later
+        journal = EventJournal(self.event_engine, self.path)
+        journal.start()
+        payload = pickle.dumps((EVENT_TEST, 2))
+        now = time.monotonic()
+        journal.write(now + 3600, payload)
+        journal.write(now + 3600.1, payload)
+        journal.close()
+
+        records = list(read_journal(self.path))
+        self.assertGreaterEqual(records[1][0] - records[0][0], 0.05)
+
+        # Gap between sessions skipped
+        start = time.perf_counter()
+        count = EventReplayer(self.event_engine, self.path).replay(speed=1)
+        self.assertEqual(count, 4)
+        self.assertLess(time.perf_counter() - start, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,6 +2,7 @@
 import unittest
 
 import app
+import event
 # import your test modules
 import test_import_all
 import trader
@@ -14,6 +15,7 @@ suite = unittest.TestSuite()
 suite.addTests(loader.loadTestsFromModule(test_import_all))
 suite.addTests(loader.loadTestsFromModule(trader))
 suite.addTests(loader.loadTestsFromModule(app))
+suite.addTests(loader.loadTestsFromModule(event))
 
 
 # initialize a runner, pass it your suite and run it
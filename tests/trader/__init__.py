@@ -1,2 +1,7 @@
 from .test_database import *
 from .test_settings import *
+from .test_object import *
+from .test_gateway import *
+from .test_utility import *
+from .test_indicator import *
+from .test_engine import *
@@ -192,6 +192,42 @@ class TestDatabase(unittest.TestCase):
                 got = self.manager.get_newest_tick_data(tick.symbol, tick.exchange)
                 self.assertEqual(got.volume, newer_one.volume, "the newest tick we got mismatched")
 
+    def test_load_batch(self):
+        for driver, settings in profiles.items():
+            with self.subTest(driver=driver, settings=settings):
+                self.connect(settings)
+
+                bars = []
+                ticks = []
+                for i in range(3):
+                    new_bar = copy(bar)
+                    new_bar.datetime = now() - timedelta(minutes=i)
+                    new_bar.close_price = i
+                    bars.append(new_bar)
+
+                    new_tick = copy(tick)
+                    new_tick.datetime = new_bar.datetime
+                    new_tick.last_price = i
+                    ticks.append(new_tick)
+
+                self.manager.save_bar_data(bars)
+                self.manager.save_tick_data(ticks)
+
+                start = bar.datetime - timedelta(days=1)
+                end = now()
+
+                bar_batch = self.manager.load_bar_batch(
+                    bar.symbol, bar.exchange, bar.interval, start, end
+                )
+                self.assertEqual(list(bar_batch["close_price"]), [2, 1, 0])
+                self.assertEqual(bar_batch.vt_symbol, bar.vt_symbol)
+
+                tick_batch = self.manager.load_tick_batch(
+                    tick.symbol, tick.exchange, start, end
+                )
+                self.assertEqual(list(tick_batch["last_price"]), [2, 1, 0])
+                self.assertEqual(tick_batch[0].name, tick.name)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,441 @@
+"""
+Test if oms engine works fine
+"""
+import io
+import socket
+import tempfile
+import time
+import unittest
+from contextlib import redirect_stderr
+from email import message_from_bytes, policy
+from logging import DEBUG
+from pathlib import Path
+from socketserver import StreamRequestHandler, ThreadingTCPServer
+from threading import Thread
+
+from vnpy.event import AsyncEventEngine, Event, EventEngine
+from vnpy.trader.archive import DataArchive
+from vnpy.trader.constant import Exchange, Status
+from vnpy.trader.engine import LogEngine, MainEngine
+from vnpy.trader.event import EVENT_LOG, EVENT_ORDER, EVENT_TRADE
+from vnpy.trader.object import LogData, OrderData, TradeData
+from vnpy.trader.setting import SETTINGS
+
+
+class TestOmsEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.main_engine = MainEngine()
+        self.oms_engine = self.main_engine.get_engine("oms")
+
+    def tearDown(self):
+        self.main_engine.close()
+
+    def update_order(self, orderid: str, symbol: str, gateway_name: str, status: Status):
+        order = OrderData(
+            gateway_name=gateway_name,
+            symbol=symbol,
+            exchange=Exchange.SHFE,
+            orderid=orderid,
+            status=status
+        )
+        self.oms_engine.process_order_event(Event(EVENT_ORDER, order))
+        return order
+
+    def test_active_order_index(self):
+        main_engine = self.main_engine
+
+        self.update_order("1", "rb2001", "CTP", Status.NOTTRADED)
+        self.update_order("2", "rb2001", "CTP", Status.NOTTRADED)
+        self.update_order("3", "hc2001", "CTP", Status.NOTTRADED)
+        self.update_order("1", "ag2001", "SIM", Status.SUBMITTING)
+
+        # Reference saved before and after order event
+        main_engine.update_order_reference("CTP.1", "strategy")
+        main_engine.update_order_reference("CTP.3", "strategy")
+
+        self.assertEqual(main_engine.get_active_order_count(), 4)
+        self.assertEqual(main_engine.get_active_order_count("rb2001.SHFE"), 2)
+        self.assertEqual(main_engine.get_active_order_count(gateway_name="SIM"), 1)
+        self.assertEqual(main_engine.get_active_order_count(reference="strategy"), 2)
+        self.assertEqual(len(main_engine.get_all_active_orders("hc2001.SHFE")), 1)
+
+        self.update_order("1", "rb2001", "CTP", Status.ALLTRADED)
+        self.update_order("3", "hc2001", "CTP", Status.CANCELLED)
+
+        view = main_engine.get_active_order_view("rb2001.SHFE")
+        self.assertEqual(list(view), ["CTP.2"])
+        self.assertEqual(main_engine.get_active_order_count(reference="strategy"), 0)
+        self.assertEqual(main_engine.get_active_order_count("hc2001.SHFE"), 0)
+        self.assertEqual(main_engine.get_active_order_count("unknown.SHFE"), 0)
+
+        # View is read-only and follows updates
+        with self.assertRaises(TypeError):
+            view["CTP.4"] = None
+
+        self.update_order("4", "rb2001", "CTP", Status.NOTTRADED)
+        self.assertEqual(len(view), 2)
+
+    def test_reference_after_finished(self):
+        oms_engine = self.oms_engine
+        oms_engine.order_archive.max_count = 1
+
+        for i in range(3):
+            self.update_order(str(i), "rb2001", "CTP", Status.REJECTED)
+        self.assertNotIn("CTP.0", oms_engine.orders)
+
+        # Reference of finished or archived order is not saved
+        self.main_engine.update_order_reference("CTP.0", "strategy")
+        self.main_engine.update_order_reference("CTP.2", "strategy")
+
+        # Reference saved before order rejected at first event is removed
+        self.main_engine.update_order_reference("CTP.3", "strategy")
+        self.update_order("3", "rb2001", "CTP", Status.REJECTED)
+
+        self.assertEqual(oms_engine.order_references, {})
+        self.assertEqual(self.main_engine.get_active_order_count(reference="strategy"), 0)
+
+    def test_archive(self):
+        oms_engine = self.oms_engine
+        oms_engine.order_archive.max_count = 2
+        oms_engine.trade_archive.max_count = 2
+
+        for i in range(5):
+            self.update_order(str(i), "rb2001", "CTP", Status.ALLTRADED)
+
+            trade = TradeData(
+                gateway_name="CTP",
+                symbol="rb2001",
+                exchange=Exchange.SHFE,
+                orderid=str(i),
+                tradeid=str(i)
+            )
+            oms_engine.process_trade_event(Event(EVENT_TRADE, trade))
+
+        self.update_order("5", "rb2001", "CTP", Status.NOTTRADED)
+
+        # Archived in chunk after count exceeded, active order never archived
+        self.assertEqual(list(oms_engine.orders), ["CTP.2", "CTP.3", "CTP.4", "CTP.5"])
+        self.assertEqual(list(oms_engine.trades), ["CTP.2", "CTP.3", "CTP.4"])
+
+        # Archived data can still be found
+        self.assertEqual(self.main_engine.get_order("CTP.0").orderid, "0")
+        self.assertEqual(self.main_engine.get_trade("CTP.1").tradeid, "1")
+        self.assertIsNone(self.main_engine.get_order("CTP.9"))
+        self.assertEqual(len(self.main_engine.get_all_orders()), 4)
+        self.assertEqual(len(self.main_engine.get_all_orders(True)), 6)
+
+    def test_changes_since(self):
+        get_changes_since = self.main_engine.get_changes_since
+
+        self.update_order("1", "rb2001", "CTP", Status.NOTTRADED)
+        self.update_order("2", "rb2001", "CTP", Status.NOTTRADED)
+        seq, orders = get_changes_since(EVENT_ORDER)
+        self.assertEqual(seq, 2)
+        self.assertEqual([o.orderid for o in orders], ["1", "2"])
+
+        # Only latest change of each order returned
+        self.update_order("3", "rb2001", "CTP", Status.NOTTRADED)
+        self.update_order("1", "rb2001", "CTP", Status.PARTTRADED)
+        self.update_order("3", "rb2001", "CTP", Status.CANCELLED)
+        seq, orders = get_changes_since(EVENT_ORDER, seq)
+        self.assertEqual(seq, 5)
+        self.assertEqual([o.orderid for o in orders], ["1", "3"])
+        self.assertEqual(get_changes_since(EVENT_ORDER, seq), (5, []))
+        self.assertEqual(get_changes_since(EVENT_TRADE), (0, []))
+
+        # Log is trimmed after orders archived
+        self.oms_engine.order_archive.max_count = 1
+        self.update_order("4", "rb2001", "CTP", Status.CANCELLED)
+        self.update_order("5", "rb2001", "CTP", Status.CANCELLED)
+        _, orders = get_changes_since(EVENT_ORDER, seq)
+        self.assertEqual([o.orderid for o in orders], ["4", "5"])
+
+        # Changes already dropped, so all orders in memory returned
+        _, orders = get_changes_since(EVENT_ORDER)
+        self.assertEqual([o.orderid for o in orders], ["1", "2", "5"])
+
+
+class TestAsyncMainEngine(unittest.TestCase):
+
+    def test_async_event_engine(self):
+        event_engine = AsyncEventEngine()
+        main_engine = MainEngine(event_engine)
+
+        order = OrderData(
+            gateway_name="CTP",
+            symbol="rb2001",
+            exchange=Exchange.SHFE,
+            orderid="1",
+            status=Status.NOTTRADED
+        )
+        event_engine.put(Event(EVENT_ORDER, order))
+
+        for i in range(50):
+            if main_engine.get_order("CTP.1"):
+                break
+            time.sleep(0.1)
+
+        self.assertIs(main_engine.get_order("CTP.1"), order)
+        self.assertEqual(main_engine.get_active_order_count(), 1)
+
+        main_engine.close()
+        self.assertTrue(event_engine.get_loop().is_closed())
+
+
+class TestDataArchive(unittest.TestCase):
+
+    def test_chunk(self):
+        data = {}
+        archive = DataArchive(data, "test", max_count=10, max_age=0, path="")
+
+        for i in range(11):
+            data[i] = i
+            archive.finish(i)
+        self.assertEqual(len(data), 11)
+
+        # Archived down to count limit in one transaction
+        data[11] = 11
+        archive.finish(11)
+        self.assertEqual(list(data), list(range(2, 12)))
+        self.assertEqual(archive.count, 2)
+
+        self.assertIn(0, archive)
+        self.assertNotIn(12, archive)
+        self.assertEqual(archive.get(1), 1)
+        self.assertEqual(archive.get_all_archived(), [0, 1])
+        archive.close()
+
+        # Keys are checked without querying sqlite
+        self.assertIn(0, archive)
+        self.assertNotIn(12, archive)
+        self.assertIsNone(archive.get(12))
+
+    def test_new_session(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = str(Path(temp_dir).joinpath("archive.db"))
+
+            data = {"a": 1, "b": 2}
+            archive = DataArchive(data, "test", max_count=1, max_age=0, path=path)
+            archive.finish("a")
+            archive.finish("b")
+            archive.archive()
+            self.assertIn("a", archive)
+            archive.close()
+
+            # Data archived in previous session is not found
+            archive = DataArchive({}, "test", max_count=1, max_age=0, path=path)
+            self.assertNotIn("a", archive)
+            self.assertIsNone(archive.get("a"))
+            archive.close()
+
+    def test_age(self):
+        event_engine = EventEngine()
+        event_engine.start()
+
+        data = {"a": 1}
+        archive = DataArchive(
+            data, "test", max_count=0, max_age=0.01, path="", event_engine=event_engine
+        )
+        archive.finish("a")
+
+        # Archived by timer without any more item finished
+        time.sleep(1.5)
+        self.assertEqual(data, {})
+        self.assertEqual(archive.get("a"), 1)
+
+        archive.close()
+        event_engine.stop()
+
+
+class TestLogEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.settings = SETTINGS.copy()
+        SETTINGS.update({
+            "log.level": DEBUG,
+            "log.console": False,
+            "log.file": True,
+            "log.buffer_size": 3,
+            "log.interval": 0.01,
+            "log.max_bytes": 1,
+        })
+
+        self.main_engine = MainEngine()
+        self.log_engine = LogEngine(self.main_engine, self.main_engine.event_engine)
+
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.log_engine.log_path = Path(self.temp_dir.name)
+
+    def tearDown(self):
+        self.log_engine.close()
+        self.main_engine.close()
+        self.temp_dir.cleanup()
+
+        SETTINGS.clear()
+        SETTINGS.update(self.settings)
+
+    def put_log(self, msg: str):
+        log = LogData(msg=msg, gateway_name="TEST")
+        self.log_engine.process_log_event(Event(EVENT_LOG, log))
+
+    def test_write(self):
+        for i in range(5):
+            self.put_log(f"log{i}")
+
+        # Next log written into new file after size exceeded
+        time.sleep(0.1)
+        self.put_log("log5")
+        self.log_engine.close()
+
+        self.assertEqual(self.log_engine.dropped_count, 2)
+        self.assertEqual(self.log_engine.written_count, 5)
+
+        paths = sorted(Path(self.temp_dir.name).iterdir())
+        self.assertEqual(len(paths), 2)
+
+        lines = paths[0].read_text(encoding="utf8").splitlines()
+        self.assertEqual(len(lines), 4)
+        self.assertTrue(lines[0].endswith("INFO: log0"))
+        self.assertIn("丢弃2条日志", lines[3])
+        self.assertTrue(paths[1].read_text(encoding="utf8").endswith("INFO: log5\n"))
+
+    def test_error(self):
+        self.log_engine.max_bytes = 0
+
+        with redirect_stderr(io.StringIO()) as stderr:
+            # Log with invalid time fails the batch
+            log = LogData(msg="invalid", gateway_name="TEST")
+            log.time = None
+            self.log_engine.process_log_event(Event(EVENT_LOG, log))
+
+            time.sleep(0.1)
+            self.put_log("valid")
+            self.log_engine.close()
+
+        self.assertIn("日志写入失败", stderr.getvalue())
+
+        path = next(Path(self.temp_dir.name).iterdir())
+        self.assertTrue(path.read_text(encoding="utf8").endswith("INFO: valid\n"))
+
+
+class SmtpHandler(StreamRequestHandler):
+    """
+    Minimal SMTP server stand-in saving all messages received.
+    """
+
+    def reply(self, text: str):
+        self.wfile.write(f"{text}\r\n".encode())
+
+    def handle(self):
+        self.server.connection_count += 1
+        self.reply("220 localhost")
+
+        for line in self.rfile:
+            command = line.decode().strip().upper()
+
+            if command == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+
+                data = b"".join(iter(self.rfile.readline, b".\r\n"))
+                self.server.messages.append(message_from_bytes(data, policy=policy.default))
+                self.reply("250 OK")
+            elif command.startswith("RCPT"):
+                self.server.rcpt_count += 1
+
+                if "REFUSED" in command:
+                    self.reply("550 No such user")
+                else:
+                    self.reply("250 OK")
+            elif command == "QUIT":
+                self.reply("221 Bye")
+                break
+            else:
+                self.reply("250 OK")
+
+
+class TestEmailEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ThreadingTCPServer(("localhost", 0), SmtpHandler)
+        self.server.daemon_threads = True
+        self.server.connection_count = 0
+        self.server.rcpt_count = 0
+        self.server.messages = []
+        Thread(target=self.server.serve_forever, daemon=True).start()
+
+        self.settings = SETTINGS.copy()
+        SETTINGS.update({
+            "email.server": "localhost",
+            "email.port": self.server.server_address[1],
+            "email.username": "",
+            "email.sender": "vnpy@test.com",
+            "email.ssl": False,
+            "email.window": 0.2,
+            "email.limit": 0,
+        })
+
+        self.main_engine = MainEngine()
+        self.email_engine = self.main_engine.get_engine("email")
+
+    def tearDown(self):
+        self.main_engine.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+        SETTINGS.clear()
+        SETTINGS.update(self.settings)
+
+    def test_digest(self):
+        send_email = self.main_engine.send_email
+
+        for i in range(3):
+            send_email(f"subject{i}", f"content{i}", "a@test.com")
+        send_email("subject", "content", "b@test.com")
+
+        time.sleep(0.5)
+        messages = self.server.messages
+        self.assertEqual(len(messages), 2)
+        self.assertEqual(messages[0]["To"], "a@test.com")
+        self.assertEqual(messages[0]["Subject"], "subject0等3封邮件")
+        self.assertIn("content2", messages[0].get_content())
+        self.assertEqual(messages[1]["Subject"], "subject")
+
+        # Connection reused, and reconnected after lost
+        self.assertEqual(self.server.connection_count, 1)
+
+        self.email_engine.smtp.sock.shutdown(socket.SHUT_RDWR)
+        send_email("subject", "content", "a@test.com")
+        time.sleep(0.5)
+        self.assertEqual(len(messages), 3)
+        self.assertEqual(self.server.connection_count, 2)
+
+    def test_limit(self):
+        SETTINGS["email.limit"] = 1
+        send_email = self.main_engine.send_email
+
+        send_email("subject", "content", "a@test.com")
+        time.sleep(0.5)
+        send_email("subject", "content", "b@test.com")
+        time.sleep(0.5)
+        self.assertEqual(len(self.server.messages), 1)
+
+        # Pending emails sent before exit
+        self.email_engine.close()
+        self.assertEqual(len(self.server.messages), 2)
+
+    def test_refused(self):
+        send_email = self.main_engine.send_email
+
+        # Refused email is not retried, and connection is still used
+        send_email("subject", "content", "refused@test.com")
+        send_email("subject", "content", "a@test.com")
+        time.sleep(0.5)
+
+        self.assertEqual(self.server.rcpt_count, 2)
+        self.assertEqual(len(self.server.messages), 1)
+        self.assertEqual(self.server.connection_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
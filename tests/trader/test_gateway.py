@@ -0,0 +1,50 @@
+"""
+Test if gateway tools work fine
+"""
+import unittest
+from datetime import datetime
+
+from vnpy.trader.constant import Exchange
+from vnpy.trader.gateway import TickManager
+from vnpy.trader.object import TickData
+
+
+class TestTickManager(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.ticks = []
+        self.manager = TickManager(self)
+
+        tick = TickData(
+            gateway_name="TEST",
+            symbol="XBTUSD",
+            exchange=Exchange.BITMEX,
+            datetime=datetime.now()
+        )
+        self.manager.add_tick(tick)
+
+    def on_tick(self, tick: TickData):
+        self.ticks.append(tick)
+
+    def test_copy_on_write(self):
+        tick = self.manager.update_tick("XBTUSD")
+        tick.last_price = 1
+
+        # Not copied before pushed
+        self.assertIs(self.manager.update_tick("XBTUSD"), tick)
+        self.manager.push_tick("XBTUSD")
+
+        new_tick = self.manager.update_tick("XBTUSD")
+        new_tick.last_price = 2
+        self.manager.push_tick("XBTUSD")
+
+        # Tick pushed is never changed
+        self.assertIsNot(new_tick, tick)
+        self.assertEqual([t.last_price for t in self.ticks], [1, 2])
+        self.assertIs(self.manager.get_tick("XBTUSD"), new_tick)
+
+        self.assertIsNone(self.manager.update_tick("ETHUSD"))
+
+
+if __name__ == '__main__':
+    unittest.main()
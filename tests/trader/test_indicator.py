@@ -0,0 +1,127 @@
+"""
+Test if streaming indicators are equal to talib
+"""
+import random
+import unittest
+from datetime import datetime
+
+import numpy as np
+import talib
+
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.indicator import (
+    SmaIndicator,
+    EmaIndicator,
+    StdIndicator,
+    RsiIndicator,
+    MacdIndicator,
+    AtrIndicator,
+    CciIndicator,
+    AdxIndicator,
+    PriceIndicator,
+    DonchianIndicator,
+    BollIndicator,
+    KeltnerIndicator
+)
+from vnpy.trader.object import BarData
+from vnpy.trader.utility import ArrayManager
+
+
+def create_bars(count: int):
+    random.seed(1)
+
+    bars = []
+    price = 100
+    for i in range(count):
+        open_price = price
+        close_price = price + random.gauss(0, 1)
+        high_price = max(open_price, close_price) + random.random()
+        low_price = min(open_price, close_price) - random.random()
+        price = close_price
+
+        bar = BarData(
+            gateway_name="TEST",
+            symbol="rb2001",
+            exchange=Exchange.SHFE,
+            datetime=datetime.now(),
+            interval=Interval.MINUTE,
+            open_price=open_price,
+            high_price=high_price,
+            low_price=low_price,
+            close_price=close_price
+        )
+        bars.append(bar)
+
+    return bars
+
+
+class TestIndicator(unittest.TestCase):
+
+    def setUp(self):
+        self.bars = create_bars(300)
+        self.high = np.array([bar.high_price for bar in self.bars])
+        self.low = np.array([bar.low_price for bar in self.bars])
+        self.close = np.array([bar.close_price for bar in self.bars])
+
+    def check(self, indicator, expected: np.ndarray, attr: str = "value"):
+        for bar, value in zip(self.bars, expected):
+            indicator.update_bar(bar)
+
+            if np.isnan(value):
+                self.assertFalse(indicator.inited)
+            else:
+                self.assertTrue(indicator.inited)
+                self.assertAlmostEqual(getattr(indicator, attr), value, places=6)
+
+    def test_price(self):
+        self.check(SmaIndicator(10), talib.SMA(self.close, 10))
+        self.check(EmaIndicator(10), talib.EMA(self.close, 10))
+        self.check(StdIndicator(10), talib.STDDEV(self.close, 10))
+        self.check(RsiIndicator(14), talib.RSI(self.close, 14))
+
+    def test_macd(self):
+        macd, signal, hist = talib.MACD(self.close, 12, 26, 9)
+        self.check(MacdIndicator(12, 26, 9), macd, "macd")
+        self.check(MacdIndicator(12, 26, 9), signal, "signal")
+        self.check(MacdIndicator(12, 26, 9), hist, "hist")
+
+    def test_bar(self):
+        high, low, close = self.high, self.low, self.close
+
+        self.check(AtrIndicator(14), talib.ATR(high, low, close, 14))
+        self.check(CciIndicator(20), talib.CCI(high, low, close, 20))
+        self.check(AdxIndicator(14), talib.ADX(high, low, close, 14))
+        self.check(DonchianIndicator(20), talib.MAX(high, 20), "up")
+        self.check(DonchianIndicator(20), talib.MIN(low, 20), "down")
+
+    def test_abstract(self):
+        class NoUpdateIndicator(PriceIndicator):
+            pass
+
+        with self.assertRaises(TypeError):
+            NoUpdateIndicator()
+
+    def test_array_manager(self):
+        am = ArrayManager(100)
+        boll = am.add_indicator(BollIndicator(20, 2))
+        keltner = am.add_indicator(KeltnerIndicator(20, 2))
+
+        for bar in self.bars:
+            am.update_bar(bar)
+
+        self.assertTrue(boll.inited)
+        self.assertTrue(keltner.inited)
+
+        for a, b in zip((boll.up, boll.down), am.boll(20, 2)):
+            self.assertAlmostEqual(a, b, places=6)
+
+        # ATR of ArrayManager is seeded within its window, so compare
+        # with talib on all bars instead
+        mid = talib.SMA(self.close, 20)[-1]
+        atr = talib.ATR(self.high, self.low, self.close, 20)[-1]
+        self.assertAlmostEqual(keltner.up, mid + atr * 2, places=6)
+        self.assertAlmostEqual(keltner.down, mid - atr * 2, places=6)
+
+
+if __name__ == '__main__':
+    unittest.main()
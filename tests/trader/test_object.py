@@ -0,0 +1,109 @@
+"""
+Test if data objects work fine
+"""
+import pickle
+import unittest
+from copy import copy
+from datetime import datetime, timedelta
+
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.object import BarBatch, BarData, OrderData, TickBatch, TickData
+
+
+class TestDataObject(unittest.TestCase):
+
+    def test_slots(self):
+        tick = TickData(
+            gateway_name="TEST",
+            symbol="rb2001",
+            exchange=Exchange.SHFE,
+            datetime=None
+        )
+        self.assertFalse(hasattr(tick, "__dict__"))
+
+        with self.assertRaises(AttributeError):
+            tick.unknown = 1
+
+        # vt_symbol is interned and shared by ticks of same symbol
+        other = TickData(
+            gateway_name="TEST",
+            symbol="rb2001",
+            exchange=Exchange.SHFE,
+            datetime=None
+        )
+        self.assertEqual(tick.vt_symbol, "rb2001.SHFE")
+        self.assertIs(tick.vt_symbol, other.vt_symbol)
+
+    def test_copy(self):
+        order = OrderData(
+            gateway_name="TEST",
+            symbol="rb2001",
+            exchange=Exchange.SHFE,
+            orderid="1",
+            price=3000
+        )
+
+        for obj in [copy(order), pickle.loads(pickle.dumps(order))]:
+            self.assertEqual(obj, order)
+            self.assertEqual(obj.vt_symbol, "rb2001.SHFE")
+            self.assertEqual(obj.vt_orderid, "TEST.1")
+
+        new_order = copy(order)
+        new_order.price = 3100
+        self.assertEqual(order.price, 3000)
+
+
+class TestBatch(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.bars = []
+        for i in range(10):
+            bar = BarData(
+                gateway_name="TEST",
+                symbol="rb2001",
+                exchange=Exchange.SHFE,
+                datetime=datetime(2019, 1, 1) + timedelta(minutes=i),
+                interval=Interval.MINUTE,
+                close_price=i
+            )
+            self.bars.append(bar)
+
+    def test_bar_batch(self):
+        batch = BarBatch.from_list(self.bars)
+        self.assertEqual(len(batch), 10)
+        self.assertEqual(batch.to_list(), self.bars)
+        self.assertEqual(batch[3], self.bars[3])
+
+        # Column and slice share data with batch
+        close = batch["close_price"]
+        sliced = batch.slice_time(self.bars[2].datetime, self.bars[4].datetime)
+        close[2] = 100
+        self.assertEqual(sliced.to_list()[0].close_price, 100)
+        self.assertEqual(len(sliced), 3)
+        self.assertEqual(len(batch[5:]), 5)
+
+    def test_df(self):
+        batch = BarBatch.from_list(self.bars)
+        df = batch.to_df()
+        self.assertEqual(list(df["close_price"]), list(range(10)))
+
+        new_batch = BarBatch.from_df(
+            df.set_index("datetime"), "rb2001", Exchange.SHFE, Interval.MINUTE, "TEST"
+        )
+        self.assertEqual(new_batch.to_list(), self.bars)
+
+    def test_tick_batch(self):
+        tick = TickData(
+            gateway_name="TEST",
+            symbol="rb2001",
+            exchange=Exchange.SHFE,
+            datetime=datetime(2019, 1, 1),
+            name="rb",
+            last_price=3000
+        )
+        batch = TickBatch.from_list([tick])
+        self.assertEqual(list(batch), [tick])
+
+
+if __name__ == '__main__':
+    unittest.main()
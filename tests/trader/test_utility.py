@@ -0,0 +1,351 @@
+"""
+Test if utility tools work fine
+"""
+import random
+import unittest
+from datetime import datetime, timedelta
+
+import numpy as np
+import talib
+
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.object import BarData, TickData, BarBatch, TickBatch
+from vnpy.trader.utility import (
+    ArrayManager,
+    MultiArrayManager,
+    BarGenerator,
+    resample_tick_batch,
+    resample_bar_batch
+)
+
+
+def create_bar(price: float):
+    return BarData(
+        gateway_name="TEST",
+        symbol="rb2001",
+        exchange=Exchange.SHFE,
+        datetime=datetime.now(),
+        interval=Interval.MINUTE,
+        open_price=price,
+        high_price=price + 1,
+        low_price=price - 1,
+        close_price=price,
+        volume=price * 10,
+        open_interest=price * 100
+    )
+
+
+class TestArrayManager(unittest.TestCase):
+
+    def test_ring_buffer(self):
+        am = ArrayManager(size=5, fields=["signal"])
+
+        for i in range(12):
+            am.update_bar(create_bar(i))
+            if i % 2:
+                am.update_field("signal", i)
+
+        self.assertTrue(am.inited)
+        self.assertEqual(list(am.close), [7, 8, 9, 10, 11])
+        self.assertEqual(list(am.high), [8, 9, 10, 11, 12])
+        self.assertEqual(list(am.volume), [70, 80, 90, 100, 110])
+        self.assertEqual(list(am.open_interest), [700, 800, 900, 1000, 1100])
+        self.assertEqual(list(am.get_array("signal")), [7, 0, 9, 0, 11])
+
+        # Arrays are continuous for talib
+        self.assertTrue(am.close.flags["C_CONTIGUOUS"])
+        self.assertEqual(am.sma(5), 9)
+
+    def test_update_batch(self):
+        bars = [create_bar(i) for i in range(12)]
+
+        am = ArrayManager(size=5, fields=["signal"])
+        am.update_bar(bars[0])
+        am.update_field("signal", 1)
+        am.update_batch(BarBatch.from_list(bars[1:3]))
+
+        expected = ArrayManager(size=5, fields=["signal"])
+        expected.update_bar(bars[0])
+        expected.update_field("signal", 1)
+        for bar in bars[1:3]:
+            expected.update_bar(bar)
+
+        self.assertEqual(list(am.close), list(expected.close))
+        self.assertEqual(list(am.get_array("signal")), [0, 0, 1, 0, 0])
+
+        # Batch longer than size
+        am.update_batch(BarBatch.from_list(bars[3:]))
+        self.assertTrue(am.inited)
+        self.assertEqual(am.count, 12)
+        self.assertEqual(list(am.close), [7, 8, 9, 10, 11])
+
+        am.update_bar(create_bar(12))
+        self.assertEqual(list(am.high), [9, 10, 11, 12, 13])
+
+    def test_indicator_cache(self):
+        am = ArrayManager(size=5)
+
+        for i in range(5):
+            am.update_bar(create_bar(i))
+
+        self.assertEqual(am.sma(3), 3)
+        self.assertEqual(am.sma(3), 3)
+        self.assertEqual(am.boll(3, 2), am.boll(3, 2))
+        # First boll also calls sma(3, False) and std(3, False)
+        self.assertEqual((am.cache_hits, am.cache_misses), (2, 4))
+
+        # Cache is cleared by new bar
+        am.update_bar(create_bar(5))
+        self.assertEqual(am.sma(3), 4)
+        self.assertEqual(am.cache_misses, 5)
+
+
+def get_bar_values(bar: BarData):
+    return (
+        bar.datetime,
+        bar.open_price,
+        bar.high_price,
+        bar.low_price,
+        bar.close_price,
+        bar.volume,
+        bar.open_interest
+    )
+
+
+class TestResample(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(1)
+
+    def test_tick(self):
+        ticks = []
+        dt = datetime(2019, 12, 2, 9, 0, 0, 500000)
+        volume = 0
+
+        for i in range(2000):
+            dt += timedelta(seconds=random.choice([0.5, 1, 5, 70]))
+
+            # Volume may decrease, and price may be zero
+            volume += random.randint(-2, 10)
+            if random.random() < 0.05:
+                price = 0
+            else:
+                price = random.randint(3000, 3100)
+
+            tick = TickData(
+                gateway_name="TEST",
+                symbol="rb2001",
+                exchange=Exchange.SHFE,
+                datetime=dt,
+                last_price=price,
+                volume=volume,
+                open_interest=random.randint(0, 100)
+            )
+            ticks.append(tick)
+
+        bars = []
+        generator = BarGenerator(bars.append)
+        for tick in ticks:
+            generator.update_tick(tick)
+
+        batch = resample_tick_batch(TickBatch.from_list(ticks))
+        self.assertEqual(
+            [get_bar_values(bar) for bar in batch],
+            [get_bar_values(bar) for bar in bars]
+        )
+
+        generator.generate()
+        batch = resample_tick_batch(TickBatch.from_list(ticks), True)
+        self.assertEqual(
+            [get_bar_values(bar) for bar in batch],
+            [get_bar_values(bar) for bar in bars]
+        )
+
+    def test_bar(self):
+        bars = []
+        dt = datetime(2019, 12, 2, 9)
+
+        for i in range(3000):
+            # Bars may be missing
+            dt += timedelta(minutes=random.choice([1, 1, 1, 7, 61]))
+            price = random.randint(3000, 3100)
+
+            bar = BarData(
+                gateway_name="TEST",
+                symbol="rb2001",
+                exchange=Exchange.SHFE,
+                datetime=dt,
+                interval=Interval.MINUTE,
+                open_price=price,
+                high_price=price + random.randint(0, 5),
+                low_price=price - random.randint(0, 5),
+                close_price=price + random.randint(-5, 5),
+                volume=random.random() * 100,
+                open_interest=random.randint(0, 100)
+            )
+            bars.append(bar)
+
+        batch = BarBatch.from_list(bars)
+
+        for window, interval in [
+            (5, Interval.MINUTE),
+            (15, Interval.MINUTE),
+            (1, Interval.HOUR),
+            (4, Interval.HOUR)
+        ]:
+            window_bars = []
+            generator = BarGenerator(
+                None, window, window_bars.append, interval
+            )
+            for bar in bars:
+                generator.update_bar(bar)
+
+            result = resample_bar_batch(batch, window, interval)
+            self.assertEqual(
+                [get_bar_values(bar) for bar in result],
+                [get_bar_values(bar) for bar in window_bars]
+            )
+
+            # Unfinished window bar is included
+            result = resample_bar_batch(batch, window, interval, True)
+            self.assertEqual(
+                get_bar_values(result[-1]),
+                get_bar_values(generator.window_bar)
+            )
+
+
+class TestMultiArrayManager(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(1)
+
+        self.vt_symbols = ["rb2001.SHFE", "hc2001.SHFE", "i2001.DCE"]
+        self.am = MultiArrayManager(self.vt_symbols, size=50)
+
+        dt = datetime(2019, 12, 2, 9)
+        for i in range(60):
+            dt += timedelta(minutes=1)
+
+            for vt_symbol in self.vt_symbols:
+                symbol, exchange = vt_symbol.split(".")
+                price = random.randint(3000, 3100)
+                bar = BarData(
+                    gateway_name="TEST",
+                    symbol=symbol,
+                    exchange=Exchange(exchange),
+                    datetime=dt,
+                    interval=Interval.MINUTE,
+                    open_price=price,
+                    high_price=price + random.randint(0, 5),
+                    low_price=price - random.randint(0, 5),
+                    close_price=price + random.randint(-5, 5),
+                    volume=10
+                )
+                self.am.update_bar(bar)
+
+        self.am.flush()
+
+    def test_indicator(self):
+        am = self.am
+        self.assertTrue(am.inited)
+
+        for row in range(len(self.vt_symbols)):
+            high = am.high[row].copy()
+            low = am.low[row].copy()
+            close = am.close[row].copy()
+
+            expected = {
+                "sma": talib.SMA(close, 10),
+                "std": talib.STDDEV(close, 10),
+                "ema": talib.EMA(close, 10),
+                "roc": talib.ROC(close, 10),
+                "atr": talib.ATR(high, low, close, 10),
+            }
+            for name, result in expected.items():
+                vector = getattr(am, name)(10)
+                matrix = getattr(am, name)(10, array=True)
+
+                self.assertAlmostEqual(vector[row], result[-1])
+                np.testing.assert_allclose(matrix[row], result)
+
+            up, down = am.donchian(10, array=True)
+            np.testing.assert_allclose(up[row], talib.MAX(high, 10))
+            np.testing.assert_allclose(down[row], talib.MIN(low, 10))
+
+    def test_precision(self):
+        am = MultiArrayManager(["rb2001.SHFE"], size=20)
+        for i in range(20):
+            bar = BarData(
+                gateway_name="TEST",
+                symbol="rb2001",
+                exchange=Exchange.SHFE,
+                datetime=datetime(2019, 12, 2) + timedelta(minutes=i),
+                interval=Interval.MINUTE,
+                close_price=1e8 + i % 2
+            )
+            am.update_bars({bar.vt_symbol: bar})
+
+        std = am.std(10, array=True)
+        np.testing.assert_allclose(std[0, 9:], 0.5)
+
+        # Not enough data for indicators of longer window
+        self.assertTrue(np.isnan(am.atr(20)[0]))
+        self.assertTrue(np.isnan(am.atr(30, array=True)).all())
+        self.assertTrue(np.isnan(am.std(30, array=True)).all())
+
+    def test_pending(self):
+        am = self.am
+        count = am.count
+
+        bar = BarData(
+            gateway_name="TEST",
+            symbol="rb2001",
+            exchange=Exchange.SHFE,
+            datetime=datetime(2019, 12, 3),
+            interval=Interval.MINUTE,
+            close_price=1
+        )
+        am.update_bar(bar)
+
+        # Last step pending until flushed
+        self.assertEqual(am.count, count)
+        am.flush()
+        self.assertEqual(am.count, count + 1)
+        self.assertEqual(am.close[0, -1], 1)
+
+    def test_cross_section(self):
+        am = self.am
+
+        values = np.array([3.0, 1.0, 2.0])
+        self.assertEqual(list(am.rank(values)), [2, 0, 1])
+        self.assertEqual(list(am.zscore(values)), list((values - 2) / values.std()))
+        self.assertEqual(am.to_dict(values)["i2001.DCE"], 2)
+
+        corr = am.corr(20)
+        self.assertEqual(corr.shape, (3, 3))
+        self.assertAlmostEqual(corr[1, 1], 1)
+
+    def test_missing_bar(self):
+        am = self.am
+        last_close = am.close[:, -1].copy()
+
+        bar = BarData(
+            gateway_name="TEST",
+            symbol="rb2001",
+            exchange=Exchange.SHFE,
+            datetime=datetime(2019, 12, 3),
+            interval=Interval.MINUTE,
+            open_price=1,
+            high_price=1,
+            low_price=1,
+            close_price=1,
+            volume=1
+        )
+        am.update_bars({"rb2001.SHFE": bar})
+
+        self.assertEqual(list(am.close[:, -1]), [1, last_close[1], last_close[2]])
+        self.assertEqual(list(am.volume[:, -1]), [1, 0, 0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,7 +2,7 @@
 from vnpy.event import EventEngine, Event
 from vnpy.trader.engine import BaseEngine, MainEngine
 from vnpy.trader.event import (
-    EVENT_TICK, EVENT_TIMER, EVENT_ORDER, EVENT_TRADE)
+    EVENT_TICK, EVENT_ORDER, EVENT_TRADE)
 from vnpy.trader.constant import (Direction, Offset, OrderType)
 from vnpy.trader.object import (SubscribeRequest, OrderRequest)
 from vnpy.trader.utility import load_json, save_json, round_to
@@ -29,6 +29,7 @@ class AlgoEngine(BaseEngine):
         self.algos = {}
         self.symbol_algo_map = {}
         self.orderid_algo_map = {}
+        self.algo_timers = {}
 
         self.algo_templates = {}
         self.algo_settings = {}
@@ -81,7 +82,6 @@ class AlgoEngine(BaseEngine):
     def register_event(self):
         """"""
         self.event_engine.register(EVENT_TICK, self.process_tick_event)
-        self.event_engine.register(EVENT_TIMER, self.process_timer_event)
         self.event_engine.register(EVENT_ORDER, self.process_order_event)
         self.event_engine.register(EVENT_TRADE, self.process_trade_event)
 
@@ -94,11 +94,6 @@ class AlgoEngine(BaseEngine):
             for algo in algos:
                 algo.update_tick(tick)
 
-    def process_timer_event(self, event: Event):
-        """"""
-        for algo in self.algos.values():
-            algo.update_timer()
-
     def process_trade_event(self, event: Event):
         """"""
         trade = event.data
@@ -124,6 +119,11 @@ class AlgoEngine(BaseEngine):
         algo.start()
 
         self.algos[algo.algo_name] = algo
+
+        # Call timer function of the algo every second
+        timer = self.event_engine.call_every(1, algo.update_timer)
+        self.algo_timers[algo.algo_name] = timer
+
         return algo.algo_name
 
     def stop_algo(self, algo_name: str):
@@ -133,6 +133,9 @@ class AlgoEngine(BaseEngine):
             algo.stop()
             self.algos.pop(algo_name)
 
+            timer = self.algo_timers.pop(algo_name)
+            timer.cancel()
+
     def stop_all(self):
         """"""
         for algo_name in list(self.algos.keys()):
@@ -0,0 +1,225 @@
+"""
+Bar streams of each symbol and timeframe shared by CTA strategies.
+"""
+
+from threading import RLock
+from typing import Callable
+
+from vnpy.trader.constant import Interval
+from vnpy.trader.object import BarData, TickData, BarBatch
+from vnpy.trader.utility import (
+    ArrayManager,
+    BarGenerator,
+    resample_bar_batch,
+    find_window_ends
+)
+
+from .template import CtaTemplate
+
+
+MINUTE_KEY = (1, Interval.MINUTE)
+
+
+class BarStream:
+    """
+    Bars of one symbol and timeframe shared by all subscribed strategies.
+
+    Bar objects and array managers are shared, so they should not be
+    modified by strategies.
+    """
+
+    def __init__(
+        self,
+        window: int,
+        interval: Interval,
+        dispatch: Callable,
+        source: bool = False
+    ):
+        """
+        Source stream pushes bars updated into it without aggregation.
+        """
+        self.window = window
+        self.interval = interval
+        self.dispatch = dispatch
+        self.source = source
+
+        self.subscribers = []           # (strategy, callback) list
+        self.array_managers = {}        # size: ArrayManager
+        self.children = []              # streams generated from bars of this
+
+        if source:
+            self.generator = BarGenerator(self.on_bar)
+        else:
+            self.generator = BarGenerator(None, window, self.on_bar, interval)
+
+    def update_tick(self, tick: TickData):
+        """"""
+        self.generator.update_tick(tick)
+
+    def update_bar(self, bar: BarData):
+        """
+        Update source bar into stream.
+        """
+        if self.source:
+            self.on_bar(bar)
+        else:
+            self.generator.update_bar(bar)
+
+    def on_bar(self, bar: BarData):
+        """
+        Push finished bar to array managers, strategies and child streams.
+        """
+        for am in self.array_managers.values():
+            am.update_bar(bar)
+
+        for strategy, callback in self.subscribers:
+            self.dispatch(strategy, callback, bar)
+
+        for stream in self.children:
+            stream.update_bar(bar)
+
+    def load_history(self, am: ArrayManager, batch: BarBatch, new_stream: bool):
+        """
+        Warm up array manager with history source bars in one shot.
+        """
+        if self.source:
+            am.update_batch(batch)
+            return
+
+        am.update_batch(resample_bar_batch(batch, self.window, self.interval))
+
+        # Stream without live data yet continues from the unfinished
+        # window bar of history
+        if new_stream:
+            ends = find_window_ends(batch["datetime"], self.window, self.interval)
+            if len(ends):
+                start = ends[-1] + 1
+                self.generator.last_bar = batch[int(ends[-1])]
+            else:
+                start = 0
+
+            for bar in batch[start:]:
+                self.generator.update_bar(bar)
+
+
+class BarAggregator:
+    """
+    Aggregate bars of each symbol and timeframe only once for all
+    strategies subscribed.
+
+    Ticks are aggregated into 1 minute bars, which are then aggregated
+    into x minute or x hour bars of each timeframe subscribed.
+    """
+
+    def __init__(
+        self,
+        dispatch: Callable[[CtaTemplate, Callable, BarData], None],
+        interval: Interval = Interval.MINUTE
+    ):
+        """
+        Interval is of source bars updated by update_bar. Only 1 minute
+        bars can be aggregated into other timeframes, so with source of
+        other interval only bars of the same interval can be subscribed.
+        """
+        self.dispatch = dispatch
+        self.source_key = (1, interval)
+        self.symbol_streams = {}        # vt_symbol: {(window, interval): stream}
+
+        self.lock = RLock()
+
+    def subscribe(
+        self,
+        strategy: CtaTemplate,
+        vt_symbol: str,
+        callback: Callable,
+        window: int = 1,
+        interval: Interval = Interval.MINUTE,
+        size: int = 0,
+        load_history: Callable = None
+    ):
+        """
+        Subscribe bar stream of a timeframe, and return shared array
+        manager of size if size is not 0.
+
+        load_history is called for BarBatch of history 1 minute bars only
+        when a new array manager is created, and not with lock held.
+        """
+        key = (window, interval)
+
+        if key != self.source_key and self.source_key != MINUTE_KEY:
+            raise ValueError(
+                f"无法从{self.source_key[1].value}K线合成{window}{interval.value}K线"
+            )
+
+        batch = None
+        if size and load_history:
+            with self.lock:
+                streams = self.symbol_streams.get(vt_symbol, {})
+                stream = streams.get(key, None)
+                loaded = stream and size in stream.array_managers
+
+            if not loaded:
+                batch = load_history()
+
+        with self.lock:
+            streams = self.symbol_streams.setdefault(vt_symbol, {})
+
+            # Source stream is always required for generating others
+            source_stream = streams.get(self.source_key, None)
+            if not source_stream:
+                source_stream = BarStream(
+                    1, self.source_key[1], self.dispatch, source=True
+                )
+                streams[self.source_key] = source_stream
+
+            stream = streams.get(key, None)
+            new_stream = not stream
+            if new_stream:
+                stream = BarStream(window, interval, self.dispatch)
+                streams[key] = stream
+                source_stream.children.append(stream)
+
+            am = None
+            if size:
+                am = stream.array_managers.get(size, None)
+                if not am:
+                    am = ArrayManager(size)
+                    stream.array_managers[size] = am
+                    if batch:
+                        stream.load_history(am, batch, new_stream)
+
+            stream.subscribers = stream.subscribers + [(strategy, callback)]
+
+        return am
+
+    def unsubscribe(self, strategy: CtaTemplate):
+        """
+        Remove all subscriptions of a strategy.
+        """
+        with self.lock:
+            for streams in self.symbol_streams.values():
+                for stream in streams.values():
+                    stream.subscribers = [
+                        (s, callback) for s, callback in stream.subscribers
+                        if s is not strategy
+                    ]
+
+    def update_tick(self, tick: TickData):
+        """"""
+        streams = self.symbol_streams.get(tick.vt_symbol, None)
+        if not streams:
+            return
+
+        with self.lock:
+            streams[self.source_key].update_tick(tick)
+
+    def update_bar(self, bar: BarData):
+        """
+        Update source bar generated elsewhere (e.g. in backtesting).
+        """
+        streams = self.symbol_streams.get(bar.vt_symbol, None)
+        if not streams:
+            return
+
+        with self.lock:
+            streams[self.source_key].update_bar(bar)
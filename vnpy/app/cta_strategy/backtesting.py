@@ -16,8 +16,15 @@ from deap import creator, base, tools, algorithms
 from vnpy.trader.constant import (Direction, Offset, Exchange, 
                                   Interval, Status)
 from vnpy.trader.database import database_manager
-from vnpy.trader.object import OrderData, TradeData, BarData, TickData
-from vnpy.trader.utility import round_to
+from vnpy.trader.object import (
+    OrderData,
+    TradeData,
+    BarData,
+    TickData,
+    BarBatch,
+    TickBatch
+)
+from vnpy.trader.utility import round_to, resample_tick_batch
 
 from .base import (
     BacktestingMode,
@@ -27,6 +34,7 @@ from .base import (
     StopOrderStatus,
 )
 from .template import CtaTemplate
+from .aggregator import BarAggregator
 
 sns.set_style("whitegrid")
 creator.create("FitnessMax", base.Fitness, weights=(1.0,))
@@ -124,8 +132,11 @@ class BacktestingEngine:
         self.interval = None
         self.days = 0
         self.callback = None
+        self.batch_callback = None
         self.history_data = []
 
+        self.bar_aggregator = None
+
         self.stop_order_count = 0
         self.stop_orders = {}
         self.active_stop_orders = {}
@@ -165,6 +176,8 @@ class BacktestingEngine:
         self.logs.clear()
         self.daily_results.clear()
 
+        self.bar_aggregator = None
+
     def set_parameters(
         self,
         vt_symbol: str,
@@ -202,6 +215,13 @@ class BacktestingEngine:
 
     def add_strategy(self, strategy_class: type, setting: dict):
         """"""
+        # Ticks are aggregated into 1 minute bars first
+        if self.mode == BacktestingMode.BAR:
+            source_interval = self.interval
+        else:
+            source_interval = Interval.MINUTE
+        self.bar_aggregator = BarAggregator(self.process_bar, source_interval)
+
         self.strategy_class = strategy_class
         self.strategy = strategy_class(
             self, strategy_class.__name__, self.vt_symbol, setting
@@ -277,7 +297,14 @@ class BacktestingEngine:
                     break
 
             self.datetime = data.datetime
-            self.callback(data)
+            self.update_aggregator(data)
+
+            if self.callback:
+                self.callback(data)
+
+        # Push history data for initializing in one batch
+        if self.batch_callback:
+            self.batch_callback(self.create_bar_batch(self.history_data[:ix]))
 
         self.strategy.inited = True
         self.output("策略初始化完成")
@@ -703,6 +730,7 @@ class BacktestingEngine:
 
         self.cross_limit_order()
         self.cross_stop_order()
+        self.bar_aggregator.update_bar(bar)
         self.strategy.on_bar(bar)
 
         self.update_daily_close(bar.close_price)
@@ -714,6 +742,7 @@ class BacktestingEngine:
 
         self.cross_limit_order()
         self.cross_stop_order()
+        self.bar_aggregator.update_tick(tick)
         self.strategy.on_tick(tick)
 
         self.update_daily_close(tick.last_price)
@@ -884,11 +913,65 @@ class BacktestingEngine:
         """"""
         self.days = days
         self.callback = callback
+        self.batch_callback = None
+
+    def load_bar_batch(
+        self, vt_symbol: str, days: int, interval: Interval, callback: Callable
+    ):
+        """"""
+        self.days = days
+        self.callback = None
+        self.batch_callback = callback
 
     def load_tick(self, vt_symbol: str, days: int, callback: Callable):
         """"""
         self.days = days
         self.callback = callback
+        self.batch_callback = None
+
+    def create_bar_batch(self, data: list):
+        """
+        Create BarBatch from history data, ticks are resampled into 1 minute
+        bars.
+        """
+        if not data:
+            return BarBatch(self.symbol, self.exchange, self.interval)
+
+        if self.mode == BacktestingMode.BAR:
+            return BarBatch.from_list(data)
+        else:
+            return resample_tick_batch(TickBatch.from_list(data), True)
+
+    def subscribe_bar(
+        self,
+        strategy: CtaTemplate,
+        callback: Callable,
+        window: int,
+        interval: Interval,
+        size: int,
+        days: int,
+        vt_symbol: str
+    ):
+        """
+        History data used for initializing strategy is also updated into
+        bar streams, so array manager is warmed up without loading days.
+        Only the backtesting symbol has data.
+        """
+        return self.bar_aggregator.subscribe(
+            strategy, vt_symbol, callback, window, interval, size
+        )
+
+    def update_aggregator(self, data):
+        """"""
+        if self.mode == BacktestingMode.BAR:
+            self.bar_aggregator.update_bar(data)
+        else:
+            self.bar_aggregator.update_tick(data)
+
+    def process_bar(self, strategy: CtaTemplate, callback: Callable, bar: BarData):
+        """"""
+        if strategy.inited:
+            callback(bar)
 
     def send_order(
         self,
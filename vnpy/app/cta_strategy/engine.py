@@ -10,9 +10,11 @@ from datetime import datetime, timedelta
 from threading import Thread
 from queue import Queue
 from copy import copy
+from operator import attrgetter
 
 from vnpy.event import Event, EventEngine
 from vnpy.trader.engine import BaseEngine, MainEngine
+from vnpy.trader.archive import DataArchive
 from vnpy.trader.object import (
     OrderRequest,
     SubscribeRequest,
@@ -20,6 +22,7 @@ from vnpy.trader.object import (
     LogData,
     TickData,
     BarData,
+    BarBatch,
     ContractData
 )
 from vnpy.trader.event import (
@@ -52,6 +55,7 @@ from .base import (
 )
 from .template import CtaTemplate
 from .converter import OffsetConverter
+from .aggregator import BarAggregator
 
 
 STOP_STATUS_MAP = {
@@ -98,10 +102,23 @@ class CtaEngine(BaseEngine):
         self.rq_client = None
         self.rq_symbols = set()
 
-        self.vt_tradeids = set()    # for filtering duplicate trade
+        self.vt_tradeids = {}       # for filtering duplicate trade
+
+        # Finished orders and trades are moved into archive
+        self.trade_archive = DataArchive(
+            self.vt_tradeids, "cta_tradeid", event_engine=event_engine
+        )
+        self.order_archive = DataArchive(
+            self.orderid_strategy_map,
+            "cta_order_strategy",
+            convert=attrgetter("strategy_name"),
+            event_engine=event_engine
+        )
 
         self.offset_converter = OffsetConverter(self.main_engine)
 
+        self.bar_aggregator = BarAggregator(self.process_bar)
+
     def init_engine(self):
         """
         """
@@ -116,6 +133,9 @@ class CtaEngine(BaseEngine):
         """"""
         self.stop_all_strategies()
 
+        self.trade_archive.close()
+        self.order_archive.close()
+
     def register_event(self):
         """"""
         self.event_engine.register(EVENT_TICK, self.process_tick_event)
@@ -151,6 +171,9 @@ class CtaEngine(BaseEngine):
         """"""
         tick = event.data
 
+        # Bars may be subscribed by strategies of other symbols
+        self.bar_aggregator.update_tick(tick)
+
         strategies = self.symbol_strategy_map[tick.vt_symbol]
         if not strategies:
             return
@@ -161,20 +184,30 @@ class CtaEngine(BaseEngine):
             if strategy.inited:
                 self.call_strategy_func(strategy, strategy.on_tick, tick)
 
+    def process_bar(self, strategy: CtaTemplate, callback: Callable, bar: BarData):
+        """
+        Push bar of shared bar stream to strategy.
+        """
+        if strategy.inited:
+            self.call_strategy_func(strategy, callback, bar)
+
     def process_order_event(self, event: Event):
         """"""
         order = event.data
         
         self.offset_converter.update_order(order)
 
-        strategy = self.orderid_strategy_map.get(order.vt_orderid, None)
+        strategy = self.get_order_strategy(order.vt_orderid)
         if not strategy:
             return
 
         # Remove vt_orderid if order is no longer active.
-        vt_orderids = self.strategy_orderid_map[strategy.strategy_name]
-        if order.vt_orderid in vt_orderids and not order.is_active():
-            vt_orderids.remove(order.vt_orderid)
+        if not order.is_active():
+            vt_orderids = self.strategy_orderid_map[strategy.strategy_name]
+            if order.vt_orderid in vt_orderids:
+                vt_orderids.remove(order.vt_orderid)
+
+            self.order_archive.finish(order.vt_orderid)
 
         # For server stop order, call strategy on_stop_order function
         if order.type == OrderType.STOP:
@@ -199,13 +232,14 @@ class CtaEngine(BaseEngine):
         trade = event.data
 
         # Filter duplicate trade push
-        if trade.vt_tradeid in self.vt_tradeids:
+        if trade.vt_tradeid in self.trade_archive:
             return
-        self.vt_tradeids.add(trade.vt_tradeid)
+        self.vt_tradeids[trade.vt_tradeid] = True
+        self.trade_archive.finish(trade.vt_tradeid)
 
         self.offset_converter.update_trade(trade)
 
-        strategy = self.orderid_strategy_map.get(trade.vt_orderid, None)
+        strategy = self.get_order_strategy(trade.vt_orderid)
         if not strategy:
             return
 
@@ -217,6 +251,19 @@ class CtaEngine(BaseEngine):
         self.call_strategy_func(strategy, strategy.on_trade, trade)
         self.put_strategy_event(strategy)
 
+    def get_order_strategy(self, vt_orderid: str):
+        """
+        Get strategy which sent the order, including archived orders.
+        """
+        strategy = self.orderid_strategy_map.get(vt_orderid, None)
+        if strategy:
+            return strategy
+
+        strategy_name = self.order_archive.get_archived(vt_orderid)
+        if strategy_name:
+            return self.strategies.get(strategy_name, None)
+        return None
+
     def process_position_event(self, event: Event):
         """"""
         position = event.data
@@ -306,6 +353,7 @@ class CtaEngine(BaseEngine):
             type=type,
             price=price,
             volume=volume,
+            reference=f"{APP_NAME}_{strategy.strategy_name}"
         )
 
         # Convert with offset converter
@@ -526,6 +574,85 @@ class CtaEngine(BaseEngine):
         for bar in bars:
             callback(bar)
 
+    def load_bar_batch(
+        self,
+        vt_symbol: str,
+        days: int,
+        interval: Interval,
+        callback: Callable[[BarBatch], None]
+    ):
+        """
+        Load history bars as one BarBatch and call callback once.
+        """
+        batch = self.query_bar_batch(vt_symbol, days, interval)
+        callback(batch)
+
+    def query_bar_batch(self, vt_symbol: str, days: int, interval: Interval):
+        """
+        Query history bars as BarBatch without creating BarData objects.
+        """
+        symbol, exchange = extract_vt_symbol(vt_symbol)
+        end = datetime.now()
+        start = end - timedelta(days)
+
+        # Query bars from RQData by default, if not found, load from database.
+        req = HistoryRequest(
+            symbol=symbol,
+            exchange=exchange,
+            interval=interval,
+            start=start,
+            end=end
+        )
+        batch = rqdata_client.query_history_batch(req)
+
+        if not batch:
+            batch = database_manager.load_bar_batch(
+                symbol=symbol,
+                exchange=exchange,
+                interval=interval,
+                start=start,
+                end=end,
+            )
+
+        return batch
+
+    def subscribe_bar(
+        self,
+        strategy: CtaTemplate,
+        callback: Callable[[BarData], None],
+        window: int,
+        interval: Interval,
+        size: int,
+        days: int,
+        vt_symbol: str
+    ):
+        """
+        Subscribe bars aggregated once for all strategies of the symbol.
+        """
+        def load_history():
+            if days:
+                return self.query_bar_batch(vt_symbol, days, Interval.MINUTE)
+
+        # Subscribe market data of symbol other than the strategy's
+        if vt_symbol != strategy.vt_symbol:
+            contract = self.main_engine.get_contract(vt_symbol)
+            if contract:
+                req = SubscribeRequest(
+                    symbol=contract.symbol, exchange=contract.exchange)
+                self.main_engine.subscribe(req, contract.gateway_name)
+            else:
+                self.write_log(f"行情订阅失败，找不到合约{vt_symbol}", strategy)
+
+        return self.bar_aggregator.subscribe(
+            strategy,
+            vt_symbol,
+            callback,
+            window,
+            interval,
+            size,
+            load_history
+        )
+
     def load_tick(
         self, 
         vt_symbol: str,
@@ -704,6 +831,9 @@ class CtaEngine(BaseEngine):
         strategies = self.symbol_strategy_map[strategy.vt_symbol]
         strategies.remove(strategy)
 
+        # Remove from shared bar streams
+        self.bar_aggregator.unsubscribe(strategy)
+
         # Remove from active orderid map
         if strategy_name in self.strategy_orderid_map:
             vt_orderids = self.strategy_orderid_map.pop(strategy_name)
@@ -3,7 +3,7 @@ from abc import ABC
 from typing import Any, Callable
 
 from vnpy.trader.constant import Interval, Direction, Offset
-from vnpy.trader.object import BarData, TickData, OrderData, TradeData
+from vnpy.trader.object import BarData, TickData, OrderData, TradeData, BarBatch
 from vnpy.trader.utility import virtual
 
 from .base import StopOrder, EngineType
@@ -123,6 +123,16 @@ class CtaTemplate(ABC):
         """
         pass
 
+    @virtual
+    def on_bar_batch(self, batch: BarBatch):
+        """
+        Callback of history bars loaded by load_bar_batch. Strategy can
+        override it to update ArrayManager by update_batch at once, by
+        default each bar is pushed to on_bar.
+        """
+        for bar in batch:
+            self.on_bar(bar)
+
     @virtual
     def on_trade(self, trade: TradeData):
         """
@@ -228,6 +238,48 @@ class CtaTemplate(ABC):
 
         self.cta_engine.load_bar(self.vt_symbol, days, interval, callback)
 
+    def load_bar_batch(
+        self,
+        days: int,
+        interval: Interval = Interval.MINUTE,
+        callback: Callable = None,
+    ):
+        """
+        Load historical bar data as one BarBatch for initializing strategy
+        in one shot, instead of calling on_bar with each bar.
+        """
+        if not callback:
+            callback = self.on_bar_batch
+
+        self.cta_engine.load_bar_batch(self.vt_symbol, days, interval, callback)
+
+    def subscribe_bar(
+        self,
+        callback: Callable,
+        window: int = 1,
+        interval: Interval = Interval.MINUTE,
+        size: int = 0,
+        days: int = 0,
+        vt_symbol: str = ""
+    ):
+        """
+        Subscribe bars of a timeframe aggregated once for all strategies
+        trading the same symbol, instead of creating own BarGenerator.
+
+        If size is not 0, return an ArrayManager of the size shared by
+        strategies, which is updated before callback and warmed up with
+        history bars of days. It should not be updated by strategy.
+
+        Bars of symbols other than vt_symbol of strategy can also be
+        subscribed, e.g. for updating MultiArrayManager.
+        """
+        if not vt_symbol:
+            vt_symbol = self.vt_symbol
+
+        return self.cta_engine.subscribe_bar(
+            self, callback, window, interval, size, days, vt_symbol
+        )
+
     def load_tick(self, days: int):
         """
         Load historical tick data for initializing strategy.
@@ -2,7 +2,7 @@
 
 from collections import defaultdict
 from vnpy.trader.object import OrderRequest, LogData
-from vnpy.event import Event, EventEngine, EVENT_TIMER
+from vnpy.event import Event, EventEngine
 from vnpy.trader.engine import BaseEngine, MainEngine
 from vnpy.trader.event import EVENT_TRADE, EVENT_ORDER, EVENT_LOG
 from vnpy.trader.constant import Status
@@ -29,7 +29,7 @@ class RiskManagerEngine(BaseEngine):
         self.order_flow_limit = 50
 
         self.order_flow_clear = 1
-        self.order_flow_timer = 0
+        self.order_flow_timer = None
 
         self.order_size_limit = 100
 
@@ -43,6 +43,7 @@ class RiskManagerEngine(BaseEngine):
 
         self.load_setting()
         self.register_event()
+        self.start_order_flow_timer()
         self.patch_send_order()
 
     def patch_send_order(self):
@@ -70,6 +71,9 @@ class RiskManagerEngine(BaseEngine):
         self.active_order_limit = setting["active_order_limit"]
         self.order_cancel_limit = setting["order_cancel_limit"]
 
+        if self.order_flow_timer:
+            self.start_order_flow_timer()
+
         if self.active:
             self.write_log("交易风控功能启动")
         else:
@@ -104,9 +108,22 @@ class RiskManagerEngine(BaseEngine):
     def register_event(self):
         """"""
         self.event_engine.register(EVENT_TRADE, self.process_trade_event)
-        self.event_engine.register(EVENT_TIMER, self.process_timer_event)
         self.event_engine.register(EVENT_ORDER, self.process_order_event)
 
+    def start_order_flow_timer(self):
+        """
+        Start timer for clearing order flow count every order_flow_clear
+        seconds, the previous one is cancelled.
+        """
+        if self.order_flow_timer:
+            self.order_flow_timer.cancel()
+
+        # Cleared every second at least, same as counting timer events
+        interval = max(self.order_flow_clear, 1)
+        self.order_flow_timer = self.event_engine.call_every(
+            interval, self.clear_order_flow
+        )
+
     def process_order_event(self, event: Event):
         """"""
         order = event.data
@@ -119,13 +136,9 @@ class RiskManagerEngine(BaseEngine):
         trade = event.data
         self.trade_count += trade.volume
 
-    def process_timer_event(self, event: Event):
+    def clear_order_flow(self):
         """"""
-        self.order_flow_timer += 1
-
-        if self.order_flow_timer >= self.order_flow_clear:
-            self.order_flow_count = 0
-            self.order_flow_timer = 0
+        self.order_flow_count = 0
 
     def write_log(self, msg: str):
         """"""
@@ -161,7 +174,7 @@ class RiskManagerEngine(BaseEngine):
             return False
 
         # Check all active orders
-        active_order_count = len(self.main_engine.get_all_active_orders())
+        active_order_count = self.main_engine.get_active_order_count()
         if active_order_count >= self.active_order_limit:
             self.write_log(
                 f"当前活动委托次数{active_order_count}，超过限制{self.active_order_limit}")
@@ -1 +1,17 @@
-from .engine import Event, EventEngine, EVENT_TIMER
+from .engine import (
+    Event,
+    EventEngine,
+    Timer,
+    EVENT_TIMER,
+    EVENT_ENGINE_STATS,
+    PRIORITY_HIGH,
+    PRIORITY_MEDIUM,
+    PRIORITY_LOW,
+    OVERLOAD_BLOCK,
+    OVERLOAD_DROP_OLDEST,
+    OVERLOAD_CONFLATE
+)
+from .sharded import ShardedEventEngine
+from .async_engine import AsyncEventEngine
+from .inline import InlineEventEngine
+from .journal import EventJournal, EventReplayer, read_journal
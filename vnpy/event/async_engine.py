@@ -0,0 +1,232 @@
+"""
+Asyncio native event engine.
+"""
+
+import asyncio
+from inspect import isawaitable
+from threading import Thread, get_ident
+from time import monotonic, perf_counter
+
+from .engine import Event, EventEngine
+
+
+class AsyncEventEngine(EventEngine):
+    """
+    Event engine running in an asyncio event loop.
+
+    It provides the same register/unregister/put functions as EventEngine,
+    and handlers can be either plain functions or coroutine functions.
+    Coroutine returned by handler is awaited before the next event is
+    processed, so events are still processed one by one in order.
+
+    If no loop is given, a new event loop is created and run in a
+    background thread when engine started. Otherwise the engine runs in
+    the loop given, which should be run by caller, so that gateways,
+    strategies and persistence can share one loop.
+
+    The put function is thread-safe, so it can also be called from
+    threads of other gateways.
+    """
+
+    def __init__(self, interval: int = 1, loop: asyncio.AbstractEventLoop = None):
+        """"""
+        super(AsyncEventEngine, self).__init__(interval)
+
+        if loop:
+            self._loop = loop
+            self._thread = None
+        else:
+            self._loop = asyncio.new_event_loop()
+            self._thread = Thread(target=self._run_loop)
+
+        self._loop_ident = 0
+        self._queue = None      # created in loop for binding to it
+        self._tasks = []
+        self._pending = []      # (event, handler, awaitable) list
+        self._timer_signal = None
+
+    def _run_loop(self):
+        """
+        Run event loop in background thread.
+        """
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    async def _run(self):
+        """
+        Get event from queue and then process it.
+        """
+        self._loop_ident = get_ident()
+        queue = self._get_queue()
+
+        while self._active:
+            try:
+                event = await asyncio.wait_for(queue.get(), 1)
+            except asyncio.TimeoutError:
+                continue
+
+            self._process(event)
+
+            if self._pending:
+                await self._await_pending()
+
+    async def _await_pending(self):
+        """
+        Await results returned by coroutine handlers in order.
+        """
+        pending = self._pending
+        self._pending = []
+
+        for event, handler, awaitable in pending:
+            start = perf_counter()
+            await awaitable
+
+            if self._stats_active:
+                end = perf_counter()
+                self._add_handler_stats(event.type, handler, end - start)
+
+    def _call_handlers(self, event: Event, handlers: list):
+        """
+        Call handlers with event, and keep result of coroutine handler
+        for awaiting.
+        """
+        for handler in handlers:
+            result = handler(event)
+            if isawaitable(result):
+                self._pending.append((event, handler, result))
+
+    def _call_handlers_with_stats(self, event: Event, handlers: list):
+        """
+        Call handlers with event and record latency of plain handlers.
+        Latency of coroutine handlers is recorded when awaited.
+        """
+        for handler in handlers:
+            start = perf_counter()
+            result = handler(event)
+            end = perf_counter()
+
+            if isawaitable(result):
+                self._pending.append((event, handler, result))
+            else:
+                self._add_handler_stats(event.type, handler, end - start)
+
+    async def _run_timer(self):
+        """
+        Wait until deadline of next timer and then call timers due.
+        """
+        self._timer_signal = asyncio.Event()
+        self._add_timer_event_timer()
+
+        while self._active:
+            self._timer_signal.clear()
+            self._run_due_timers()
+
+            timeout = self._scheduler.get_timeout(monotonic())
+            try:
+                await asyncio.wait_for(self._timer_signal.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def _wake_timer(self):
+        """
+        Wake timer for checking deadline of timers again, thread-safe.
+        """
+        if self._timer_signal:
+            self._call_soon_threadsafe(self._timer_signal.set)
+
+    async def _start_tasks(self):
+        """"""
+        self._tasks = [
+            asyncio.ensure_future(self._run()),
+            asyncio.ensure_future(self._run_timer()),
+        ]
+
+    async def _stop_tasks(self):
+        """"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def start(self):
+        """
+        Start event engine to process events and generate timer events.
+        """
+        self._active = True
+
+        if self._thread:
+            self._thread.start()
+
+        asyncio.run_coroutine_threadsafe(self._start_tasks(), self._loop)
+
+    def stop(self):
+        """
+        Stop event engine.
+
+        The loop created by engine is also stopped and closed, while the
+        loop given by caller is left running.
+        """
+        self._active = False
+
+        if self._thread:
+            future = asyncio.run_coroutine_threadsafe(
+                self._stop_tasks(), self._loop
+            )
+            future.result()
+
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+        else:
+            asyncio.run_coroutine_threadsafe(self._stop_tasks(), self._loop)
+
+    def put(self, event: Event):
+        """
+        Put an event object into event queue, thread-safe.
+
+        Event put after engine stopped with its own loop closed is
+        discarded.
+        """
+        if get_ident() == self._loop_ident:
+            self._queue.put_nowait(event)
+        else:
+            self._call_soon_threadsafe(self._put_nowait, event)
+
+    def _call_soon_threadsafe(self, callback, *args):
+        """
+        Schedule callback in loop, ignored if loop already closed.
+        """
+        try:
+            self._loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:
+            # Own loop is closed after engine stopped
+            if not self._loop.is_closed():
+                raise
+
+    def _put_nowait(self, event: Event):
+        """
+        Put an event object into event queue in loop.
+        """
+        self._get_queue().put_nowait(event)
+
+    def _get_queue(self):
+        """
+        Get event queue, create it if not exists. Must be called in loop.
+        """
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        return self._queue
+
+    def get_queue_size(self):
+        """
+        Get number of events waiting in queue.
+        """
+        if self._queue is None:
+            return 0
+        return self._queue.qsize()
+
+    def get_loop(self):
+        """
+        Get event loop the engine is running in.
+        """
+        return self._loop
@@ -2,13 +2,25 @@
 Event-driven framework of vn.py framework.
 """
 
-from collections import defaultdict
+from collections import defaultdict, deque
+from heapq import heappop, heappush
+from math import ceil
 from queue import Empty, Queue
-from threading import Thread
-from time import sleep
+from threading import Condition, Event as Signal, Lock, Thread, get_ident
+from time import monotonic, perf_counter
 from typing import Any, Callable
 
 EVENT_TIMER = "eTimer"
+EVENT_SCHEDULE = "eSchedule"
+EVENT_ENGINE_STATS = "eEngineStats"
+
+PRIORITY_HIGH = 0
+PRIORITY_MEDIUM = 1
+PRIORITY_LOW = 2
+
+OVERLOAD_BLOCK = "block"
+OVERLOAD_DROP_OLDEST = "dropOldest"
+OVERLOAD_CONFLATE = "conflate"
 
 
 class Event:
@@ -28,6 +40,425 @@ class Event:
 HandlerType = Callable[[Event], None]
 
 
+class LatencyStats:
+    """
+    Statistics of latency samples, with a histogram whose bucket i
+    counts samples shorter than 2^i microseconds.
+    """
+
+    def __init__(self):
+        """"""
+        self.count = 0
+        self.total = 0
+        self.max = 0
+        self.buckets = []
+
+    def add(self, seconds: float):
+        """
+        Add a latency sample in seconds.
+        """
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+        ix = int(seconds * 1_000_000).bit_length()
+        while len(self.buckets) <= ix:
+            self.buckets.append(0)
+        self.buckets[ix] += 1
+
+    def get_data(self):
+        """
+        Get statistics data dict, with latency in microseconds.
+        """
+        if self.count:
+            average = self.total / self.count * 1_000_000
+        else:
+            average = 0
+
+        histogram = {}
+        for ix, count in enumerate(self.buckets):
+            if count:
+                histogram[2 ** ix] = count
+
+        data = {
+            "count": self.count,
+            "average": average,
+            "max": self.max * 1_000_000,
+            "histogram": histogram,
+        }
+        return data
+
+
+class Timer:
+    """
+    Handle of a callback scheduled in event engine, which can be used
+    for cancelling it.
+    """
+
+    def __init__(
+        self,
+        deadline: float,
+        interval: float,
+        callback: Callable[[], None],
+        direct: bool = False
+    ):
+        """
+        Deadline is time of monotonic clock. Callback is called only once
+        if interval is 0, otherwise it is called every interval seconds.
+
+        Direct callback is called in timer thread instead of being put
+        into event queue, which is only used inside event engine.
+        """
+        self.deadline = deadline
+        self.interval = interval
+        self.callback = callback
+        self.direct = direct
+        self.cancelled = False
+
+    def cancel(self):
+        """
+        Cancel the scheduled callback.
+        """
+        self.cancelled = True
+
+
+class Scheduler:
+    """
+    Thread-safe heap of timers ordered by deadline.
+
+    Repeating timer is rescheduled on deadline of last call plus
+    interval, so that it does not drift with latency of calling, and
+    calls missed (e.g. because of system sleep) are skipped.
+    """
+
+    def __init__(self):
+        """"""
+        self._heap = []
+        self._count = 0     # for ordering timers with same deadline
+        self._lock = Lock()
+
+    def add(self, timer: Timer):
+        """
+        Add timer into heap.
+        """
+        with self._lock:
+            self._count += 1
+            heappush(self._heap, (timer.deadline, self._count, timer))
+
+    def pop_due(self, now: float):
+        """
+        Pop all timers due at now, cancelled timers are dropped.
+        """
+        timers = []
+
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                deadline, count, timer = heappop(self._heap)
+                if timer.cancelled:
+                    continue
+                timers.append(timer)
+
+                if timer.interval:
+                    timer.deadline += timer.interval
+                    if timer.deadline <= now:
+                        missed = ceil((now - timer.deadline) / timer.interval)
+                        timer.deadline += missed * timer.interval
+                        if timer.deadline <= now:
+                            timer.deadline += timer.interval
+
+                    self._count += 1
+                    heappush(self._heap, (timer.deadline, self._count, timer))
+
+        return timers
+
+    def get_timeout(self, now: float):
+        """
+        Get seconds until next deadline, None if no timer.
+        """
+        with self._lock:
+            if not self._heap:
+                return None
+            return max(self._heap[0][0] - now, 0)
+
+
+class LaneQueue:
+    """
+    Event queue with one lane for each priority, which provides the
+    same put/get interface as queue.Queue.
+
+    Event is put into lane of the priority set for its type, or the
+    lowest priority lane if not set. Higher priority lanes are always
+    got first, except that a non-empty lower priority lane skipped for
+    starvation_limit times in a row is got once.
+
+    If maxsize is larger than 0, the overload policy of event type is
+    applied when putting into a full queue:
+        * OVERLOAD_BLOCK: wait until queue not full (default)
+        * OVERLOAD_DROP_OLDEST: drop the oldest queued event of the type
+        * OVERLOAD_CONFLATE: replace data of the queued event with the
+        same key (e.g. tick of the same vt_symbol)
+    """
+
+    def __init__(
+        self,
+        priorities: dict,
+        lane_count: int = 3,
+        starvation_limit: int = 100,
+        maxsize: int = 0,
+        policies: dict = None,
+        conflation_keys: dict = None
+    ):
+        """
+        Priorities is a dict of event type: lane index (0 is the highest
+        priority), policies is a dict of event type: overload policy, and
+        conflation_keys is a dict of event type: key attribute, all of
+        which can be updated after queue created.
+        """
+        self._priorities = priorities
+        self._starvation_limit = starvation_limit
+        self._default_lane = lane_count - 1
+
+        self._lanes = [deque() for i in range(lane_count)]
+        self._skip_counts = [0] * lane_count
+        self._lock = Lock()
+        self._condition = Condition(self._lock)
+
+        self._maxsize = maxsize
+        self._policies = policies if policies is not None else {}
+        self._conflation_keys = conflation_keys if conflation_keys is not None else {}
+        self._not_full = Condition(self._lock)
+        self._consumer_ident = 0
+        self._queued_events = {}        # (type, key): event for conflation
+
+        self._dropped_counts = defaultdict(int)
+        self._conflated_counts = defaultdict(int)
+        self._blocked_counts = defaultdict(int)
+        self._overflow_counts = defaultdict(int)
+
+        self._put_counts = [0] * lane_count
+        self._get_counts = [0] * lane_count
+        self._starved_counts = [0] * lane_count
+        self._max_sizes = [0] * lane_count
+
+    def put(self, event: Event):
+        """
+        Put event into lane of its priority.
+        """
+        ix = self._priorities.get(event.type, self._default_lane)
+
+        with self._condition:
+            if self._maxsize:
+                policy = self._policies.get(event.type, OVERLOAD_BLOCK)
+
+                if self._qsize() >= self._maxsize:
+                    if not self._put_overload(event, ix, policy):
+                        return
+
+                if policy == OVERLOAD_CONFLATE:
+                    key = self._get_conflation_key(event)
+                    if key:
+                        self._queued_events[key] = event
+
+            lane = self._lanes[ix]
+            lane.append(event)
+
+            self._put_counts[ix] += 1
+            if len(lane) > self._max_sizes[ix]:
+                self._max_sizes[ix] = len(lane)
+
+            self._condition.notify()
+
+    def get(self, block: bool = True, timeout: float = None):
+        """
+        Get event from lanes, raise Empty if no event got.
+        """
+        with self._condition:
+            if block:
+                if timeout is None:
+                    while not self._qsize():
+                        self._condition.wait()
+                else:
+                    end = monotonic() + timeout
+                    while not self._qsize():
+                        remaining = end - monotonic()
+                        if remaining <= 0:
+                            raise Empty
+                        self._condition.wait(remaining)
+            elif not self._qsize():
+                raise Empty
+
+            event = self._get()
+
+            if self._maxsize:
+                self._consumer_ident = get_ident()
+
+                if self._queued_events:
+                    key = self._get_conflation_key(event)
+                    if key and self._queued_events.get(key, None) is event:
+                        self._queued_events.pop(key)
+
+                self._not_full.notify()
+
+            return event
+
+    def get_nowait(self):
+        """"""
+        return self.get(block=False)
+
+    def _get(self):
+        """
+        Choose the lane to get from, with starvation protection.
+        """
+        chosen = -1
+
+        for ix, lane in enumerate(self._lanes):
+            if not lane:
+                continue
+
+            if chosen < 0:
+                chosen = ix
+            elif self._skip_counts[ix] >= self._starvation_limit:
+                self._starved_counts[ix] += 1
+                chosen = ix
+                break
+            else:
+                self._skip_counts[ix] += 1
+
+        self._skip_counts[chosen] = 0
+        self._get_counts[chosen] += 1
+        return self._lanes[chosen].popleft()
+
+    def _put_overload(self, event: Event, ix: int, policy: str):
+        """
+        Apply overload policy for putting event into a full queue.
+
+        Return True if event should still be put into queue.
+        """
+        type = event.type
+
+        # Conflation is applied only for event type with key set
+        key = None
+        if policy == OVERLOAD_CONFLATE:
+            key = self._get_conflation_key(event)
+
+        if key:
+            queued = self._queued_events.get(key, None)
+            if queued:
+                queued.data = event.data
+                self._conflated_counts[type] += 1
+                return False
+
+            # Events of new key are still put, so queue size exceeds
+            # maxsize by no more than number of keys.
+            self._overflow_counts[type] += 1
+            return True
+
+        elif policy == OVERLOAD_DROP_OLDEST:
+            lane = self._lanes[ix]
+            self._dropped_counts[type] += 1
+
+            for queued in lane:
+                if queued.type == type:
+                    lane.remove(queued)
+                    return True
+
+            # Drop the new event if no event of same type queued
+            return False
+
+        else:
+            # Blocking event thread itself (e.g. put in handler) would
+            # never be woken up.
+            if get_ident() == self._consumer_ident:
+                self._overflow_counts[type] += 1
+                return True
+
+            self._blocked_counts[type] += 1
+            while self._maxsize and self._qsize() >= self._maxsize:
+                self._not_full.wait()
+            return True
+
+    def _get_conflation_key(self, event: Event):
+        """"""
+        key_name = self._conflation_keys.get(event.type, None)
+        if not key_name:
+            return None
+        return (event.type, getattr(event.data, key_name))
+
+    def close(self):
+        """
+        Stop limiting queue size and wake up all threads blocked in put,
+        called when event engine stopped.
+        """
+        with self._condition:
+            self._maxsize = 0
+            self._queued_events.clear()
+            self._not_full.notify_all()
+
+    def _qsize(self):
+        """"""
+        return sum(len(lane) for lane in self._lanes)
+
+    def qsize(self):
+        """
+        Get number of events waiting in all lanes.
+        """
+        with self._condition:
+            return self._qsize()
+
+    def get_stats(self):
+        """
+        Get statistics data of each lane.
+        """
+        with self._condition:
+            stats = []
+            for ix, lane in enumerate(self._lanes):
+                data = {
+                    "priority": ix,
+                    "size": len(lane),
+                    "max_size": self._max_sizes[ix],
+                    "put_count": self._put_counts[ix],
+                    "get_count": self._get_counts[ix],
+                    "starved_count": self._starved_counts[ix],
+                }
+                stats.append(data)
+            return stats
+
+    def get_overload_stats(self):
+        """
+        Get number of events shed or delayed in full queue by type.
+        """
+        with self._condition:
+            stats = {
+                "maxsize": self._maxsize,
+                "dropped": dict(self._dropped_counts),
+                "conflated": dict(self._conflated_counts),
+                "blocked": dict(self._blocked_counts),
+                "overflow": dict(self._overflow_counts),
+            }
+            return stats
+
+
+def get_handler_name(handler: HandlerType):
+    """
+    Get readable name of handler function for statistics.
+
+    Name of bound method includes class and id of the object bound, so
+    that handlers of different objects (e.g. signal emit of each monitor)
+    are not merged. Name of function includes its id, so that lambdas or
+    nested functions of the same qualname are not merged either.
+    """
+    owner = getattr(handler, "__self__", None)
+    if owner is not None:
+        name = getattr(handler, "__name__", "")
+        return f"{type(owner).__qualname__}.{name}@{id(owner):#x}"
+
+    name = getattr(handler, "__qualname__", "")
+    if not name:
+        return repr(handler)
+    return f"{name}@{id(handler):#x}"
+
+
 class EventEngine:
     """
     Event engine distributes event object based on its type 
@@ -37,19 +468,78 @@ class EventEngine:
     which can be used for timing purpose.
     """
 
-    def __init__(self, interval: int = 1):
+    def __init__(
+        self,
+        interval: int = 1,
+        batch_size: int = 0,
+        priority: bool = False,
+        maxsize: int = 0
+    ):
         """
         Timer event is generated every 1 second by default, if
         interval not specified.
+
+        If batch_size is larger than 0, the engine drains up to
+        batch_size events from queue every time it wakes up, and
+        events of conflatable types are conflated within each batch for
+        handlers registered with conflate.
+
+        If priority is True, events are queued in lanes of the priority
+        set for their types, so that events of higher priority (e.g.
+        order and trade) are processed before those of lower priority
+        (e.g. tick and log) waiting in queue.
+
+        If maxsize is larger than 0, number of events in queue is limited
+        by applying overload policy of event type when queue is full.
         """
         self._interval = interval
-        self._queue = Queue()
+        self._batch_size = batch_size
+        self._maxsize = maxsize
+
+        self._priorities = {}                           # type: priority
+        self._conflation_keys = {}                      # type: key attribute
+        self._overload_policies = {                     # type: policy
+            EVENT_TIMER: OVERLOAD_DROP_OLDEST,
+            EVENT_ENGINE_STATS: OVERLOAD_DROP_OLDEST,
+        }
+
+        if priority or maxsize:
+            self._queue = LaneQueue(
+                self._priorities if priority else {},
+                lane_count=3 if priority else 1,
+                maxsize=maxsize,
+                policies=self._overload_policies,
+                conflation_keys=self._conflation_keys
+            )
+        else:
+            self._queue = Queue()
         self._active = False
-        self._thread = Thread(target=self._run)
         self._timer = Thread(target=self._run_timer)
+        self._scheduler = Scheduler()
+        self._timer_signal = Signal()
         self._handlers = defaultdict(list)
         self._general_handlers = []
 
+        self._conflated_handlers = defaultdict(set)     # type: handler set
+
+        self._topic_keys = {}                           # type: key attribute
+        self._topic_index = defaultdict(dict)           # type: {key: topic}
+
+        self._stats_active = False
+        self._stats_interval = 0
+        self._stats_count = 0
+        self._handler_stats = {}        # (type, handler name): LatencyStats
+        self._delay_stats = LatencyStats()
+        self._max_queue_size = 0
+        self._stats_lock = Lock()       # stats updated by several workers
+
+        self.register(EVENT_SCHEDULE, self._process_schedule_event)
+
+        if batch_size > 0:
+            self._thread = Thread(target=self._run_batch)
+        else:
+            self._thread = Thread(target=self._run)
+
     def _run(self):
         """
         Get event from queue and then process it.
@@ -61,28 +551,215 @@ class EventEngine:
             except Empty:
                 pass
 
-    def _process(self, event: Event):
+    def _run_batch(self):
+        """
+        Get all events (up to batch size) from queue and then process
+        them as a batch.
+        """
+        while self._active:
+            try:
+                event = self._queue.get(block=True, timeout=1)
+            except Empty:
+                continue
+
+            events = [event]
+            try:
+                while len(events) < self._batch_size:
+                    events.append(self._queue.get_nowait())
+            except Empty:
+                pass
+
+            self._process_batch(events)
+
+    def _process_batch(self, events: list):
+        """
+        Process a batch of events in order.
+
+        For events of conflatable types, only the latest one of each
+        key in the batch is distributed to those conflated handlers,
+        while other handlers still receive all of them.
+        """
+        if not self._conflated_handlers:
+            for event in events:
+                self._process(event)
+            return
+
+        latest = {}
+        for event in events:
+            key_name = self._conflation_keys.get(event.type, None)
+            if key_name:
+                key = (event.type, getattr(event.data, key_name))
+                latest[key] = event
+
+        latest_ids = set(id(event) for event in latest.values())
+
+        for event in events:
+            if event.type in self._conflation_keys:
+                stale = id(event) not in latest_ids
+                self._process(event, stale)
+            else:
+                self._process(event)
+
+    def _process(self, event: Event, stale: bool = False):
         """
         First ditribute event to those handlers registered listening
         to this type. 
 
         Then distrubute event to those general handlers which listens
         to all types.
+
+        For event of a hierarchical topic type, it is also distributed
+        to handlers listening to the sub topic of its key, e.g. tick of
+        rb2001.SHFE to handlers of "eTick.rb2001.SHFE".
+
+        A stale event (conflated by a later one of the same key) is
+        not distributed to conflated handlers.
         """
         if event.type in self._handlers:
-            [handler(event) for handler in self._handlers[event.type]]
+            self._distribute(event, event.type, stale)
+
+        if event.type in self._topic_keys:
+            key = getattr(event.data, self._topic_keys[event.type])
+            topic = self._topic_index[event.type].get(key, None)
+            if topic:
+                self._distribute(event, topic, stale)
 
         if self._general_handlers:
-            [handler(event) for handler in self._general_handlers]
+            self._call_handlers(event, self._general_handlers)
+
+    def _distribute(self, event: Event, type: str, stale: bool):
+        """
+        Distribute event to handlers registered listening to the type.
+        """
+        handlers = self._handlers[type]
+
+        if stale and type in self._conflated_handlers:
+            conflated = self._conflated_handlers[type]
+            handlers = [h for h in handlers if h not in conflated]
+
+        self._call_handlers(event, handlers)
+
+    def _call_handlers(self, event: Event, handlers: list):
+        """
+        Call handlers with event.
+        """
+        [handler(event) for handler in handlers]
+
+    def _process_with_stats(self, event: Event, stale: bool = False):
+        """
+        Record queue size and delay since event put before processing it.
+        """
+        put_time = getattr(event, "put_time", 0)
+        queue_size = self.get_queue_size()
+
+        with self._stats_lock:
+            if put_time:
+                self._delay_stats.add(perf_counter() - put_time)
+
+            if queue_size > self._max_queue_size:
+                self._max_queue_size = queue_size
+
+        self.__class__._process(self, event, stale)
+
+    def _call_handlers_with_stats(self, event: Event, handlers: list):
+        """
+        Call handlers with event and record latency of each handler.
+        """
+        for handler in handlers:
+            start = perf_counter()
+            handler(event)
+            end = perf_counter()
+
+            self._add_handler_stats(event.type, handler, end - start)
+
+    def _add_handler_stats(self, type: str, handler: HandlerType, seconds: float):
+        """
+        Add a latency sample of handler processing event of the type.
+
+        Handlers are keyed by name, so that no reference to handlers
+        unregistered is kept.
+        """
+        key = (type, get_handler_name(handler))
+
+        with self._stats_lock:
+            stats = self._handler_stats.get(key, None)
+            if not stats:
+                stats = LatencyStats()
+                self._handler_stats[key] = stats
+            stats.add(seconds)
+
+    def _put_with_stats(self, event: Event):
+        """
+        Record time of event put and then put it.
+        """
+        event.put_time = perf_counter()
+        self.__class__.put(self, event)
 
     def _run_timer(self):
         """
-        Sleep by interval second(s) and then generate a timer event.
+        Wait until deadline of next timer and then call timers due.
+
+        Timer event is generated every interval second(s) by a timer
+        scheduled here.
         """
+        self._add_timer_event_timer()
+
         while self._active:
-            sleep(self._interval)
-            event = Event(EVENT_TIMER)
-            self.put(event)
+            self._timer_signal.clear()
+            self._run_due_timers()
+
+            timeout = self._scheduler.get_timeout(monotonic())
+            self._timer_signal.wait(timeout)
+
+    def _add_timer_event_timer(self):
+        """
+        Add timer for generating timer event every interval second(s).
+        """
+        timer = Timer(
+            monotonic() + self._interval,
+            self._interval,
+            self._put_timer_event,
+            direct=True
+        )
+        self._scheduler.add(timer)
+
+    def _run_due_timers(self):
+        """
+        Call direct timers due, and put schedule event of other timers
+        due into queue so that they are called in event thread.
+        """
+        for timer in self._scheduler.pop_due(monotonic()):
+            if timer.direct:
+                timer.callback()
+            else:
+                self.put(Event(EVENT_SCHEDULE, timer))
+
+    def _process_schedule_event(self, event: Event):
+        """
+        Call callback of timer due, if not cancelled yet.
+        """
+        timer = event.data
+        if not timer.cancelled:
+            timer.callback()
+
+    def _wake_timer(self):
+        """
+        Wake timer for checking deadline of timers again.
+        """
+        self._timer_signal.set()
+
+    def _put_timer_event(self):
+        """
+        Put a timer event, and also a stats event if it is time to.
+        """
+        event = Event(EVENT_TIMER)
+        self.put(event)
+
+        if self._stats_active and self._stats_interval:
+            self._stats_count += 1
+            if self._stats_count >= self._stats_interval:
+                self._stats_count = 0
+                self.put(Event(EVENT_ENGINE_STATS, self.get_stats()))
 
     def start(self):
         """
@@ -97,6 +774,11 @@ class EventEngine:
         Stop event engine.
         """
         self._active = False
+        self._wake_timer()
+
+        if isinstance(self._queue, LaneQueue):
+            self._queue.close()
+
         self._timer.join()
         self._thread.join()
 
@@ -106,15 +788,164 @@ class EventEngine:
         """
         self._queue.put(event)
 
-    def register(self, type: str, handler: HandlerType):
+    def get_queue_size(self):
+        """
+        Get number of events waiting in queue.
+        """
+        return self._queue.qsize()
+
+    def call_later(self, delay: float, callback: Callable[[], None]):
+        """
+        Call callback once in event thread after delay second(s).
+
+        Return a Timer object which can be used for cancelling it.
+        """
+        timer = Timer(monotonic() + delay, 0, callback)
+        self._add_timer(timer)
+        return timer
+
+    def call_every(self, interval: float, callback: Callable[[], None]):
+        """
+        Call callback in event thread every interval second(s), which
+        can be shorter than 1 second.
+
+        Return a Timer object which can be used for cancelling it.
+        """
+        timer = Timer(monotonic() + interval, interval, callback)
+        self._add_timer(timer)
+        return timer
+
+    def _add_timer(self, timer: Timer):
+        """"""
+        self._scheduler.add(timer)
+        self._wake_timer()
+
+    def start_stats(self, interval: int = 0):
+        """
+        Start recording statistics of event processing: call count and
+        latency of each handler, queue size and delay from event put to
+        event processed.
+
+        If interval is larger than 0, a stats event with data returned
+        by get_stats is put every interval timer events.
+        """
+        self._stats_interval = interval
+        self._stats_count = 0
+        self._stats_active = True
+
+        self._process = self._process_with_stats
+        self._call_handlers = self._call_handlers_with_stats
+        self.put = self._put_with_stats
+
+    def stop_stats(self):
+        """
+        Stop recording statistics, recorded data is kept.
+        """
+        if not self._stats_active:
+            return
+        self._stats_active = False
+
+        del self._process
+        del self._call_handlers
+        del self.put
+
+    def clear_stats(self):
+        """
+        Clear all recorded statistics data.
+        """
+        with self._stats_lock:
+            self._handler_stats = {}
+            self._delay_stats = LatencyStats()
+            self._max_queue_size = 0
+
+    def get_stats(self):
+        """
+        Get snapshot of recorded statistics data, latency in microseconds.
+        """
+        handlers = []
+
+        with self._stats_lock:
+            for key, stats in self._handler_stats.items():
+                type, name = key
+                data = stats.get_data()
+                data["type"] = type
+                data["handler"] = name
+                handlers.append(data)
+
+            max_queue_size = self._max_queue_size
+            delay = self._delay_stats.get_data()
+
+        stats = {
+            "queue_size": self.get_queue_size(),
+            "max_queue_size": max_queue_size,
+            "delay": delay,
+            "handlers": handlers,
+            "lanes": self.get_lane_stats(),
+            "overload": self.get_overload_stats(),
+        }
+        return stats
+
+    def set_priority(self, type: str, priority: int):
+        """
+        Set priority of a specific event type, which is used only if
+        engine created with priority enabled.
+
+        Events of types without priority set are of PRIORITY_LOW.
+        """
+        self._priorities[type] = priority
+
+    def get_lane_stats(self):
+        """
+        Get statistics data of each priority lane: size, max size, put
+        count, get count and number of times got for starvation.
+
+        Return empty list if priority not enabled.
+        """
+        if isinstance(self._queue, LaneQueue):
+            return self._queue.get_stats()
+        return []
+
+    def set_overload_policy(self, type: str, policy: str):
+        """
+        Set policy applied when putting event of a specific type into
+        full queue, which is used only if engine created with maxsize.
+
+        OVERLOAD_CONFLATE requires conflation key set for the type by
+        set_conflation. Events of types without policy set are blocked
+        until queue not full, never set other policies for events which
+        must be delivered in full (e.g. order and trade).
+        """
+        self._overload_policies[type] = policy
+
+    def get_overload_stats(self):
+        """
+        Get number of events dropped, conflated, blocked or put exceeding
+        maxsize by type, when queue is full.
+
+        Return empty dict if maxsize not set.
+        """
+        if self._maxsize:
+            return self._queue.get_overload_stats()
+        return {}
+
+    def register(self, type: str, handler: HandlerType, conflate: bool = False):
         """
         Register a new handler function for a specific event type. Every 
         function can only be registered once for each event type.
+
+        If conflate is True, the handler only receives the latest event
+        of each key when events are conflated in batch mode, which suits
+        handlers only caring about latest status, such as UI monitors.
         """
         handler_list = self._handlers[type]
         if handler not in handler_list:
             handler_list.append(handler)
 
+        if conflate:
+            self._conflated_handlers[type].add(handler)
+
+        self._index_topic(type)
+
     def unregister(self, type: str, handler: HandlerType):
         """
         Unregister an existing handler function from event engine.
@@ -126,6 +957,59 @@ class EventEngine:
 
         if not handler_list:
             self._handlers.pop(type)
+            self._unindex_topic(type)
+
+        if type in self._conflated_handlers:
+            conflated = self._conflated_handlers[type]
+            conflated.discard(handler)
+
+            if not conflated:
+                self._conflated_handlers.pop(type)
+
+    def set_conflation(self, type: str, key: str):
+        """
+        Mark events of a specific type as conflatable by the value of
+        key attribute of event data (e.g. vt_symbol for tick), so that
+        handlers registered with conflate only receive the latest one of
+        each key in batch mode. It is also used by OVERLOAD_CONFLATE
+        policy of full queue.
+
+        Never mark events which must be delivered in full (e.g. order
+        and trade) as conflatable.
+        """
+        self._conflation_keys[type] = key
+
+    def register_topic(self, type: str, key: str):
+        """
+        Mark a specific event type as hierarchical topic, with the value
+        of key attribute of event data as sub topic.
+
+        For example, after marking "eTick." with key "vt_symbol", handlers
+        registered for "eTick.rb2001.SHFE" receive "eTick." events with
+        tick of rb2001.SHFE, so that only one event needs to be put.
+        """
+        self._topic_keys[type] = key
+
+        for sub_type in list(self._handlers.keys()):
+            self._index_topic(sub_type)
+
+    def _index_topic(self, sub_type: str):
+        """
+        Add sub topic type into index of its parent topic type.
+        """
+        for type in self._topic_keys.keys():
+            if sub_type.startswith(type) and sub_type != type:
+                key = sub_type[len(type):]
+                self._topic_index[type][key] = sub_type
+
+    def _unindex_topic(self, sub_type: str):
+        """
+        Remove sub topic type from index of its parent topic type.
+        """
+        for type in self._topic_keys.keys():
+            if sub_type.startswith(type) and sub_type != type:
+                key = sub_type[len(type):]
+                self._topic_index[type].pop(key, None)
 
     def register_general(self, handler: HandlerType):
         """
@@ -0,0 +1,80 @@
+"""
+Inline synchronous event engine.
+"""
+
+from collections import deque
+from threading import RLock
+
+from .engine import Event, EventEngine
+
+
+class InlineEventEngine(EventEngine):
+    """
+    Event engine which processes event directly in the thread calling
+    put (e.g. callback thread of gateway API), without the thread switch
+    of event queue. Processing is serialized by a lock, so handlers are
+    never called by two threads at the same time.
+
+    Event put by handler during processing is processed after the current
+    one is finished, to keep events processed in order.
+
+    Timer events and scheduled callbacks are still generated by timer
+    thread, and processed in it.
+
+    Suits deployments with only a few handlers each of which is fast,
+    since a slow handler blocks the thread of gateway directly.
+    """
+
+    def __init__(self, interval: int = 1):
+        """"""
+        super(InlineEventEngine, self).__init__(interval)
+
+        self._lock = RLock()
+        self._pending = deque()
+        self._processing = False
+
+    def start(self):
+        """
+        Start timer, and process events put before started.
+        """
+        self._active = True
+        self._timer.start()
+
+        with self._lock:
+            self._process_pending()
+
+    def stop(self):
+        """
+        Stop event engine.
+        """
+        self._active = False
+        self._wake_timer()
+        self._timer.join()
+
+    def put(self, event: Event):
+        """
+        Process event in current thread.
+        """
+        with self._lock:
+            self._pending.append(event)
+
+            if self._active and not self._processing:
+                self._process_pending()
+
+    def _process_pending(self):
+        """
+        Process all pending events, must be called with lock acquired.
+        """
+        self._processing = True
+        try:
+            while self._pending:
+                event = self._pending.popleft()
+                self._process(event)
+        finally:
+            self._processing = False
+
+    def get_queue_size(self):
+        """
+        Get number of events waiting for being processed.
+        """
+        return len(self._pending)
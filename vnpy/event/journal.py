@@ -0,0 +1,307 @@
+"""
+Binary event journal for recording and replaying events.
+
+Journal file layout:
+    * file header: magic bytes
+    * records: header (timestamp, size of payload) + payload
+
+Payload is pickled (type, data) of event, and timestamp is monotonic
+time of event recorded, which is only comparable within a session. Every
+recording session starts with a session record, of which payload is
+SESSION_PAYLOAD and timestamp is wall-clock time of session start. Space of file is allocated in
+chunks and filled with zero, so a record header with payload size 0
+marks the end of journal.
+"""
+
+import mmap
+import os
+import pickle
+from pathlib import Path
+from struct import Struct
+from threading import Lock
+from time import monotonic, perf_counter, sleep, time
+from typing import Iterator, Tuple
+
+from .engine import Event, EventEngine, EVENT_TIMER, EVENT_SCHEDULE, EVENT_ENGINE_STATS
+
+JOURNAL_MAGIC = b"VNJRNL01"
+RECORD_HEADER = Struct("<dI")
+
+# Never a valid pickle, which starts with PROTO opcode b"\x80".
+SESSION_PAYLOAD = b"SESSION"
+
+# Events generated by event engine itself are not recorded, since the
+# engine used for replaying generates them again.
+SKIPPED_TYPES = {EVENT_TIMER, EVENT_SCHEDULE, EVENT_ENGINE_STATS}
+
+
+class EventJournal:
+    """
+    Record all events processed by event engine into an append-only
+    memory-mapped journal file.
+
+    Data is flushed to disk every flush_count records or flush_interval
+    seconds instead of every record, so the overhead in event thread is
+    only pickling and a memory copy. Events with data that cannot be
+    pickled are skipped and counted.
+    """
+
+    def __init__(
+        self,
+        event_engine: EventEngine,
+        path: str,
+        flush_count: int = 1000,
+        flush_interval: float = 1,
+        chunk_size: int = 16 * 1024 * 1024,
+    ):
+        """"""
+        self.event_engine = event_engine
+        self.path = Path(path)
+        self.flush_count = flush_count
+        self.flush_interval = flush_interval
+        self.chunk_size = chunk_size
+
+        self.skipped_types = set(SKIPPED_TYPES)
+        self.write_count = 0
+        self.error_count = 0
+
+        self._lock = Lock()
+        self._file = None
+        self._mmap = None
+        self._size = 0
+        self._pos = 0
+
+        self._unflushed = 0
+        self._flush_time = 0
+
+    def start(self):
+        """
+        Open journal file and start recording events.
+        """
+        self._open()
+        self.event_engine.register_general(self.process_event)
+
+    def close(self):
+        """
+        Stop recording, flush data and truncate unused space of file.
+        """
+        self.event_engine.unregister_general(self.process_event)
+
+        with self._lock:
+            if not self._file:
+                return
+
+            self._mmap.flush()
+            self._mmap.close()
+            self._mmap = None
+
+            self._file.truncate(self._pos)
+            os.fsync(self._file.fileno())
+            self._file.close()
+            self._file = None
+
+    def process_event(self, event: Event):
+        """"""
+        if event.type in self.skipped_types:
+            return
+
+        try:
+            payload = pickle.dumps((event.type, event.data), pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            self.error_count += 1
+            return
+
+        # Monotonic clock is not affected by adjustment of system time,
+        # which would distort timing of replay.
+        self.write(monotonic(), payload)
+
+    def write(self, timestamp: float, payload: bytes):
+        """
+        Append a record into journal.
+        """
+        with self._lock:
+            if not self._mmap:
+                return
+
+            self._append(timestamp, payload)
+
+            self.write_count += 1
+            self._unflushed += 1
+
+            now = monotonic()
+            if (
+                self._unflushed >= self.flush_count
+                or now - self._flush_time >= self.flush_interval
+            ):
+                self._flush(now)
+
+    def _append(self, timestamp: float, payload: bytes):
+        """"""
+        end = self._pos + RECORD_HEADER.size + len(payload)
+        if end > self._size:
+            self._grow(end)
+
+        RECORD_HEADER.pack_into(self._mmap, self._pos, timestamp, len(payload))
+        start = self._pos + RECORD_HEADER.size
+        self._mmap[start:end] = payload
+        self._pos = end
+
+    def flush(self):
+        """
+        Flush recorded data to disk.
+        """
+        with self._lock:
+            if self._mmap:
+                self._flush(monotonic())
+
+    def _flush(self, now: float):
+        """"""
+        self._mmap.flush()
+        self._unflushed = 0
+        self._flush_time = now
+
+    def _open(self):
+        """
+        Open journal file, new records are appended after existing ones.
+        """
+        if self.path.exists() and self.path.stat().st_size:
+            pos = find_journal_end(self.path)
+            self._file = open(self.path, "r+b")
+        else:
+            self._file = open(self.path, "w+b")
+            self._file.write(JOURNAL_MAGIC)
+            pos = len(JOURNAL_MAGIC)
+
+        self._size = 0
+        self._pos = pos
+        self._grow(pos + RECORD_HEADER.size)
+        self._flush_time = monotonic()
+
+        self._append(time(), SESSION_PAYLOAD)
+
+    def _grow(self, end: int):
+        """
+        Extend file by chunks until it can hold data before end.
+        """
+        size = self._size or self.chunk_size
+        while size < end:
+            size += self.chunk_size
+
+        if self._mmap:
+            self._mmap.flush()
+            self._mmap.close()
+
+        self._file.truncate(size)
+        self._mmap = mmap.mmap(self._file.fileno(), size)
+        self._size = size
+
+
+def read_journal(path: str) -> Iterator[Tuple[float, Event]]:
+    """
+    Read (timestamp, event) of records from journal file.
+    """
+    for timestamp, event in _read_events(path):
+        if event:
+            yield timestamp, event
+
+
+def _read_events(path: str):
+    """
+    Read (timestamp, event) of records, event is None for session record.
+    """
+    for timestamp, payload in _read_records(path):
+        if payload == SESSION_PAYLOAD:
+            yield timestamp, None
+        else:
+            type, data = pickle.loads(payload)
+            yield timestamp, Event(type, data)
+
+
+def find_journal_end(path: str):
+    """
+    Get file position after the last complete record of journal.
+    """
+    pos = len(JOURNAL_MAGIC)
+    for timestamp, payload in _read_records(path):
+        pos += RECORD_HEADER.size + len(payload)
+    return pos
+
+
+def _read_records(path: str):
+    """"""
+    with open(path, "rb") as f:
+        if f.read(len(JOURNAL_MAGIC)) != JOURNAL_MAGIC:
+            raise ValueError(f"{path}不是有效的事件日志文件")
+
+        while True:
+            header = f.read(RECORD_HEADER.size)
+            if len(header) < RECORD_HEADER.size:
+                return
+
+            timestamp, size = RECORD_HEADER.unpack(header)
+            if not size:
+                return
+
+            payload = f.read(size)
+            if len(payload) < size:
+                return
+
+            yield timestamp, payload
+
+
+class EventReplayer:
+    """
+    Put events recorded in journal into event engine again.
+
+    With speed 1 events are put at original timing, with speed N they are
+    put N times faster, and with speed 0 as fast as possible. Timing
+    restarts at each recording session, so gap between sessions appended
+    into the same journal is skipped.
+    """
+
+    def __init__(self, event_engine: EventEngine, path: str):
+        """"""
+        self.event_engine = event_engine
+        self.path = path
+        self.active = False
+
+    def replay(self, speed: float = 1) -> int:
+        """
+        Replay events in current thread, return number of events put.
+        """
+        self.active = True
+        count = 0
+
+        start = 0
+        first_timestamp = None
+
+        for timestamp, event in _read_events(self.path):
+            if not self.active:
+                break
+
+            # New session
+            if not event:
+                first_timestamp = None
+                continue
+
+            if speed:
+                if first_timestamp is None:
+                    first_timestamp = timestamp
+                    start = perf_counter()
+
+                target = start + (timestamp - first_timestamp) / speed
+                wait = target - perf_counter()
+                if wait > 0:
+                    sleep(wait)
+
+            self.event_engine.put(event)
+            count += 1
+
+        self.active = False
+        return count
+
+    def stop(self):
+        """
+        Stop replaying from another thread.
+        """
+        self.active = False
@@ -0,0 +1,128 @@
+"""
+Sharded multi-worker event engine.
+"""
+
+from queue import Empty, Queue
+from threading import Thread
+from typing import Any, Callable, Hashable
+
+from .engine import Event, EventEngine
+
+# Attributes checked in order for finding the routing key of event data.
+KEY_ATTRIBUTES = ("vt_orderid", "vt_symbol", "vt_accountid")
+
+# Cache of routing key attribute found for each data class.
+_key_attribute_cache = {}
+
+
+def get_event_key(event: Event):
+    """
+    Get routing key of an event from its data.
+
+    Orders and trades are routed by vt_orderid, ticks and positions
+    by vt_symbol and accounts by vt_accountid. Events without data
+    (e.g. timer) or with data of unknown class return None.
+    """
+    data = event.data
+    data_class = data.__class__
+
+    attribute = _key_attribute_cache.get(data_class, "")
+    if attribute == "":
+        attribute = None
+        for name in KEY_ATTRIBUTES:
+            if hasattr(data, name):
+                attribute = name
+                break
+        _key_attribute_cache[data_class] = attribute
+
+    if attribute is None:
+        return None
+    return getattr(data, attribute)
+
+
+# Defines key function used for routing event to worker.
+KeyFuncType = Callable[[Event], Hashable]
+
+
+class ShardedEventEngine(EventEngine):
+    """
+    Event engine which distributes events to several dispatch workers.
+
+    Every event is routed to a worker based on its key (vt_symbol for
+    tick, vt_orderid for order/trade, etc.), so events with the same key
+    are always processed in the order they were put, while a slow handler
+    of one key only stalls the keys sharing its worker.
+
+    Events without key (timer, log, etc.) are all routed to the first
+    worker. Handlers registered in this engine can be called from
+    different worker threads at the same time, so they must be
+    thread-safe.
+    """
+
+    def __init__(
+        self,
+        interval: int = 1,
+        workers: int = 4,
+        key_func: KeyFuncType = get_event_key
+    ):
+        """"""
+        super(ShardedEventEngine, self).__init__(interval)
+
+        self._key_func = key_func
+        self._queues = [Queue() for i in range(workers)]
+        self._workers = [
+            Thread(target=self._run_worker, args=(queue,))
+            for queue in self._queues
+        ]
+
+    def _run_worker(self, queue: Queue):
+        """
+        Get event from queue of the worker and then process it.
+        """
+        while self._active:
+            try:
+                event = queue.get(block=True, timeout=1)
+                self._process(event)
+            except Empty:
+                pass
+
+    def start(self):
+        """
+        Start all dispatch workers and timer.
+        """
+        self._active = True
+        for worker in self._workers:
+            worker.start()
+        self._timer.start()
+
+    def stop(self):
+        """
+        Stop event engine.
+        """
+        self._active = False
+        self._wake_timer()
+        self._timer.join()
+        for worker in self._workers:
+            worker.join()
+
+    def put(self, event: Event):
+        """
+        Put an event object into queue of the worker its key routed to.
+        """
+        key = self._key_func(event)
+        ix = self.get_worker_index(key)
+        self._queues[ix].put(event)
+
+    def get_queue_size(self):
+        """
+        Get number of events waiting in queues of all workers.
+        """
+        return sum(queue.qsize() for queue in self._queues)
+
+    def get_worker_index(self, key: Any):
+        """
+        Get index of the worker which processes events with the key.
+        """
+        if key is None:
+            return 0
+        return hash(key) % len(self._queues)
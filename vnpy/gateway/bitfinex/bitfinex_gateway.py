@@ -20,7 +20,7 @@ from vnpy.trader.constant import (
     Product,
     Status,
 )
-from vnpy.trader.gateway import BaseGateway
+from vnpy.trader.gateway import BaseGateway, TickManager
 from vnpy.trader.object import (
     TickData,
     OrderData,
@@ -264,11 +264,10 @@ class BitfinexWebsocketApi(WebsocketClient):
             "position": self.on_position,
         }
 
-        self.ticks = {}
+        self.tick_manager = TickManager(gateway)
         self.accounts = {}
         self.orders = {}
         self.trades = set()
-        self.tickDict = {}
         self.bidDict = {}
         self.askDict = {}
         self.orderLocalDict = {}
@@ -393,9 +392,8 @@ class BitfinexWebsocketApi(WebsocketClient):
         symbol = str(symbol.replace("t", ""))
 
         # Get the Tick object
-        if symbol in self.tickDict:
-            tick = self.tickDict[symbol]
-        else:
+        tick = self.tick_manager.update_tick(symbol)
+        if not tick:
             tick = TickData(
                 symbol=symbol,
                 exchange=Exchange.BITFINEX,
@@ -404,7 +402,7 @@ class BitfinexWebsocketApi(WebsocketClient):
                 gateway_name=self.gateway_name,
             )
 
-            self.tickDict[symbol] = tick
+            self.tick_manager.add_tick(tick)
 
         l_data1 = data[1]
 
@@ -483,12 +481,9 @@ class BitfinexWebsocketApi(WebsocketClient):
             except IndexError:
                 return
 
-        dt = datetime.now()
-        tick.date = dt.strftime("%Y%m%d")
-        tick.time = dt.strftime("%H:%M:%S.%f")
-        tick.datetime = dt
+        tick.datetime = datetime.now()
 
-        self.gateway.on_tick(copy(tick))
+        self.tick_manager.push_tick(symbol)
 
     def on_wallet(self, data):
         """"""
@@ -579,7 +574,7 @@ class BitfinexWebsocketApi(WebsocketClient):
     def on_tick(self, d):
         """"""
         symbol = d["symbol"]
-        tick = self.ticks.get(symbol, None)
+        tick = self.tick_manager.update_tick(symbol)
         if not tick:
             return
 
@@ -587,12 +582,12 @@ class BitfinexWebsocketApi(WebsocketClient):
         tick.datetime = datetime.strptime(
             d["timestamp"], "%Y-%m-%dT%H:%M:%S.%fZ"
         )
-        self.gateway.on_tick(copy(tick))
+        self.tick_manager.push_tick(symbol)
 
     def on_depth(self, d):
         """"""
         symbol = d["symbol"]
-        tick = self.ticks.get(symbol, None)
+        tick = self.tick_manager.update_tick(symbol)
         if not tick:
             return
 
@@ -608,7 +603,7 @@ class BitfinexWebsocketApi(WebsocketClient):
 
         tick.datetime = datetime.strptime(
             d["timestamp"], "%Y-%m-%dT%H:%M:%S.%fZ")
-        self.gateway.on_tick(copy(tick))
+        self.tick_manager.push_tick(symbol)
 
     def on_trade(self, data):
         """"""
@@ -24,7 +24,7 @@ from vnpy.trader.constant import (
     Offset,
     Interval
 )
-from vnpy.trader.gateway import BaseGateway
+from vnpy.trader.gateway import BaseGateway, TickManager
 from vnpy.trader.object import (
     TickData,
     OrderData,
@@ -454,7 +454,7 @@ class BitmexWebsocketApi(WebsocketClient):
             "instrument": self.on_contract,
         }
 
-        self.ticks = {}
+        self.tick_manager = TickManager(gateway)
         self.accounts = {}
         self.orders = {}
         self.trades = set()
@@ -484,7 +484,7 @@ class BitmexWebsocketApi(WebsocketClient):
             datetime=datetime.now(),
             gateway_name=self.gateway_name,
         )
-        self.ticks[req.symbol] = tick
+        self.tick_manager.add_tick(tick)
 
     def on_connected(self):
         """"""
@@ -566,19 +566,19 @@ class BitmexWebsocketApi(WebsocketClient):
     def on_tick(self, d):
         """"""
         symbol = d["symbol"]
-        tick = self.ticks.get(symbol, None)
+        tick = self.tick_manager.update_tick(symbol)
         if not tick:
             return
 
         tick.last_price = d["price"]
         tick.datetime = datetime.strptime(
             d["timestamp"], "%Y-%m-%dT%H:%M:%S.%fZ")
-        self.gateway.on_tick(copy(tick))
+        self.tick_manager.push_tick(symbol)
 
     def on_depth(self, d):
         """"""
         symbol = d["symbol"]
-        tick = self.ticks.get(symbol, None)
+        tick = self.tick_manager.update_tick(symbol)
         if not tick:
             return
 
@@ -594,7 +594,7 @@ class BitmexWebsocketApi(WebsocketClient):
 
         tick.datetime = datetime.strptime(
             d["timestamp"], "%Y-%m-%dT%H:%M:%S.%fZ")
-        self.gateway.on_tick(copy(tick))
+        self.tick_manager.push_tick(symbol)
 
     def on_trade(self, d):
         """"""
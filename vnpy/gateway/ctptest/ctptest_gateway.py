@@ -59,7 +59,6 @@ from vnpy.trader.object import (
     SubscribeRequest,
 )
 from vnpy.trader.utility import get_folder_path
-from vnpy.trader.event import EVENT_TIMER
 
 
 STATUS_CTP2VT = {
@@ -144,6 +143,8 @@ class CtptestGateway(BaseGateway):
         self.td_api = CtpTdApi(self)
         self.md_api = CtpMdApi(self)
 
+        self.query_timer = None
+
     def connect(self, setting: dict):
         """"""
         userid = setting["用户名"]
@@ -187,6 +188,10 @@ class CtptestGateway(BaseGateway):
 
     def close(self):
         """"""
+        if self.query_timer:
+            self.query_timer.cancel()
+            self.query_timer = None
+
         self.td_api.close()
         self.md_api.close()
 
@@ -197,22 +202,23 @@ class CtptestGateway(BaseGateway):
         msg = f"{msg}，代码：{error_id}，信息：{error_msg}"
         self.write_log(msg)        
     
-    def process_timer_event(self, event):
+    def process_query_timer(self):
         """"""
-        self.count += 1
-        if self.count < 2:
-            return
-        self.count = 0
-        
         func = self.query_functions.pop(0)
         func()
         self.query_functions.append(func)
         
     def init_query(self):
         """"""
-        self.count = 0
         self.query_functions = [self.query_account, self.query_position]
-        self.event_engine.register(EVENT_TIMER, self.process_timer_event)
+
+        # Only one query timer is kept after reconnect
+        if self.query_timer:
+            self.query_timer.cancel()
+
+        self.query_timer = self.event_engine.call_every(
+            2, self.process_query_timer
+        )
 
 
 class CtpMdApi(MdApi):
@@ -436,16 +436,15 @@ class FutuGateway(BaseGateway):
         symbol = data["code"]
         tick = self.get_tick(symbol)
 
-        d = tick.__dict__
         for i in range(5):
             bid_data = data["Bid"][i]
             ask_data = data["Ask"][i]
             n = i + 1
 
-            d["bid_price_%s" % n] = bid_data[0]
-            d["bid_volume_%s" % n] = bid_data[1]
-            d["ask_price_%s" % n] = ask_data[0]
-            d["ask_volume_%s" % n] = ask_data[1]
+            setattr(tick, "bid_price_%s" % n, bid_data[0])
+            setattr(tick, "bid_volume_%s" % n, bid_data[1])
+            setattr(tick, "ask_price_%s" % n, ask_data[0])
+            setattr(tick, "ask_volume_%s" % n, ask_data[1])
 
         if tick.datetime:
             self.on_tick(copy(tick))
@@ -9,7 +9,6 @@ import json
 import zlib
 import hashlib
 import hmac
-from copy import copy
 from datetime import datetime
 
 from vnpy.event import Event
@@ -22,7 +21,7 @@ from vnpy.trader.constant import (
     Status,
     OrderType
 )
-from vnpy.trader.gateway import BaseGateway, LocalOrderManager
+from vnpy.trader.gateway import BaseGateway, LocalOrderManager, TickManager
 from vnpy.trader.object import (
     TickData,
     OrderData,
@@ -619,7 +618,7 @@ class HuobiDataWebsocketApi(HuobiWebsocketApiBase):
         super().__init__(gateway)
 
         self.req_id = 0
-        self.ticks = {}
+        self.tick_manager = TickManager(gateway)
 
     def connect(self, key: str, secret: str, proxy_host: str, proxy_port: int):
         """"""
@@ -641,7 +640,7 @@ class HuobiDataWebsocketApi(HuobiWebsocketApiBase):
             datetime=datetime.now(),
             gateway_name=self.gateway_name,
         )
-        self.ticks[symbol] = tick            
+        self.tick_manager.add_tick(tick)
             
         # Subscribe to market depth update
         self.req_id += 1
@@ -675,7 +674,10 @@ class HuobiDataWebsocketApi(HuobiWebsocketApiBase):
     def on_market_depth(self, data):
         """行情深度推送 """
         symbol = data["ch"].split(".")[1]
-        tick = self.ticks[symbol]
+        tick = self.tick_manager.update_tick(symbol)
+        if not tick:
+            return
+
         tick.datetime = datetime.fromtimestamp(data["ts"] / 1000)
         
         bids = data["tick"]["bids"]
@@ -691,12 +693,15 @@ class HuobiDataWebsocketApi(HuobiWebsocketApiBase):
             tick.__setattr__("ask_volume_" + str(n + 1), float(volume))
 
         if tick.last_price:
-            self.gateway.on_tick(copy(tick))
+            self.tick_manager.push_tick(symbol)
 
     def on_market_detail(self, data):
         """市场细节推送"""
         symbol = data["ch"].split(".")[1]
-        tick = self.ticks[symbol]
+        tick = self.tick_manager.update_tick(symbol)
+        if not tick:
+            return
+
         tick.datetime = datetime.fromtimestamp(data["ts"] / 1000)
         
         tick_data = data["tick"]
@@ -707,7 +712,7 @@ class HuobiDataWebsocketApi(HuobiWebsocketApiBase):
         tick.volume = float(tick_data["vol"])
 
         if tick.bid_price_1:
-            self.gateway.on_tick(copy(tick))
+            self.tick_manager.push_tick(symbol)
 
 
 def _split_url(url):
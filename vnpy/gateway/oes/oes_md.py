@@ -143,9 +143,9 @@ class OesMdMessageLoop:
         tick.low_price = data.LowPx / 10000
 
         for i in range(min(data.BidPriceLevel, 5)):
-            tick.__dict__['bid_price_' + str(i + 1)] = data.BidLevels[i].Price / 10000
+            setattr(tick, 'bid_price_' + str(i + 1), data.BidLevels[i].Price / 10000)
         for i in range(min(data.OfferPriceLevel, 5)):
-            tick.__dict__['ask_price_' + str(i + 1)] = data.OfferLevels[i].Price / 10000
+            setattr(tick, 'ask_price_' + str(i + 1), data.OfferLevels[i].Price / 10000)
         self.gateway.on_tick(copy(tick))
 
     def on_init_tick(self, d: MdsMktRspMsgBodyT):
@@ -159,9 +159,9 @@ class OesMdMessageLoop:
         tick.low_price = data.LowPx / 10000
 
         for i in range(5):
-            tick.__dict__['bid_price_' + str(i + 1)] = data.BidLevels[i].Price / 10000
+            setattr(tick, 'bid_price_' + str(i + 1), data.BidLevels[i].Price / 10000)
         for i in range(5):
-            tick.__dict__['ask_price_' + str(i + 1)] = data.OfferLevels[i].Price / 10000
+            setattr(tick, 'ask_price_' + str(i + 1), data.OfferLevels[i].Price / 10000)
         self.gateway.on_tick(copy(tick))
 
     def on_l2_trade(self, d: MdsMktRspMsgBodyT):
@@ -25,7 +25,7 @@ from vnpy.trader.constant import (
     Product,
     Status
 )
-from vnpy.trader.gateway import BaseGateway
+from vnpy.trader.gateway import BaseGateway, TickManager
 from vnpy.trader.object import (
     TickData,
     OrderData,
@@ -470,7 +470,7 @@ class OkexWebsocketApi(WebsocketClient):
         self.connect_time = 0
 
         self.callbacks = {}
-        self.ticks = {}
+        self.tick_manager = TickManager(gateway)
 
     def connect(
         self,
@@ -505,7 +505,7 @@ class OkexWebsocketApi(WebsocketClient):
             datetime=datetime.now(),
             gateway_name=self.gateway_name,
         )
-        self.ticks[req.symbol] = tick
+        self.tick_manager.add_tick(tick)
 
         channel_ticker = f"spot/ticker:{req.symbol}"
         channel_depth = f"spot/depth5:{req.symbol}"
@@ -630,24 +630,24 @@ class OkexWebsocketApi(WebsocketClient):
     def on_ticker(self, d):
         """"""
         symbol = d["instrument_id"]
-        tick = self.ticks.get(symbol, None)
+        tick = self.tick_manager.update_tick(symbol)
         if not tick:
             return
 
         tick.last_price = float(d["last"])
-        tick.open = float(d["open_24h"])
-        tick.high = float(d["high_24h"])
-        tick.low = float(d["low_24h"])
+        tick.open_price = float(d["open_24h"])
+        tick.high_price = float(d["high_24h"])
+        tick.low_price = float(d["low_24h"])
         tick.volume = float(d["base_volume_24h"])
         tick.datetime = datetime.strptime(
             d["timestamp"], "%Y-%m-%dT%H:%M:%S.%fZ")
-        self.gateway.on_tick(copy(tick))
+        self.tick_manager.push_tick(symbol)
 
     def on_depth(self, d):
         """"""
         for tick_data in d:
             symbol = d["instrument_id"]
-            tick = self.ticks.get(symbol, None)
+            tick = self.tick_manager.update_tick(symbol)
             if not tick:
                 return
 
@@ -665,7 +665,7 @@ class OkexWebsocketApi(WebsocketClient):
 
             tick.datetime = datetime.strptime(
                 d["timestamp"], "%Y-%m-%dT%H:%M:%S.%fZ")
-            self.gateway.on_tick(copy(tick))
+            self.tick_manager.push_tick(symbol)
 
     def on_order(self, d):
         """"""
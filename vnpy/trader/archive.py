@@ -0,0 +1,208 @@
+"""
+Archival of finished data objects for keeping dicts in memory small.
+"""
+
+import pickle
+import sqlite3
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+from typing import Any, Callable
+
+from vnpy.event import EventEngine
+
+from .setting import SETTINGS
+from .utility import get_file_path
+
+ARCHIVE_CHUNK_RATIO = 0.1
+
+
+class DataArchive:
+    """
+    Keep recently finished items (e.g. inactive orders, trades) of a dict
+    in memory, and move the others into a compact store after a count or
+    age limit.
+
+    Items are pickled into a sqlite table, which is in memory or in file
+    of archive.path setting (in trader temp folder). Lookup of archived
+    keys still works, but on a slower path. Keys archived are kept in a
+    set, so checking keys (e.g. of new orders) not in archive never
+    queries sqlite. The table only holds items of current session, and is
+    cleared when opened.
+
+    Only keys marked by finish can be archived, so items still in use
+    (e.g. active orders) always stay in the dict.
+
+    Items over count limit are archived in chunks: the count may exceed
+    the limit by ARCHIVE_CHUNK_RATIO before items are moved in one
+    transaction. Age limit is checked every second by a timer of event
+    engine if given.
+    """
+
+    def __init__(
+        self,
+        data: dict,
+        name: str,
+        max_count: int = None,
+        max_age: float = None,
+        path: str = None,
+        convert: Callable = None,
+        event_engine: EventEngine = None
+    ):
+        """
+        Value is converted by convert before archived if given, e.g. from
+        strategy object into strategy name.
+        """
+        self.data = data
+        self.name = name
+        self.convert = convert
+
+        if max_count is None:
+            max_count = SETTINGS["archive.count"]
+        self.max_count = max_count
+
+        if max_age is None:
+            max_age = SETTINGS["archive.age"]
+        self.max_age = max_age
+
+        if path is None:
+            path = SETTINGS["archive.path"]
+
+        if path:
+            path = str(get_file_path(path))
+        else:
+            path = ":memory:"
+
+        self.finished = OrderedDict()   # key: finish time
+        self.archived_keys = set()
+        self.count = 0
+
+        self.lock = Lock()
+        # Archive can be rebuilt from gateway, so no need to sync to disk
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA synchronous=OFF")
+
+        # Data of previous session is cleared, since ids (e.g. local
+        # orderid, tradeid of some exchanges) may be reused
+        self.connection.execute(f'DROP TABLE IF EXISTS "{name}"')
+        self.connection.execute(
+            f'CREATE TABLE "{name}" (key TEXT PRIMARY KEY, data BLOB)'
+        )
+        self.connection.commit()
+
+        self.timer = None
+        if event_engine and self.max_age:
+            self.timer = event_engine.call_every(1, self.archive)
+
+    def finish(self, key: str):
+        """
+        Mark item of key as finished, which can be archived from now.
+        """
+        if not self.max_count and not self.max_age:
+            return
+
+        with self.lock:
+            self.finished[key] = monotonic()
+            self.finished.move_to_end(key)
+
+            chunk_size = max(int(self.max_count * ARCHIVE_CHUNK_RATIO), 1)
+            full = self.max_count and len(self.finished) > self.max_count + chunk_size
+
+        if full:
+            self.archive()
+
+    def archive(self):
+        """
+        Move finished items beyond count limit or older than age limit
+        into archive.
+        """
+        with self.lock:
+            finished = self.finished
+            now = monotonic()
+            items = []
+
+            while finished:
+                key, finish_time = next(iter(finished.items()))
+
+                over_count = self.max_count and len(finished) > self.max_count
+                too_old = self.max_age and now - finish_time >= self.max_age
+                if not over_count and not too_old:
+                    break
+
+                finished.popitem(last=False)
+
+                value = self.data.get(key, None)
+                if value is None:
+                    continue
+
+                # Key is marked before removed from dict, so that it is
+                # always found by lookup without lock
+                self.archived_keys.add(key)
+                self.data.pop(key, None)
+
+                if self.convert:
+                    value = self.convert(value)
+                items.append((key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL)))
+
+            if not items:
+                return
+
+            self.connection.executemany(
+                f'INSERT OR REPLACE INTO "{self.name}" VALUES (?, ?)', items
+            )
+            self.connection.commit()
+            self.count += len(items)
+
+    def get(self, key: str, default: Any = None):
+        """
+        Get item from dict, or from archive if not found.
+        """
+        value = self.data.get(key, None)
+        if value is not None:
+            return value
+
+        value = self.get_archived(key)
+        if value is not None:
+            return value
+
+        return default
+
+    def get_archived(self, key: str):
+        """
+        Get item from archive only, return None if not found.
+        """
+        if key not in self.archived_keys:
+            return None
+
+        with self.lock:
+            row = self.connection.execute(
+                f'SELECT data FROM "{self.name}" WHERE key=?', (key,)
+            ).fetchone()
+
+        if row:
+            return pickle.loads(row[0])
+        return None
+
+    def get_all_archived(self):
+        """
+        Get all items in archive.
+        """
+        with self.lock:
+            rows = self.connection.execute(
+                f'SELECT data FROM "{self.name}"'
+            ).fetchall()
+
+        return [pickle.loads(row[0]) for row in rows]
+
+    def __contains__(self, key: str):
+        """"""
+        return key in self.data or key in self.archived_keys
+
+    def close(self):
+        """"""
+        if self.timer:
+            self.timer.cancel()
+
+        with self.lock:
+            self.connection.commit()
+            self.connection.close()
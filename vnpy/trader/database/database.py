@@ -5,7 +5,7 @@ from typing import Optional, Sequence, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from vnpy.trader.constant import Interval, Exchange  # noqa
-    from vnpy.trader.object import BarData, TickData  # noqa
+    from vnpy.trader.object import BarData, TickData, BarBatch, TickBatch  # noqa
 
 
 class Driver(Enum):
@@ -38,6 +38,43 @@ class BaseDatabaseManager(ABC):
     ) -> Sequence["TickData"]:
         pass
 
+    def load_bar_batch(
+        self,
+        symbol: str,
+        exchange: "Exchange",
+        interval: "Interval",
+        start: datetime,
+        end: datetime
+    ) -> "BarBatch":
+        """
+        Load bar data as columnar BarBatch. Database manager can override
+        it for reading columns directly without creating BarData objects.
+        """
+        from vnpy.trader.object import BarBatch
+
+        bars = self.load_bar_data(symbol, exchange, interval, start, end)
+        data = BarBatch.create_array(bars)
+        return BarBatch(symbol, exchange, interval, data, "DB")
+
+    def load_tick_batch(
+        self,
+        symbol: str,
+        exchange: "Exchange",
+        start: datetime,
+        end: datetime
+    ) -> "TickBatch":
+        """
+        Load tick data as columnar TickBatch. Database manager can override
+        it for reading columns directly without creating TickData objects.
+        """
+        from vnpy.trader.object import TickBatch
+
+        ticks = self.load_tick_data(symbol, exchange, start, end)
+        data = TickBatch.create_array(ticks)
+
+        name = ticks[0].name if ticks else ""
+        return TickBatch(symbol, exchange, data, "DB", name=name)
+
     @abstractmethod
     def save_bar_data(
         self,
@@ -1,3 +1,4 @@
+from dataclasses import fields
 from datetime import datetime
 from enum import Enum
 from typing import Optional, Sequence
@@ -294,16 +295,16 @@ class MongoManager(BaseDatabaseManager):
 
     @staticmethod
     def to_update_param(d):
-        return {
-            "set__" + k: v.value if isinstance(v, Enum) else v
-            for k, v in d.__dict__.items()
-        }
+        params = {}
+        for field in fields(d):
+            v = getattr(d, field.name)
+            params["set__" + field.name] = v.value if isinstance(v, Enum) else v
+        return params
 
     def save_bar_data(self, datas: Sequence[BarData]):
         for d in datas:
             updates = self.to_update_param(d)
             updates.pop("set__gateway_name")
-            updates.pop("set__vt_symbol")
             (
                 DbBarData.objects(
                     symbol=d.symbol, interval=d.interval.value, datetime=d.datetime
@@ -314,7 +315,6 @@ class MongoManager(BaseDatabaseManager):
         for d in datas:
             updates = self.to_update_param(d)
             updates.pop("set__gateway_name")
-            updates.pop("set__vt_symbol")
             (
                 DbTickData.objects(
                     symbol=d.symbol, exchange=d.exchange.value, datetime=d.datetime
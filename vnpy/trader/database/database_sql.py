@@ -2,6 +2,7 @@
 from datetime import datetime
 from typing import List, Optional, Sequence, Type
 
+import numpy as np
 from peewee import (
     AutoField,
     CharField,
@@ -16,7 +17,7 @@ from peewee import (
 )
 
 from vnpy.trader.constant import Exchange, Interval
-from vnpy.trader.object import BarData, TickData
+from vnpy.trader.object import BarData, TickData, BarBatch, TickBatch
 from vnpy.trader.utility import get_file_path
 from .database import BaseDatabaseManager, Driver
 
@@ -368,6 +369,55 @@ class SqlManager(BaseDatabaseManager):
         data = [db_tick.to_tick() for db_tick in s]
         return data
 
+    def load_bar_batch(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime,
+    ) -> BarBatch:
+        columns = [getattr(self.class_bar, name) for name in BarBatch.dtype.names]
+        s = (
+            self.class_bar.select(*columns)
+                .where(
+                (self.class_bar.symbol == symbol)
+                & (self.class_bar.exchange == exchange.value)
+                & (self.class_bar.interval == interval.value)
+                & (self.class_bar.datetime >= start)
+                & (self.class_bar.datetime <= end)
+            )
+            .order_by(self.class_bar.datetime)
+            .tuples()
+        )
+        data = np.array(list(s), dtype=BarBatch.dtype)
+        return BarBatch(symbol, exchange, interval, data, "DB")
+
+    def load_tick_batch(
+        self, symbol: str, exchange: Exchange, start: datetime, end: datetime
+    ) -> TickBatch:
+        columns = [getattr(self.class_tick, name) for name in TickBatch.dtype.names]
+        s = (
+            self.class_tick.select(self.class_tick.name, *columns)
+                .where(
+                (self.class_tick.symbol == symbol)
+                & (self.class_tick.exchange == exchange.value)
+                & (self.class_tick.datetime >= start)
+                & (self.class_tick.datetime <= end)
+            )
+            .order_by(self.class_tick.datetime)
+            .tuples()
+        )
+        rows = list(s)
+
+        # Empty levels of order book are saved as null
+        name = rows[0][0] if rows else ""
+        data = np.array(
+            [(row[1],) + tuple(v or 0 for v in row[2:]) for row in rows],
+            dtype=TickBatch.dtype
+        )
+        return TickBatch(symbol, exchange, data, "DB", name=name)
+
     def save_bar_data(self, datas: Sequence[BarData]):
         ds = [self.class_bar.from_bar(i) for i in datas]
         self.class_bar.save_all(ds)
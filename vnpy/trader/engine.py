@@ -1,17 +1,30 @@
 """
 """
 
-import logging
 import smtplib
+import sys
+import traceback
 from abc import ABC
+from collections import OrderedDict, defaultdict, deque
 from datetime import datetime
 from email.message import EmailMessage
+from logging import WARNING, getLevelName
 from queue import Empty, Queue
-from threading import Thread
+from threading import Lock, Thread
+from time import monotonic, sleep
+from types import MappingProxyType
 from typing import Any, Sequence
 
-from vnpy.event import Event, EventEngine
+from vnpy.event import (
+    Event,
+    EventEngine,
+    PRIORITY_HIGH,
+    PRIORITY_MEDIUM,
+    OVERLOAD_CONFLATE,
+    OVERLOAD_DROP_OLDEST
+)
 from .app import BaseApp
+from .archive import DataArchive
 from .event import (
     EVENT_TICK,
     EVENT_ORDER,
@@ -25,6 +38,7 @@ from .gateway import BaseGateway
 from .object import (
     CancelRequest,
     LogData,
+    OrderData,
     OrderRequest,
     SubscribeRequest,
     HistoryRequest
@@ -36,6 +50,10 @@ from .utility import get_folder_path
 class MainEngine:
     """
     Acts as the core of VN Trader.
+
+    Any event engine providing the interface of EventEngine can be used,
+    e.g. ShardedEventEngine or AsyncEventEngine. A default EventEngine
+    is created if not given.
     """
 
     def __init__(self, event_engine: EventEngine = None):
@@ -44,6 +62,9 @@ class MainEngine:
             self.event_engine = event_engine
         else:
             self.event_engine = EventEngine()
+        self.event_engine.set_conflation(EVENT_TICK, "vt_symbol")
+        self.set_event_priority()
+        self.set_overload_policy()
         self.event_engine.start()
 
         self.gateways = {}
@@ -53,6 +74,26 @@ class MainEngine:
 
         self.init_engines()
 
+    def set_event_priority(self):
+        """
+        Set priority of trading events higher than market data, and
+        events of other types (log, timer, etc.) are of the lowest.
+        """
+        for type in [EVENT_ORDER, EVENT_TRADE, EVENT_POSITION, EVENT_ACCOUNT]:
+            self.event_engine.set_priority(type, PRIORITY_HIGH)
+
+        self.event_engine.set_priority(EVENT_TICK, PRIORITY_MEDIUM)
+
+    def set_overload_policy(self):
+        """
+        Set policies applied when queue of event engine is full: ticks
+        are conflated by vt_symbol and the oldest logs are dropped.
+
+        Events of other types (order, trade, etc.) are never dropped.
+        """
+        self.event_engine.set_overload_policy(EVENT_TICK, OVERLOAD_CONFLATE)
+        self.event_engine.set_overload_policy(EVENT_LOG, OVERLOAD_DROP_OLDEST)
+
     def add_engine(self, engine_class: Any):
         """
         Add function engine.
@@ -167,11 +208,14 @@ class MainEngine:
         Send new order request to a specific gateway.
         """
         gateway = self.get_gateway(gateway_name)
-        if gateway:
-            return gateway.send_order(req)
-        else:
+        if not gateway:
             return ""
 
+        vt_orderid = gateway.send_order(req)
+        if vt_orderid and req.reference:
+            self.update_order_reference(vt_orderid, req.reference)
+        return vt_orderid
+
     def cancel_order(self, req: CancelRequest, gateway_name: str):
         """
         Send cancel order request to a specific gateway.
@@ -184,11 +228,15 @@ class MainEngine:
         """
         """
         gateway = self.get_gateway(gateway_name)
-        if gateway:
-            return gateway.send_orders(reqs)
-        else:
+        if not gateway:
             return ["" for req in reqs]
 
+        vt_orderids = gateway.send_orders(reqs)
+        for req, vt_orderid in zip(reqs, vt_orderids):
+            if vt_orderid and req.reference:
+                self.update_order_reference(vt_orderid, req.reference)
+        return vt_orderids
+
     def cancel_orders(self, reqs: Sequence[CancelRequest], gateway_name: str):
         """
         """
@@ -244,77 +292,182 @@ class BaseEngine(ABC):
 
 class LogEngine(BaseEngine):
     """
-    Processes log event and output with logging module.
+    Processes log event and output to console and file.
+
+    Log event is only buffered on event engine thread, and then formatted
+    and written in batches by a background thread, so that slow output
+    never blocks event processing. If buffer is full, new log is dropped
+    and counted.
     """
 
     def __init__(self, main_engine: MainEngine, event_engine: EventEngine):
         """"""
         super(LogEngine, self).__init__(main_engine, event_engine, "log")
 
+        self.active = False
+        self.dropped_count = 0
+        self.written_count = 0
+
         if not SETTINGS["log.active"]:
             return
 
         self.level = SETTINGS["log.level"]
+        self.console = SETTINGS["log.console"]
+        self.file = SETTINGS["log.file"]
+        self.buffer_size = SETTINGS["log.buffer_size"]
+        self.interval = SETTINGS["log.interval"]
+        self.max_bytes = SETTINGS["log.max_bytes"]
+
+        # Append and popleft of deque are thread safe
+        self.buffer = deque()
+        self.reported_count = 0         # dropped count already written
+
+        self.log_path = get_folder_path("log") if self.file else None
+        self.log_file = None
+        self.file_date = ""
+        self.file_index = 0
+        self.file_size = 0
 
-        self.logger = logging.getLogger("VN Trader")
-        self.logger.setLevel(self.level)
+        self.thread = Thread(target=self.run)
+        self.start()
 
-        self.formatter = logging.Formatter(
-            "%(asctime)s  %(levelname)s: %(message)s"
-        )
+        self.register_event()
+
+    def register_event(self):
+        """"""
+        self.event_engine.register(EVENT_LOG, self.process_log_event)
+
+    def process_log_event(self, event: Event):
+        """
+        Process log event.
+        """
+        log = event.data
+        if log.level < self.level:
+            return
 
-        self.add_null_handler()
+        if len(self.buffer) >= self.buffer_size:
+            self.dropped_count += 1
+            return
 
-        if SETTINGS["log.console"]:
-            self.add_console_handler()
+        self.buffer.append(log)
 
-        if SETTINGS["log.file"]:
-            self.add_file_handler()
+    def run(self):
+        """"""
+        while self.active:
+            sleep(self.interval)
+            self.write_batch_safely()
 
-        self.register_event()
+        self.write_batch_safely()
 
-    def add_null_handler(self):
+        if self.log_file:
+            self.log_file.close()
+
+    def write_batch_safely(self):
         """
-        Add null handler for logger.
+        Write batch and keep writer running if failed (e.g. disk full),
+        with error output to stderr.
         """
-        null_handler = logging.NullHandler()
-        self.logger.addHandler(null_handler)
+        try:
+            self.write_batch()
+        except Exception:
+            sys.stderr.write(f"日志写入失败：{traceback.format_exc()}")
+            sys.stderr.flush()
+
+            # Reopen log file in next batch
+            self.file_date = ""
 
-    def add_console_handler(self):
+    def write_batch(self):
         """
-        Add console output of log.
+        Write all buffered log in one batch.
         """
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(self.level)
-        console_handler.setFormatter(self.formatter)
-        self.logger.addHandler(console_handler)
+        buffer = self.buffer
+        lines = [self.format_log(buffer.popleft()) for _ in range(len(buffer))]
+
+        dropped_count = self.dropped_count - self.reported_count
+        if dropped_count:
+            self.reported_count += dropped_count
+            lines.append(self.format_line(
+                datetime.now(), WARNING, f"日志缓冲区已满，丢弃{dropped_count}条日志"
+            ))
+
+        if not lines:
+            return
+        text = "".join(lines)
 
-    def add_file_handler(self):
+        if self.console:
+            sys.stderr.write(text)
+            sys.stderr.flush()
+
+        if self.file:
+            self.write_file(text)
+
+        self.written_count += len(lines)
+
+    def write_file(self, text: str):
         """
-        Add file output of log. 
+        Write text into log file, which is rotated daily or by size.
         """
         today_date = datetime.now().strftime("%Y%m%d")
-        filename = f"vt_{today_date}.log"
-        log_path = get_folder_path("log")
-        file_path = log_path.joinpath(filename)
+        if today_date != self.file_date:
+            self.file_date = today_date
+            self.file_index = 0
+            self.open_file()
+        elif self.max_bytes and self.file_size >= self.max_bytes:
+            self.file_index += 1
+            self.open_file()
 
-        file_handler = logging.FileHandler(
-            file_path, mode="a", encoding="utf8"
-        )
-        file_handler.setLevel(self.level)
-        file_handler.setFormatter(self.formatter)
-        self.logger.addHandler(file_handler)
+        data = text.encode("utf8")
+        self.log_file.write(data)
+        self.log_file.flush()
+        self.file_size += len(data)
 
-    def register_event(self):
+    def open_file(self):
+        """
+        Open log file of current date and index, skipping full ones.
+        """
+        if self.log_file:
+            self.log_file.close()
+
+        while True:
+            if self.file_index:
+                filename = f"vt_{self.file_date}_{self.file_index}.log"
+            else:
+                filename = f"vt_{self.file_date}.log"
+
+            self.log_file = open(self.log_path.joinpath(filename), "ab")
+            self.file_size = self.log_file.tell()
+
+            if not self.max_bytes or self.file_size < self.max_bytes:
+                break
+
+            self.log_file.close()
+            self.file_index += 1
+
+    def format_log(self, log: LogData):
         """"""
-        self.event_engine.register(EVENT_LOG, self.process_log_event)
+        return self.format_line(log.time, log.level, log.msg)
 
-    def process_log_event(self, event: Event):
+    def format_line(self, dt: datetime, level: int, msg: str):
         """
-        Process log event.
+        Format in the same way as "%(asctime)s  %(levelname)s: %(message)s".
         """
-        log = event.data
-        self.logger.log(log.level, log.msg)
+        time_str = dt.strftime("%Y-%m-%d %H:%M:%S,%f")[:-3]
+        return f"{time_str}  {getLevelName(level)}: {msg}\n"
+
+    def start(self):
+        """"""
+        self.active = True
+        self.thread.start()
+
+    def close(self):
+        """
+        Stop writer thread after all buffered log written.
+        """
+        if not self.active:
+            return
+
+        self.active = False
+        self.thread.join()
 
 
 class OmsEngine(BaseEngine):
@@ -335,6 +488,37 @@ class OmsEngine(BaseEngine):
 
         self.active_orders = {}
 
+        # Indexes of active orders: key: {vt_orderid: order}
+        self.symbol_active_orders = defaultdict(dict)
+        self.gateway_active_orders = defaultdict(dict)
+        self.reference_active_orders = defaultdict(dict)
+
+        self.order_references = {}      # vt_orderid: reference
+        self.reference_lock = Lock()    # reference updated from other threads
+
+        # Finished orders and trades are moved into archive
+        self.order_archive = DataArchive(
+            self.orders, "oms_order", event_engine=event_engine
+        )
+        self.trade_archive = DataArchive(
+            self.trades, "oms_trade", event_engine=event_engine
+        )
+
+        # Change log of each data type for incremental query, which is
+        # keyed by event type: {key: (seq, data)} in order of change
+        self.change_data = {
+            EVENT_TICK: self.ticks,
+            EVENT_ORDER: self.orders,
+            EVENT_TRADE: self.trades,
+            EVENT_POSITION: self.positions,
+            EVENT_ACCOUNT: self.accounts,
+            EVENT_CONTRACT: self.contracts,
+        }
+        self.change_logs = {k: OrderedDict() for k in self.change_data}
+        self.change_seqs = {k: 0 for k in self.change_data}
+        self.change_floors = {k: 0 for k in self.change_data}   # last seq dropped
+        self.change_lock = Lock()
+
         self.add_function()
         self.register_event()
 
@@ -353,6 +537,15 @@ class OmsEngine(BaseEngine):
         self.main_engine.get_all_accounts = self.get_all_accounts
         self.main_engine.get_all_contracts = self.get_all_contracts
         self.main_engine.get_all_active_orders = self.get_all_active_orders
+        self.main_engine.get_active_order_view = self.get_active_order_view
+        self.main_engine.get_active_order_count = self.get_active_order_count
+        self.main_engine.update_order_reference = self.update_order_reference
+        self.main_engine.get_changes_since = self.get_changes_since
+
+    def close(self):
+        """"""
+        self.order_archive.close()
+        self.trade_archive.close()
 
     def register_event(self):
         """"""
@@ -367,38 +560,122 @@ class OmsEngine(BaseEngine):
         """"""
         tick = event.data
         self.ticks[tick.vt_symbol] = tick
+        self.update_change(EVENT_TICK, tick.vt_symbol, tick)
 
     def process_order_event(self, event: Event):
         """"""
         order = event.data
         self.orders[order.vt_orderid] = order
 
-        # If order is active, then update data in dict.
-        if order.is_active():
-            self.active_orders[order.vt_orderid] = order
-        # Otherwise, pop inactive order from in dict
-        elif order.vt_orderid in self.active_orders:
-            self.active_orders.pop(order.vt_orderid)
+        with self.reference_lock:
+            # If order is active, then update data in dict.
+            if order.is_active():
+                self.add_active_order(order)
+            # Otherwise, pop inactive order from in dict
+            elif order.vt_orderid in self.active_orders:
+                self.remove_active_order(order)
+            # Reference may be saved before order finished at first event
+            else:
+                self.order_references.pop(order.vt_orderid, None)
+
+        if not order.is_active():
+            self.order_archive.finish(order.vt_orderid)
+
+        self.update_change(EVENT_ORDER, order.vt_orderid, order)
+
+    def add_active_order(self, order: OrderData):
+        """
+        Add or update active order in all indexes.
+        """
+        vt_orderid = order.vt_orderid
+
+        self.active_orders[vt_orderid] = order
+        self.symbol_active_orders[order.vt_symbol][vt_orderid] = order
+        self.gateway_active_orders[order.gateway_name][vt_orderid] = order
+
+        reference = self.order_references.get(vt_orderid, "")
+        if reference:
+            self.reference_active_orders[reference][vt_orderid] = order
+
+    def remove_active_order(self, order: OrderData):
+        """
+        Remove inactive order from all indexes.
+        """
+        vt_orderid = order.vt_orderid
+
+        self.active_orders.pop(vt_orderid)
+        self.symbol_active_orders[order.vt_symbol].pop(vt_orderid, None)
+        self.gateway_active_orders[order.gateway_name].pop(vt_orderid, None)
+
+        reference = self.order_references.pop(vt_orderid, "")
+        if reference:
+            self.reference_active_orders[reference].pop(vt_orderid, None)
+
+    def update_order_reference(self, vt_orderid: str, reference: str):
+        """
+        Save reference (e.g. strategy name) of order sent, which can be
+        called from any thread.
+        """
+        with self.reference_lock:
+            # Order already finished (maybe archived) before send_order returned
+            if (
+                vt_orderid not in self.active_orders
+                and vt_orderid in self.order_archive
+            ):
+                return
+
+            self.order_references[vt_orderid] = reference
+
+            # Order event may be processed before send_order returned
+            order = self.active_orders.get(vt_orderid, None)
+            if order:
+                self.reference_active_orders[reference][vt_orderid] = order
 
     def process_trade_event(self, event: Event):
         """"""
         trade = event.data
         self.trades[trade.vt_tradeid] = trade
+        self.trade_archive.finish(trade.vt_tradeid)
+        self.update_change(EVENT_TRADE, trade.vt_tradeid, trade)
 
     def process_position_event(self, event: Event):
         """"""
         position = event.data
         self.positions[position.vt_positionid] = position
+        self.update_change(EVENT_POSITION, position.vt_positionid, position)
 
     def process_account_event(self, event: Event):
         """"""
         account = event.data
         self.accounts[account.vt_accountid] = account
+        self.update_change(EVENT_ACCOUNT, account.vt_accountid, account)
 
     def process_contract_event(self, event: Event):
         """"""
         contract = event.data
         self.contracts[contract.vt_symbol] = contract
+        self.update_change(EVENT_CONTRACT, contract.vt_symbol, contract)
+
+    def update_change(self, event_type: str, key: str, data: Any):
+        """
+        Record data changed with next sequence number of its type.
+
+        Only the latest change of each key is kept, and the log is never
+        longer than data in memory (orders and trades may be archived),
+        so the oldest changes are dropped if necessary.
+        """
+        with self.change_lock:
+            seq = self.change_seqs[event_type] + 1
+            self.change_seqs[event_type] = seq
+
+            log = self.change_logs[event_type]
+            log.pop(key, None)
+            log[key] = (seq, data)
+
+            data_count = len(self.change_data[event_type])
+            while len(log) > data_count:
+                _, (dropped_seq, _) = log.popitem(last=False)
+                self.change_floors[event_type] = dropped_seq
 
     def get_tick(self, vt_symbol):
         """
@@ -408,15 +685,15 @@ class OmsEngine(BaseEngine):
 
     def get_order(self, vt_orderid):
         """
-        Get latest order data by vt_orderid.
+        Get latest order data by vt_orderid, including archived ones.
         """
-        return self.orders.get(vt_orderid, None)
+        return self.order_archive.get(vt_orderid)
 
     def get_trade(self, vt_tradeid):
         """
-        Get trade data by vt_tradeid.
+        Get trade data by vt_tradeid, including archived ones.
         """
-        return self.trades.get(vt_tradeid, None)
+        return self.trade_archive.get(vt_tradeid)
 
     def get_position(self, vt_positionid):
         """
@@ -442,17 +719,23 @@ class OmsEngine(BaseEngine):
         """
         return list(self.ticks.values())
 
-    def get_all_orders(self):
+    def get_all_orders(self, archived: bool = False):
         """
-        Get all order data.
+        Get all order data in memory, and archived ones if archived.
         """
-        return list(self.orders.values())
+        orders = list(self.orders.values())
+        if archived:
+            orders = self.order_archive.get_all_archived() + orders
+        return orders
 
-    def get_all_trades(self):
+    def get_all_trades(self, archived: bool = False):
         """
-        Get all trade data.
+        Get all trade data in memory, and archived ones if archived.
         """
-        return list(self.trades.values())
+        trades = list(self.trades.values())
+        if archived:
+            trades = self.trade_archive.get_all_archived() + trades
+        return trades
 
     def get_all_positions(self):
         """
@@ -481,17 +764,72 @@ class OmsEngine(BaseEngine):
         if not vt_symbol:
             return list(self.active_orders.values())
         else:
-            active_orders = [
-                order
-                for order in self.active_orders.values()
-                if order.vt_symbol == vt_symbol
-            ]
-            return active_orders
+            active_orders = self.symbol_active_orders.get(vt_symbol, {})
+            return list(active_orders.values())
+
+    def get_active_order_view(
+        self, vt_symbol: str = "", gateway_name: str = "", reference: str = ""
+    ):
+        """
+        Get read-only dict view (vt_orderid: order) of active orders without
+        copy, filtered by vt_symbol, gateway_name or reference (only the
+        first one given is used).
+
+        If no filter given, return view of all active orders.
+        """
+        if vt_symbol:
+            active_orders = self.symbol_active_orders.get(vt_symbol, {})
+        elif gateway_name:
+            active_orders = self.gateway_active_orders.get(gateway_name, {})
+        elif reference:
+            active_orders = self.reference_active_orders.get(reference, {})
+        else:
+            active_orders = self.active_orders
+
+        return MappingProxyType(active_orders)
+
+    def get_active_order_count(
+        self, vt_symbol: str = "", gateway_name: str = "", reference: str = ""
+    ):
+        """
+        Get number of active orders, filtered in the same way as
+        get_active_order_view.
+        """
+        return len(self.get_active_order_view(vt_symbol, gateway_name, reference))
+
+    def get_changes_since(self, event_type: str, seq: int = 0):
+        """
+        Get (latest seq, data list) of data type (by event type, e.g.
+        EVENT_ORDER) changed after seq, in order of change.
+
+        Pass the seq returned last time for the next query, so that only
+        changed data is returned. If changes after seq were already
+        dropped from log, all data in memory is returned instead.
+        """
+        with self.change_lock:
+            last_seq = self.change_seqs[event_type]
+
+            if seq < self.change_floors[event_type]:
+                return last_seq, list(self.change_data[event_type].values())
+
+            changes = []
+            for change_seq, data in reversed(self.change_logs[event_type].values()):
+                if change_seq <= seq:
+                    break
+                changes.append(data)
+
+        changes.reverse()
+        return last_seq, changes
 
 
 class EmailEngine(BaseEngine):
     """
     Provides email sending function for VN Trader.
+
+    SMTP connection is kept for reuse until idle for email.keepalive
+    seconds, and reconnected if lost. Emails to the same receiver within
+    email.window seconds are combined into one digest, and no more than
+    email.limit emails are sent every minute.
     """
 
     def __init__(self, main_engine: MainEngine, event_engine: EventEngine):
@@ -502,6 +840,14 @@ class EmailEngine(BaseEngine):
         self.queue = Queue()
         self.active = False
 
+        self.smtp = None
+        self.last_time = 0              # last time connection used
+
+        self.pending = {}               # receiver: [(subject, content)]
+        self.pending_times = {}         # receiver: time of first email pending
+        self.sent_times = deque()       # sending time in last minute
+        self.sent_count = 0
+
         self.main_engine.send_email = self.send_email
 
     def send_email(self, subject: str, content: str, receiver: str = ""):
@@ -514,30 +860,162 @@ class EmailEngine(BaseEngine):
         if not receiver:
             receiver = SETTINGS["email.receiver"]
 
-        msg = EmailMessage()
-        msg["From"] = SETTINGS["email.sender"]
-        msg["To"] = SETTINGS["email.receiver"]
-        msg["Subject"] = subject
-        msg.set_content(content)
-
-        self.queue.put(msg)
+        self.queue.put((subject, content, receiver))
 
     def run(self):
         """"""
         while self.active:
             try:
-                msg = self.queue.get(block=True, timeout=1)
-
-                with smtplib.SMTP_SSL(
-                    SETTINGS["email.server"], SETTINGS["email.port"]
-                ) as smtp:
-                    smtp.login(
-                        SETTINGS["email.username"], SETTINGS["email.password"]
-                    )
-                    smtp.send_message(msg)
+                subject, content, receiver = self.queue.get(block=True, timeout=0.1)
+                self.add_pending(subject, content, receiver)
             except Empty:
                 pass
 
+            self.send_pending(False)
+            self.check_idle()
+
+        # Send all emails left before exit
+        while not self.queue.empty():
+            self.add_pending(*self.queue.get())
+
+        self.send_pending(True)
+        self.disconnect()
+
+    def add_pending(self, subject: str, content: str, receiver: str):
+        """"""
+        if receiver not in self.pending:
+            self.pending[receiver] = []
+            self.pending_times[receiver] = monotonic()
+
+        self.pending[receiver].append((subject, content))
+
+    def send_pending(self, force: bool):
+        """
+        Send digest of each receiver after window passed and within rate
+        limit, or send all pending emails if force.
+        """
+        now = monotonic()
+        window = SETTINGS["email.window"]
+
+        for receiver, pending_time in list(self.pending_times.items()):
+            if not force:
+                if now - pending_time < window:
+                    continue
+
+                # Emails keep coalescing until limit allows sending
+                if not self.check_limit(now):
+                    break
+
+            self.pending_times.pop(receiver)
+            messages = self.pending.pop(receiver)
+
+            msg = self.create_message(receiver, messages)
+            self.deliver(msg)
+
+    def check_limit(self, now: float):
+        """
+        Check if one more email can be sent within rate limit.
+        """
+        limit = SETTINGS["email.limit"]
+        if not limit:
+            return True
+
+        sent_times = self.sent_times
+        while sent_times and now - sent_times[0] >= 60:
+            sent_times.popleft()
+
+        return len(sent_times) < limit
+
+    def create_message(self, receiver: str, messages: list):
+        """
+        Create email of one message, or digest of multiple messages.
+        """
+        if len(messages) == 1:
+            subject, content = messages[0]
+        else:
+            subject = f"{messages[0][0]}等{len(messages)}封邮件"
+
+            contents = [f"{s}\n\n{c}" for s, c in messages]
+            content = f"\n\n{'-' * 40}\n\n".join(contents)
+
+        msg = EmailMessage()
+        msg["From"] = SETTINGS["email.sender"]
+        msg["To"] = receiver
+        msg["Subject"] = subject
+        msg.set_content(content)
+        return msg
+
+    def deliver(self, msg: EmailMessage):
+        """
+        Send email with current connection, retry once with new connection
+        if failed.
+        """
+        for i in range(2):
+            try:
+                if not self.smtp:
+                    self.connect()
+
+                self.smtp.send_message(msg)
+                break
+            # Refused by server, which is not retried and connection is
+            # still usable
+            except (smtplib.SMTPRecipientsRefused, smtplib.SMTPDataError) as e:
+                self.main_engine.write_log(f"邮件发送失败：{e}")
+                return
+            except OSError as e:
+                self.disconnect()
+                if i:
+                    self.main_engine.write_log(f"邮件发送失败：{e}")
+                    return
+            # Invalid email will never be sent successfully
+            except Exception as e:
+                self.main_engine.write_log(f"邮件发送失败：{e}")
+                return
+
+        self.last_time = monotonic()
+        self.sent_times.append(self.last_time)
+        self.sent_count += 1
+
+    def connect(self):
+        """"""
+        if SETTINGS["email.ssl"]:
+            smtp = smtplib.SMTP_SSL(
+                SETTINGS["email.server"], SETTINGS["email.port"], timeout=30
+            )
+        else:
+            smtp = smtplib.SMTP(
+                SETTINGS["email.server"], SETTINGS["email.port"], timeout=30
+            )
+
+        if SETTINGS["email.username"]:
+            try:
+                smtp.login(SETTINGS["email.username"], SETTINGS["email.password"])
+            except Exception:
+                smtp.close()
+                raise
+
+        self.smtp = smtp
+        self.last_time = monotonic()
+
+    def disconnect(self):
+        """"""
+        if not self.smtp:
+            return
+
+        try:
+            self.smtp.quit()
+        except OSError:
+            self.smtp.close()
+
+        self.smtp = None
+
+    def check_idle(self):
+        """
+        Close connection idle for too long, which may be closed by server.
+        """
+        if self.smtp and monotonic() - self.last_time > SETTINGS["email.keepalive"]:
+            self.disconnect()
+
     def start(self):
         """"""
         self.active = True
@@ -16,6 +16,7 @@ from .event import (
     EVENT_CONTRACT,
     EVENT_LOG,
 )
+from .archive import DataArchive
 from .object import (
     TickData,
     OrderData,
@@ -81,6 +82,20 @@ class BaseGateway(ABC):
         self.event_engine = event_engine
         self.gateway_name = gateway_name
 
+        self.register_topic()
+
+    def register_topic(self):
+        """
+        Register hierarchical topics into event engine, so that handlers
+        listening to event of a specific vt_symbol/vt_orderid/vt_accountid
+        are served from the one general event pushed.
+        """
+        self.event_engine.register_topic(EVENT_TICK, "vt_symbol")
+        self.event_engine.register_topic(EVENT_TRADE, "vt_symbol")
+        self.event_engine.register_topic(EVENT_ORDER, "vt_orderid")
+        self.event_engine.register_topic(EVENT_POSITION, "vt_symbol")
+        self.event_engine.register_topic(EVENT_ACCOUNT, "vt_accountid")
+
     def on_event(self, type: str, data: Any = None):
         """
         General event push.
@@ -91,42 +106,42 @@ class BaseGateway(ABC):
     def on_tick(self, tick: TickData):
         """
         Tick event push.
-        Tick event of a specific vt_symbol is also pushed.
+        Tick event of a specific vt_symbol is dispatched
+        from it by event engine.
         """
         self.on_event(EVENT_TICK, tick)
-        self.on_event(EVENT_TICK + tick.vt_symbol, tick)
 
     def on_trade(self, trade: TradeData):
         """
         Trade event push.
-        Trade event of a specific vt_symbol is also pushed.
+        Trade event of a specific vt_symbol is dispatched
+        from it by event engine.
         """
         self.on_event(EVENT_TRADE, trade)
-        self.on_event(EVENT_TRADE + trade.vt_symbol, trade)
 
     def on_order(self, order: OrderData):
         """
         Order event push.
-        Order event of a specific vt_orderid is also pushed.
+        Order event of a specific vt_orderid is dispatched
+        from it by event engine.
         """
         self.on_event(EVENT_ORDER, order)
-        self.on_event(EVENT_ORDER + order.vt_orderid, order)
 
     def on_position(self, position: PositionData):
         """
         Position event push.
-        Position event of a specific vt_symbol is also pushed.
+        Position event of a specific vt_symbol is dispatched
+        from it by event engine.
         """
         self.on_event(EVENT_POSITION, position)
-        self.on_event(EVENT_POSITION + position.vt_symbol, position)
 
     def on_account(self, account: AccountData):
         """
         Account event push.
-        Account event of a specific vt_accountid is also pushed.
+        Account event of a specific vt_accountid is dispatched
+        from it by event engine.
         """
         self.on_event(EVENT_ACCOUNT, account)
-        self.on_event(EVENT_ACCOUNT + account.vt_accountid, account)
 
     def on_log(self, log: LogData):
         """
@@ -274,10 +289,30 @@ class LocalOrderManager:
         self.order_count = 0
         self.orders = {}        # local_orderid:order
 
-        # Map between local and system orderid
+        # Finished orders are moved into archive
+        name = gateway.gateway_name.lower()
+        self.order_archive = DataArchive(
+            self.orders,
+            f"{name}_local_order",
+            event_engine=gateway.event_engine
+        )
+
+        # Map between local and system orderid, also archived after
+        # order finished
         self.local_sys_orderid_map = {}
         self.sys_local_orderid_map = {}
 
+        self.local_sys_archive = DataArchive(
+            self.local_sys_orderid_map,
+            f"{name}_local_sys_orderid",
+            event_engine=gateway.event_engine
+        )
+        self.sys_local_archive = DataArchive(
+            self.sys_local_orderid_map,
+            f"{name}_sys_local_orderid",
+            event_engine=gateway.event_engine
+        )
+
         # Push order data buf
         self.push_data_buf = {}  # sys_orderid:data
 
@@ -299,7 +334,7 @@ class LocalOrderManager:
         """
         Get local orderid with sys orderid.
         """
-        local_orderid = self.sys_local_orderid_map.get(sys_orderid, "")
+        local_orderid = self.sys_local_archive.get(sys_orderid, "")
 
         if not local_orderid:
             local_orderid = self.new_local_orderid()
@@ -311,7 +346,7 @@ class LocalOrderManager:
         """
         Get sys orderid with local orderid.
         """
-        sys_orderid = self.local_sys_orderid_map.get(local_orderid, "")
+        sys_orderid = self.local_sys_archive.get(local_orderid, "")
         return sys_orderid
 
     def update_orderid_map(self, local_orderid: str, sys_orderid: str):
@@ -343,7 +378,7 @@ class LocalOrderManager:
 
     def get_order_with_sys_orderid(self, sys_orderid: str):
         """"""
-        local_orderid = self.sys_local_orderid_map.get(sys_orderid, None)
+        local_orderid = self.sys_local_archive.get(sys_orderid, None)
         if not local_orderid:
             return None
         else:
@@ -351,7 +386,7 @@ class LocalOrderManager:
 
     def get_order_with_local_orderid(self, local_orderid: str):
         """"""
-        order = self.orders[local_orderid]
+        order = self.order_archive.get(local_orderid)
         return copy(order)
 
     def on_order(self, order: OrderData):
@@ -359,6 +394,15 @@ class LocalOrderManager:
         Keep an order buf before pushing it to gateway.
         """
         self.orders[order.orderid] = copy(order)
+
+        if not order.is_active():
+            self.order_archive.finish(order.orderid)
+
+            sys_orderid = self.local_sys_orderid_map.get(order.orderid, "")
+            if sys_orderid:
+                self.local_sys_archive.finish(order.orderid)
+                self.sys_local_archive.finish(sys_orderid)
+
         self.gateway.on_order(order)
 
     def cancel_order(self, req: CancelRequest):
@@ -379,3 +423,57 @@ class LocalOrderManager:
 
         req = self.cancel_request_buf.pop(local_orderid)
         self.gateway.cancel_order(req)
+
+
+class TickManager:
+    """
+    Management tool to keep latest tick of each symbol with copy-on-write,
+    instead of copying the whole tick every time before pushing it.
+
+    Tick pushed is never changed after: the first update after pushing
+    is applied on a new copy of it, while updates not pushed yet are
+    applied on the same tick without copy.
+    """
+
+    def __init__(self, gateway: BaseGateway):
+        """"""
+        self.gateway = gateway
+
+        self.ticks = {}         # symbol:tick
+        self.pushed = set()     # symbols with latest tick pushed
+
+    def add_tick(self, tick: TickData):
+        """
+        Add tick buffer of a symbol, usually when subscribing.
+        """
+        self.ticks[tick.symbol] = tick
+        self.pushed.discard(tick.symbol)
+
+    def get_tick(self, symbol: str):
+        """
+        Get latest tick of symbol for reading only.
+        """
+        return self.ticks.get(symbol, None)
+
+    def update_tick(self, symbol: str):
+        """
+        Get tick of symbol for updating, return None if not added.
+        """
+        tick = self.ticks.get(symbol, None)
+        if not tick:
+            return None
+
+        if symbol in self.pushed:
+            tick = copy(tick)
+            self.ticks[symbol] = tick
+            self.pushed.remove(symbol)
+
+        return tick
+
+    def push_tick(self, symbol: str):
+        """
+        Push latest tick of symbol to gateway.
+        """
+        tick = self.ticks[symbol]
+        self.pushed.add(symbol)
+        self.gateway.on_tick(tick)
@@ -0,0 +1,553 @@
+"""
+Streaming technical indicators updated incrementally bar by bar.
+
+Each indicator keeps only the state required for its next value, so
+updating is O(1) instead of recalculating talib over the whole window.
+Values are calculated in the same way as talib (same seeding and
+smoothing), so they are equal to talib results of the same data.
+
+All indicators provide update_bar(bar), which can be used as callback
+of BarGenerator directly, or added into ArrayManager by add_indicator.
+"""
+
+from abc import ABC, abstractmethod
+from collections import deque
+from math import sqrt
+
+from .object import BarData
+
+# Same threshold as TA_IS_ZERO of talib
+ZERO = 0.00000001
+
+
+def is_zero(value: float):
+    """"""
+    return -ZERO < value < ZERO
+
+
+def get_true_range(high: float, low: float, pre_close: float):
+    """"""
+    return max(high - low, abs(pre_close - high), abs(low - pre_close))
+
+
+class Indicator(ABC):
+    """
+    Base class of streaming indicator.
+    """
+
+    def __init__(self):
+        """"""
+        self.count = 0
+        self.inited = False
+
+    @abstractmethod
+    def update_bar(self, bar: BarData):
+        """
+        Update indicator with new bar.
+        """
+        pass
+
+
+class PriceIndicator(Indicator):
+    """
+    Base class of indicator calculated from close price only, which can
+    also be updated with any value by update.
+    """
+
+    def __init__(self):
+        """"""
+        super().__init__()
+
+        self.value = 0
+
+    def update_bar(self, bar: BarData):
+        """"""
+        return self.update(bar.close_price)
+
+    @abstractmethod
+    def update(self, price: float):
+        """
+        Update indicator with new price, and return the latest value.
+        """
+        pass
+
+
+class SmaIndicator(PriceIndicator):
+    """
+    Simple moving average, same as talib.SMA.
+    """
+
+    def __init__(self, n: int):
+        """"""
+        super().__init__()
+
+        self.n = n
+        self.prices = deque()
+        self.total = 0
+
+    def update(self, price: float):
+        """"""
+        self.count += 1
+
+        if len(self.prices) == self.n:
+            self.total -= self.prices.popleft()
+
+        self.prices.append(price)
+        self.total += price
+
+        if self.count >= self.n:
+            self.inited = True
+            self.value = self.total / self.n
+
+        return self.value
+
+
+class EmaIndicator(PriceIndicator):
+    """
+    Exponential moving average seeded with SMA of first n prices,
+    same as talib.EMA.
+    """
+
+    def __init__(self, n: int):
+        """"""
+        super().__init__()
+
+        self.n = n
+        self.k = 2 / (n + 1)
+        self.total = 0
+
+    def update(self, price: float):
+        """"""
+        self.count += 1
+
+        if self.inited:
+            self.value = (price - self.value) * self.k + self.value
+        else:
+            self.total += price
+
+            if self.count == self.n:
+                self.inited = True
+                self.value = self.total / self.n
+
+        return self.value
+
+
+class StdIndicator(PriceIndicator):
+    """
+    Population standard deviation, same as talib.STDDEV.
+    """
+
+    def __init__(self, n: int, dev: float = 1):
+        """"""
+        super().__init__()
+
+        self.n = n
+        self.dev = dev
+
+        self.prices = deque()
+        self.total = 0
+        self.square_total = 0
+
+    def update(self, price: float):
+        """"""
+        self.count += 1
+
+        if len(self.prices) == self.n:
+            old_price = self.prices.popleft()
+            self.total -= old_price
+            self.square_total -= old_price * old_price
+
+        self.prices.append(price)
+        self.total += price
+        self.square_total += price * price
+
+        if self.count >= self.n:
+            self.inited = True
+
+            mean = self.total / self.n
+            variance = self.square_total / self.n - mean * mean
+
+            if variance < ZERO:
+                self.value = 0
+            else:
+                self.value = sqrt(variance) * self.dev
+
+        return self.value
+
+
+class RsiIndicator(PriceIndicator):
+    """
+    Relative strength index with Wilder's smoothing, same as talib.RSI.
+    """
+
+    def __init__(self, n: int):
+        """"""
+        super().__init__()
+
+        self.n = n
+        self.pre_price = 0
+        self.gain = 0
+        self.loss = 0
+
+    def update(self, price: float):
+        """"""
+        self.count += 1
+
+        if self.count == 1:
+            self.pre_price = price
+            return self.value
+
+        change = price - self.pre_price
+        self.pre_price = price
+
+        if self.inited:
+            self.gain *= self.n - 1
+            self.loss *= self.n - 1
+
+        if change < 0:
+            self.loss -= change
+        else:
+            self.gain += change
+
+        # First value is average of n changes
+        if self.inited or self.count == self.n + 1:
+            self.inited = True
+            self.gain /= self.n
+            self.loss /= self.n
+
+            total = self.gain + self.loss
+            if is_zero(total):
+                self.value = 0
+            else:
+                self.value = 100 * (self.gain / total)
+
+        return self.value
+
+
+class MacdIndicator(PriceIndicator):
+    """
+    MACD, same as talib.MACD.
+
+    Like talib, fast EMA is seeded with SMA of the last fast_period prices
+    when slow EMA seeded, so that both lines start at the same bar.
+    """
+
+    def __init__(self, fast_period: int, slow_period: int, signal_period: int):
+        """"""
+        super().__init__()
+
+        self.fast_period = fast_period
+        self.slow_period = slow_period
+
+        self.prices = deque(maxlen=slow_period)
+        self.fast_k = 2 / (fast_period + 1)
+        self.slow_k = 2 / (slow_period + 1)
+        self.fast_ema = 0
+        self.slow_ema = 0
+
+        self.signal_ema = EmaIndicator(signal_period)
+
+        self.macd = 0
+        self.signal = 0
+        self.hist = 0
+
+    def update(self, price: float):
+        """"""
+        self.count += 1
+
+        if self.count > self.slow_period:
+            self.fast_ema = (price - self.fast_ema) * self.fast_k + self.fast_ema
+            self.slow_ema = (price - self.slow_ema) * self.slow_k + self.slow_ema
+        else:
+            self.prices.append(price)
+            if self.count < self.slow_period:
+                return self.value
+
+            fast_prices = list(self.prices)[-self.fast_period:]
+            self.fast_ema = sum(fast_prices) / self.fast_period
+            self.slow_ema = sum(self.prices) / self.slow_period
+            self.prices = None
+
+        macd = self.fast_ema - self.slow_ema
+        signal = self.signal_ema.update(macd)
+
+        if self.signal_ema.inited:
+            self.inited = True
+
+            self.macd = macd
+            self.signal = signal
+            self.hist = macd - signal
+            self.value = macd
+
+        return self.value
+
+
+class AtrIndicator(Indicator):
+    """
+    Average true range with Wilder's smoothing, same as talib.ATR.
+    """
+
+    def __init__(self, n: int):
+        """"""
+        super().__init__()
+
+        self.n = n
+        self.pre_close = 0
+        self.total = 0
+        self.value = 0
+
+    def update_bar(self, bar: BarData):
+        """"""
+        self.count += 1
+
+        if self.count > 1:
+            tr = get_true_range(bar.high_price, bar.low_price, self.pre_close)
+
+            if self.inited:
+                self.value = (self.value * (self.n - 1) + tr) / self.n
+            else:
+                self.total += tr
+
+                # First value is average of first n true ranges
+                if self.count == self.n + 1:
+                    self.inited = True
+                    self.value = self.total / self.n
+
+        self.pre_close = bar.close_price
+        return self.value
+
+
+class CciIndicator(Indicator):
+    """
+    Commodity channel index, same as talib.CCI.
+
+    Mean deviation has to be summed over the n typical prices, so each
+    update costs O(n) of the CCI period rather than O(1), which is still
+    independent of the window size of ArrayManager.
+    """
+
+    def __init__(self, n: int):
+        """"""
+        super().__init__()
+
+        self.n = n
+        self.prices = deque(maxlen=n)
+        self.value = 0
+
+    def update_bar(self, bar: BarData):
+        """"""
+        self.count += 1
+
+        price = (bar.high_price + bar.low_price + bar.close_price) / 3
+        self.prices.append(price)
+
+        if self.count >= self.n:
+            self.inited = True
+
+            average = sum(self.prices) / self.n
+            deviation = sum(abs(average - p) for p in self.prices) / self.n
+
+            diff = price - average
+            if diff and deviation:
+                self.value = diff / (0.015 * deviation)
+            else:
+                self.value = 0
+
+        return self.value
+
+
+class AdxIndicator(Indicator):
+    """
+    Average directional movement index, same as talib.ADX.
+    """
+
+    def __init__(self, n: int):
+        """"""
+        super().__init__()
+
+        self.n = n
+
+        self.pre_high = 0
+        self.pre_low = 0
+        self.pre_close = 0
+
+        self.plus_dm = 0
+        self.minus_dm = 0
+        self.tr = 0
+        self.dx_total = 0
+        self.value = 0
+
+    def update_bar(self, bar: BarData):
+        """"""
+        self.count += 1
+        n = self.n
+
+        high = bar.high_price
+        low = bar.low_price
+
+        if self.count == 1:
+            self.pre_high = high
+            self.pre_low = low
+            self.pre_close = bar.close_price
+            return self.value
+
+        plus_diff = high - self.pre_high
+        minus_diff = self.pre_low - low
+        self.pre_high = high
+        self.pre_low = low
+
+        tr = get_true_range(high, low, self.pre_close)
+        self.pre_close = bar.close_price
+
+        # Sum of first n - 1 movements, then smoothed by Wilder's method
+        if self.count > n:
+            self.plus_dm -= self.plus_dm / n
+            self.minus_dm -= self.minus_dm / n
+            self.tr = self.tr - self.tr / n + tr
+        else:
+            self.tr += tr
+
+        if minus_diff > 0 and plus_diff < minus_diff:
+            self.minus_dm += minus_diff
+        elif plus_diff > 0 and plus_diff > minus_diff:
+            self.plus_dm += plus_diff
+
+        if self.count <= n:
+            return self.value
+
+        dx = self.get_dx()
+
+        # First ADX is average of first n DX
+        if self.inited:
+            if dx is not None:
+                self.value = (self.value * (n - 1) + dx) / n
+        else:
+            if dx is not None:
+                self.dx_total += dx
+
+            if self.count == n * 2:
+                self.inited = True
+                self.value = self.dx_total / n
+
+        return self.value
+
+    def get_dx(self):
+        """
+        Get DX of latest bar, return None if not available.
+        """
+        if is_zero(self.tr):
+            return None
+
+        minus_di = 100 * (self.minus_dm / self.tr)
+        plus_di = 100 * (self.plus_dm / self.tr)
+
+        total = minus_di + plus_di
+        if is_zero(total):
+            return None
+
+        return 100 * (abs(minus_di - plus_di) / total)
+
+
+class DonchianIndicator(Indicator):
+    """
+    Donchian channel of highest high and lowest low, same as talib.MAX
+    of high and talib.MIN of low.
+
+    Monotonic queues are used, so each update is amortized O(1).
+    """
+
+    def __init__(self, n: int):
+        """"""
+        super().__init__()
+
+        self.n = n
+        self.highs = deque()        # (count, high) in decreasing order
+        self.lows = deque()         # (count, low) in increasing order
+
+        self.up = 0
+        self.down = 0
+
+    def update_bar(self, bar: BarData):
+        """"""
+        self.count += 1
+        count = self.count
+        start = count - self.n
+
+        highs = self.highs
+        while highs and highs[-1][1] <= bar.high_price:
+            highs.pop()
+        highs.append((count, bar.high_price))
+        if highs[0][0] <= start:
+            highs.popleft()
+
+        lows = self.lows
+        while lows and lows[-1][1] >= bar.low_price:
+            lows.pop()
+        lows.append((count, bar.low_price))
+        if lows[0][0] <= start:
+            lows.popleft()
+
+        if count >= self.n:
+            self.inited = True
+            self.up = highs[0][1]
+            self.down = lows[0][1]
+
+        return self.up, self.down
+
+
+class BollIndicator(Indicator):
+    """
+    Bollinger channel, same as ArrayManager.boll.
+    """
+
+    def __init__(self, n: int, dev: float):
+        """"""
+        super().__init__()
+
+        self.dev = dev
+        self.sma = SmaIndicator(n)
+        self.std = StdIndicator(n)
+
+        self.up = 0
+        self.down = 0
+
+    def update_bar(self, bar: BarData):
+        """"""
+        mid = self.sma.update(bar.close_price)
+        std = self.std.update(bar.close_price)
+
+        if self.sma.inited:
+            self.inited = True
+            self.up = mid + std * self.dev
+            self.down = mid - std * self.dev
+
+        return self.up, self.down
+
+
+class KeltnerIndicator(Indicator):
+    """
+    Keltner channel, same as ArrayManager.keltner.
+    """
+
+    def __init__(self, n: int, dev: float):
+        """"""
+        super().__init__()
+
+        self.dev = dev
+        self.sma = SmaIndicator(n)
+        self.atr = AtrIndicator(n)
+
+        self.up = 0
+        self.down = 0
+
+    def update_bar(self, bar: BarData):
+        """"""
+        mid = self.sma.update(bar.close_price)
+        atr = self.atr.update_bar(bar)
+
+        if self.atr.inited:
+            self.inited = True
+            self.up = mid + atr * self.dev
+            self.down = mid - atr * self.dev
+
+        return self.up, self.down
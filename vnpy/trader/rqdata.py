@@ -1,6 +1,8 @@
 from datetime import datetime, timedelta
 from typing import List
 
+import numpy as np
+from pandas import DataFrame
 from rqdatac import init as rqdata_init
 from rqdatac.services.basic import all_instruments as rqdata_all_instruments
 from rqdatac.services.get_price import get_price as rqdata_get_price
@@ -8,7 +10,7 @@ from rqdatac.share.errors import AuthenticationFailed
 
 from .setting import SETTINGS
 from .constant import Exchange, Interval
-from .object import BarData, HistoryRequest
+from .object import BarData, BarBatch, HistoryRequest
 
 
 INTERVAL_VT2RQ = {
@@ -106,6 +108,65 @@ class RqdataClient:
         symbol = req.symbol
         exchange = req.exchange
         interval = req.interval
+
+        df = self.query_price(req)
+        if df is None:
+            return None
+
+        # For adjust timestamp from bar close point (RQData) to open point (VN Trader)
+        adjustment = INTERVAL_ADJUSTMENT_MAP[interval]
+
+        data: List[BarData] = []
+
+        for ix, row in df.iterrows():
+            bar = BarData(
+                symbol=symbol,
+                exchange=exchange,
+                interval=interval,
+                datetime=row.name.to_pydatetime() - adjustment,
+                open_price=row["open"],
+                high_price=row["high"],
+                low_price=row["low"],
+                close_price=row["close"],
+                volume=row["volume"],
+                gateway_name="RQ"
+            )
+            data.append(bar)
+
+        return data
+
+    def query_history_batch(self, req: HistoryRequest):
+        """
+        Query history bar data from RQData as BarBatch, without creating
+        BarData objects.
+        """
+        df = self.query_price(req)
+        if df is None:
+            return None
+
+        adjustment = INTERVAL_ADJUSTMENT_MAP[req.interval]
+
+        data = np.zeros(len(df), dtype=BarBatch.dtype)
+        if len(df):
+            data["datetime"] = (df.index - adjustment).values
+            data["open_price"] = df["open"].values
+            data["high_price"] = df["high"].values
+            data["low_price"] = df["low"].values
+            data["close_price"] = df["close"].values
+            data["volume"] = df["volume"].values
+
+        return BarBatch(req.symbol, req.exchange, req.interval, data, "RQ")
+
+    def query_price(self, req: HistoryRequest):
+        """
+        Query price DataFrame of history bar data from RQData.
+
+        Return None if symbol or interval not supported, and empty
+        DataFrame if no data.
+        """
+        symbol = req.symbol
+        exchange = req.exchange
+        interval = req.interval
         start = req.start
         end = req.end
 
@@ -117,9 +178,6 @@ class RqdataClient:
         if not rq_interval:
             return None
 
-        # For adjust timestamp from bar close point (RQData) to open point (VN Trader)
-        adjustment = INTERVAL_ADJUSTMENT_MAP[interval]
-
         # For querying night trading period data
         end += timedelta(1)
 
@@ -132,25 +190,9 @@ class RqdataClient:
             adjust_type="none"
         )
 
-        data: List[BarData] = []
-
-        if df is not None:
-            for ix, row in df.iterrows():
-                bar = BarData(
-                    symbol=symbol,
-                    exchange=exchange,
-                    interval=interval,
-                    datetime=row.name.to_pydatetime() - adjustment,
-                    open_price=row["open"],
-                    high_price=row["high"],
-                    low_price=row["low"],
-                    close_price=row["close"],
-                    volume=row["volume"],
-                    gateway_name="RQ"
-                )
-                data.append(bar)
-
-        return data
+        if df is None:
+            df = DataFrame()
+        return df
 
 
 rqdata_client = RqdataClient()
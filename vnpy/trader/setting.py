@@ -14,6 +14,9 @@ SETTINGS = {
     "log.level": CRITICAL,
     "log.console": True,
     "log.file": True,
+    "log.buffer_size": 100000,  # log dropped if more buffered before written
+    "log.interval": 0.1,        # seconds between batch writes
+    "log.max_bytes": 0,         # log file rotated over size, 0 for daily only
 
     "email.server": "smtp.qq.com",
     "email.port": 465,
@@ -21,6 +24,10 @@ SETTINGS = {
     "email.password": "",
     "email.sender": "",
     "email.receiver": "",
+    "email.ssl": True,
+    "email.window": 5,          # seconds to combine emails to same receiver
+    "email.limit": 20,          # emails sent every minute, 0 for no limit
+    "email.keepalive": 60,      # seconds before idle connection closed
 
     "rqdata.username": "",
     "rqdata.password": "",
@@ -32,6 +39,10 @@ SETTINGS = {
     "database.user": "root",
     "database.password": "",
     "database.authentication_source": "admin",  # for mongodb
+
+    "archive.count": 100000,    # finished orders/trades kept in memory, 0 for no limit
+    "archive.age": 0,           # seconds before finished data archived, 0 for no limit
+    "archive.path": "",         # sqlite file of archive, empty for in memory
 }
 
 # Load global setting from json file.
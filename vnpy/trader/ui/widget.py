@@ -185,6 +185,7 @@ class BaseMonitor(QtWidgets.QTableWidget):
     event_type = ""
     data_key = ""
     sorting = False
+    conflate = False
     headers = {}
 
     signal = QtCore.pyqtSignal(Event)
@@ -239,7 +240,9 @@ class BaseMonitor(QtWidgets.QTableWidget):
         """
         if self.event_type:
             self.signal.connect(self.process_event)
-            self.event_engine.register(self.event_type, self.signal.emit)
+            self.event_engine.register(
+                self.event_type, self.signal.emit, self.conflate
+            )
 
     def process_event(self, event):
         """
@@ -344,6 +347,7 @@ class TickMonitor(BaseMonitor):
     event_type = EVENT_TICK
     data_key = "vt_symbol"
     sorting = True
+    conflate = True
 
     headers = {
         "symbol": {"display": "代码", "cell": BaseCell, "update": False},
@@ -711,7 +715,9 @@ class TradingWidget(QtWidgets.QWidget):
     def register_event(self):
         """"""
         self.signal_tick.connect(self.process_tick_event)
-        self.event_engine.register(EVENT_TICK, self.signal_tick.emit)
+        self.event_engine.register(
+            EVENT_TICK, self.signal_tick.emit, conflate=True
+        )
 
     def process_tick_event(self, event: Event):
         """"""
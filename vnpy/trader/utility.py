@@ -3,13 +3,14 @@ General utility functions.
 """
 
 import json
+from functools import wraps
 from pathlib import Path
-from typing import Callable
+from typing import Callable, Dict, Sequence
 
 import numpy as np
 import talib
 
-from .object import BarData, TickData
+from .object import BarData, TickData, BarBatch, TickBatch
 from .constant import Exchange, Interval
 
 
@@ -263,24 +264,218 @@ class BarGenerator:
         self.bar = None
 
 
+def resample_tick_batch(batch: TickBatch, include_last: bool = False):
+    """
+    Generate 1 minute bars from ticks in one vectorized pass, same as
+    feeding them into BarGenerator.update_tick one by one.
+
+    The last bar is only finished by tick of next minute in BarGenerator,
+    so it is not included unless include_last (like calling generate).
+    """
+    data = batch.data
+    data = data[data["last_price"] != 0]
+
+    bars = BarBatch(
+        batch.symbol,
+        batch.exchange,
+        Interval.MINUTE,
+        gateway_name=batch.gateway_name,
+        tzinfo=batch.tzinfo
+    )
+    if not len(data):
+        return bars
+
+    # New bar is started when minute of tick changed
+    minute_dt = data["datetime"].astype("datetime64[m]")
+    minute = minute_dt.astype(np.int64) % 60
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(minute)) + 1))
+
+    if not include_last:
+        if len(starts) == 1:
+            return bars
+
+        data = data[:starts[-1]]
+        minute_dt = minute_dt[:starts[-1]]
+        starts = starts[:-1]
+
+    ends = np.concatenate((starts[1:], [len(data)])) - 1
+
+    # Volume change of each tick is added into the bar it belongs to
+    volume_change = np.zeros(len(data))
+    volume_change[1:] = np.maximum(np.diff(data["volume"]), 0)
+
+    price = data["last_price"]
+    result = np.zeros(len(starts), dtype=BarBatch.dtype)
+    result["datetime"] = minute_dt[ends]
+    result["open_price"] = price[starts]
+    result["high_price"] = np.maximum.reduceat(price, starts)
+    result["low_price"] = np.minimum.reduceat(price, starts)
+    result["close_price"] = price[ends]
+    result["volume"] = np.add.reduceat(volume_change, starts)
+    result["open_interest"] = data["open_interest"][ends]
+
+    bars.data = result
+    return bars
+
+
+def find_window_ends(dt: np.ndarray, window: int, interval: Interval):
+    """
+    Find index of 1 minute bars by which window bars are finished in
+    BarGenerator.update_bar, from datetime64 array of the bars.
+    """
+    if interval == Interval.MINUTE:
+        minute = dt.astype("datetime64[m]").astype(np.int64) % 60
+        finished = (minute + 1) % window == 0
+    elif interval == Interval.HOUR:
+        hour = dt.astype("datetime64[h]").astype(np.int64) % 24
+        finished = np.zeros(len(dt), dtype=bool)
+        finished[1:] = hour[1:] != hour[:-1]
+
+        if window > 1:
+            changes = np.flatnonzero(finished)
+            finished[changes] = False
+            finished[changes[window - 1::window]] = True
+    else:
+        finished = np.zeros(len(dt), dtype=bool)
+
+    return np.flatnonzero(finished)
+
+
+def resample_bar_batch(
+    batch: BarBatch,
+    window: int,
+    interval: Interval = Interval.MINUTE,
+    include_last: bool = False
+):
+    """
+    Generate x minute or x hour bars from 1 minute bars in one vectorized
+    pass, same as feeding them into BarGenerator.update_bar one by one.
+
+    The last window bar not finished yet is not included unless
+    include_last.
+    """
+    data = batch.data
+
+    bars = BarBatch(
+        batch.symbol,
+        batch.exchange,
+        interval,
+        gateway_name=batch.gateway_name,
+        tzinfo=batch.tzinfo
+    )
+    if not len(data):
+        return bars
+
+    ends = find_window_ends(data["datetime"], window, interval)
+    if include_last and (not len(ends) or ends[-1] != len(data) - 1):
+        ends = np.append(ends, len(data) - 1)
+
+    if not len(ends):
+        return bars
+
+    data = data[:ends[-1] + 1]
+    starts = np.concatenate(([0], ends[:-1] + 1))
+
+    if interval == Interval.MINUTE:
+        start_dt = data["datetime"][starts].astype("datetime64[m]")
+    else:
+        start_dt = data["datetime"][starts].astype("datetime64[h]")
+
+    result = np.zeros(len(starts), dtype=BarBatch.dtype)
+    result["datetime"] = start_dt
+    result["open_price"] = data["open_price"][starts]
+    result["high_price"] = np.maximum.reduceat(data["high_price"], starts)
+    result["low_price"] = np.minimum.reduceat(data["low_price"], starts)
+    result["close_price"] = data["close_price"][ends]
+    result["volume"] = np.add.reduceat(np.trunc(data["volume"]), starts)
+    result["open_interest"] = data["open_interest"][ends]
+
+    bars.data = result
+    return bars
+
+
+def cache_indicator(func: Callable):
+    """
+    Cache result of ArrayManager indicator function by its parameters
+    (as passed), until next bar is updated into array manager.
+
+    Cached arrays are shared between callers, and should not be modified.
+    """
+    name = func.__name__
+
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        """"""
+        if kwargs:
+            key = (name, args, tuple(sorted(kwargs.items())))
+        else:
+            key = (name, args)
+
+        cache = self.indicator_cache
+        if key in cache:
+            self.cache_hits += 1
+            return cache[key]
+
+        self.cache_misses += 1
+        result = func(self, *args, **kwargs)
+        cache[key] = result
+        return result
+
+    return wrapper
+
+
 class ArrayManager(object):
     """
     For:
     1. time series container of bar data
     2. calculating technical indicator value
+
+    Data is kept in a ring buffer of double size: every value is written
+    twice (at index and index + size), so that the latest size values are
+    always a continuous slice of buffer in time order. Updating a bar is
+    O(1) no matter how large the size is, and arrays returned are views
+    of buffer without copy, which can be passed to talib directly.
+
+    Extra fields (e.g. values calculated by strategy) can be added with
+    fields, and updated by update_field after each update_bar.
+
+    Streaming indicators (see vnpy.trader.indicator) added by add_indicator
+    are updated together with every new bar.
+
+    Results of indicator functions are cached within each bar, so calling
+    the same indicator with same parameters again (e.g. by several signals
+    of one strategy) costs only a dict lookup.
     """
 
-    def __init__(self, size=100):
+    bar_fields = ("open", "high", "low", "close", "volume", "open_interest")
+
+    def __init__(self, size=100, fields: Sequence[str] = ()):
         """Constructor"""
         self.count = 0
         self.size = size
         self.inited = False
 
-        self.open_array = np.zeros(size)
-        self.high_array = np.zeros(size)
-        self.low_array = np.zeros(size)
-        self.close_array = np.zeros(size)
-        self.volume_array = np.zeros(size)
+        self.fields = list(self.bar_fields) + list(fields)
+        self.field_index = {name: ix for ix, name in enumerate(self.fields)}
+
+        self.buffer = np.zeros((len(self.fields), size * 2))
+        self.ix = 0         # index of buffer to write next bar
+
+        self.extra_rows = self.buffer[len(self.bar_fields):]
+
+        self.indicators = []
+
+        self.indicator_cache = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def add_indicator(self, indicator):
+        """
+        Add a streaming indicator to be updated with every new bar, and
+        return the indicator.
+        """
+        self.indicators.append(indicator)
+        return indicator
 
     def update_bar(self, bar):
         """
@@ -290,17 +485,116 @@ class ArrayManager(object):
         if not self.inited and self.count >= self.size:
             self.inited = True
 
-        self.open_array[:-1] = self.open_array[1:]
-        self.high_array[:-1] = self.high_array[1:]
-        self.low_array[:-1] = self.low_array[1:]
-        self.close_array[:-1] = self.close_array[1:]
-        self.volume_array[:-1] = self.volume_array[1:]
+        if self.indicator_cache:
+            self.indicator_cache.clear()
+
+        buffer = self.buffer
+        ix = self.ix
+        ix2 = ix + self.size
+
+        buffer[0, ix] = buffer[0, ix2] = bar.open_price
+        buffer[1, ix] = buffer[1, ix2] = bar.high_price
+        buffer[2, ix] = buffer[2, ix2] = bar.low_price
+        buffer[3, ix] = buffer[3, ix2] = bar.close_price
+        buffer[4, ix] = buffer[4, ix2] = bar.volume
+        buffer[5, ix] = buffer[5, ix2] = bar.open_interest
+
+        # Clear value of extra fields left by bar of size ago
+        if len(self.extra_rows):
+            self.extra_rows[:, ix] = self.extra_rows[:, ix2] = 0
+
+        self.ix = (ix + 1) % self.size
+
+        for indicator in self.indicators:
+            indicator.update_bar(bar)
+
+    def update_batch(self, batch: BarBatch):
+        """
+        Update all bars of batch in one shot, same as calling update_bar
+        with each bar (e.g. for warming up with history data).
+        """
+        if not len(batch):
+            return
+
+        self.count += len(batch)
+        if not self.inited and self.count >= self.size:
+            self.inited = True
 
-        self.open_array[-1] = bar.open_price
-        self.high_array[-1] = bar.high_price
-        self.low_array[-1] = bar.low_price
-        self.close_array[-1] = bar.close_price
-        self.volume_array[-1] = bar.volume
+        if self.indicator_cache:
+            self.indicator_cache.clear()
+
+        data = batch.data[-self.size:]
+        keep = self.size - len(data)
+
+        # Keep latest values already in buffer, extra fields of new bars
+        # are cleared
+        values = np.zeros((len(self.fields), self.size))
+        values[:, :keep] = self.buffer[:, self.ix + len(data):self.ix + self.size]
+
+        values[0, keep:] = data["open_price"]
+        values[1, keep:] = data["high_price"]
+        values[2, keep:] = data["low_price"]
+        values[3, keep:] = data["close_price"]
+        values[4, keep:] = data["volume"]
+        values[5, keep:] = data["open_interest"]
+
+        self.buffer[:, :self.size] = self.buffer[:, self.size:] = values
+        self.ix = 0
+
+        # Streaming indicators still need every bar
+        if self.indicators:
+            for bar in batch:
+                for indicator in self.indicators:
+                    indicator.update_bar(bar)
+
+    def update_field(self, name: str, value: float):
+        """
+        Update value of a field for the latest bar.
+        """
+        row = self.field_index[name]
+        ix = (self.ix - 1) % self.size
+
+        self.buffer[row, ix] = self.buffer[row, ix + self.size] = value
+
+        if self.indicator_cache:
+            self.indicator_cache.clear()
+
+    def get_array(self, name: str):
+        """
+        Get time series of a field, the latest value at the end.
+        """
+        row = self.field_index[name]
+        return self.buffer[row, self.ix:self.ix + self.size]
+
+    @property
+    def open_array(self):
+        """"""
+        return self.buffer[0, self.ix:self.ix + self.size]
+
+    @property
+    def high_array(self):
+        """"""
+        return self.buffer[1, self.ix:self.ix + self.size]
+
+    @property
+    def low_array(self):
+        """"""
+        return self.buffer[2, self.ix:self.ix + self.size]
+
+    @property
+    def close_array(self):
+        """"""
+        return self.buffer[3, self.ix:self.ix + self.size]
+
+    @property
+    def volume_array(self):
+        """"""
+        return self.buffer[4, self.ix:self.ix + self.size]
+
+    @property
+    def open_interest_array(self):
+        """"""
+        return self.buffer[5, self.ix:self.ix + self.size]
 
     @property
     def open(self):
@@ -337,6 +631,14 @@ class ArrayManager(object):
         """
         return self.volume_array
 
+    @property
+    def open_interest(self):
+        """
+        Get open interest time series.
+        """
+        return self.open_interest_array
+
+    @cache_indicator
     def sma(self, n, array=False):
         """
         Simple moving average.
@@ -346,6 +648,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def std(self, n, array=False):
         """
         Standard deviation
@@ -355,6 +658,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def cci(self, n, array=False):
         """
         Commodity Channel Index (CCI).
@@ -364,6 +668,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def atr(self, n, array=False):
         """
         Average True Range (ATR).
@@ -373,6 +678,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def rsi(self, n, array=False):
         """
         Relative Strenght Index (RSI).
@@ -382,6 +688,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def macd(self, fast_period, slow_period, signal_period, array=False):
         """
         MACD.
@@ -393,6 +700,7 @@ class ArrayManager(object):
             return macd, signal, hist
         return macd[-1], signal[-1], hist[-1]
 
+    @cache_indicator
     def adx(self, n, array=False):
         """
         ADX.
@@ -402,6 +710,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def boll(self, n, dev, array=False):
         """
         Bollinger Channel.
@@ -414,6 +723,7 @@ class ArrayManager(object):
 
         return up, down
 
+    @cache_indicator
     def keltner(self, n, dev, array=False):
         """
         Keltner Channel.
@@ -426,6 +736,7 @@ class ArrayManager(object):
 
         return up, down
 
+    @cache_indicator
     def donchian(self, n, array=False):
         """
         Donchian Channel.
@@ -438,6 +749,303 @@ class ArrayManager(object):
         return up[-1], down[-1]
 
 
+class MultiArrayManager(object):
+    """
+    For:
+    1. time series matrix (symbols x size) of bar data of many symbols
+    2. calculating indicator value of all symbols in one vectorized call
+    3. cross-sectional operations (rank, z-score, correlation) of symbols
+
+    Bars of the same datetime form one step of time series. Symbols
+    without bar in a step are filled with close price of the previous
+    step and 0 volume. Bars updated by update_bar are pending until bar
+    of a new datetime arrives, so call flush to update the last step
+    once bars of all symbols are received.
+
+    Indicator results are vectors with one value for each symbol in order
+    of vt_symbols, or matrices of symbols x size if array is True.
+    """
+
+    bar_fields = ArrayManager.bar_fields
+
+    def __init__(self, vt_symbols: Sequence[str], size: int = 100):
+        """Constructor"""
+        self.count = 0
+        self.size = size
+        self.inited = False
+
+        self.vt_symbols = list(vt_symbols)
+        self.symbol_index = {
+            vt_symbol: ix for ix, vt_symbol in enumerate(self.vt_symbols)
+        }
+
+        self.buffer = np.zeros(
+            (len(self.bar_fields), len(self.vt_symbols), size * 2)
+        )
+        self.ix = 0         # index of buffer to write next step
+
+        self.datetime = None
+        self.pending = {}   # vt_symbol: bar of step not updated yet
+
+    def update_bar(self, bar: BarData):
+        """
+        Update bar of one symbol, which can be used as callback of bar.
+
+        Bars received are updated as one step once bar of a new datetime
+        arrives, or flush is called.
+        """
+        if self.pending and bar.datetime != self.datetime:
+            self.flush()
+
+        self.datetime = bar.datetime
+        self.pending[bar.vt_symbol] = bar
+
+    def flush(self):
+        """
+        Update bars received for current datetime as one step.
+        """
+        if self.pending:
+            self.update_bars(self.pending)
+            self.pending = {}
+
+    def update_bars(self, bars: Dict[str, BarData]):
+        """
+        Update bars of all symbols for one step.
+        """
+        self.count += 1
+        if not self.inited and self.count >= self.size:
+            self.inited = True
+
+        buffer = self.buffer
+        ix = self.ix
+        ix2 = ix + self.size
+
+        # Fill with last close price for symbols without bar
+        values = buffer[:, :, ix - 1 + self.size].copy()
+        values[:3] = values[3]
+        values[4] = 0
+
+        symbol_index = self.symbol_index
+        for vt_symbol, bar in bars.items():
+            row = symbol_index.get(vt_symbol, None)
+            if row is None:
+                continue
+
+            values[:, row] = (
+                bar.open_price,
+                bar.high_price,
+                bar.low_price,
+                bar.close_price,
+                bar.volume,
+                bar.open_interest
+            )
+
+        buffer[:, :, ix] = buffer[:, :, ix2] = values
+        self.ix = (ix + 1) % self.size
+
+    @property
+    def open(self):
+        """"""
+        return self.buffer[0, :, self.ix:self.ix + self.size]
+
+    @property
+    def high(self):
+        """"""
+        return self.buffer[1, :, self.ix:self.ix + self.size]
+
+    @property
+    def low(self):
+        """"""
+        return self.buffer[2, :, self.ix:self.ix + self.size]
+
+    @property
+    def close(self):
+        """"""
+        return self.buffer[3, :, self.ix:self.ix + self.size]
+
+    @property
+    def volume(self):
+        """"""
+        return self.buffer[4, :, self.ix:self.ix + self.size]
+
+    @property
+    def open_interest(self):
+        """"""
+        return self.buffer[5, :, self.ix:self.ix + self.size]
+
+    def to_dict(self, values: np.ndarray):
+        """
+        Convert vector of symbols into dict of vt_symbol: value.
+        """
+        return dict(zip(self.vt_symbols, values))
+
+    def sma(self, n, array=False):
+        """
+        Simple moving average.
+        """
+        close = self.close
+        if not array:
+            return close[:, -n:].mean(axis=1)
+
+        total = rolling_sum(close, n)
+        return total / n
+
+    def std(self, n, array=False):
+        """
+        Standard deviation.
+        """
+        close = self.close
+        if not array:
+            return close[:, -n:].std(axis=1)
+
+        # Calculated from values of each window instead of rolling sum of
+        # squares, which loses precision with large prices
+        result = np.full(close.shape, np.nan)
+        if n <= self.size:
+            result[:, n - 1:] = rolling_window(close, n).std(axis=-1)
+        return result
+
+    def ema(self, n, array=False):
+        """
+        Exponential moving average, seeded with SMA of first n values.
+        """
+        close = self.close
+        result = np.full(close.shape, np.nan)
+
+        if n > self.size:
+            return result if array else result[:, -1]
+
+        k = 2 / (n + 1)
+        value = close[:, :n].mean(axis=1)
+        result[:, n - 1] = value
+
+        for ix in range(n, self.size):
+            value = (close[:, ix] - value) * k + value
+            result[:, ix] = value
+
+        if array:
+            return result
+        return result[:, -1]
+
+    def roc(self, n, array=False):
+        """
+        Rate of change in percentage.
+        """
+        close = self.close
+        result = np.full(close.shape, np.nan)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            result[:, n:] = (close[:, n:] / close[:, :-n] - 1) * 100
+
+        if array:
+            return result
+        return result[:, -1]
+
+    def atr(self, n, array=False):
+        """
+        Average True Range with Wilder's smoothing.
+        """
+        high = self.high
+        low = self.low
+        pre_close = self.close[:, :-1]
+
+        tr = np.maximum(high[:, 1:] - low[:, 1:], np.abs(high[:, 1:] - pre_close))
+        tr = np.maximum(tr, np.abs(low[:, 1:] - pre_close))
+
+        result = np.full(high.shape, np.nan)
+
+        # Not enough true range values, same as talib
+        if n >= self.size:
+            return result if array else result[:, -1]
+
+        value = tr[:, :n].mean(axis=1)
+        result[:, n] = value
+
+        for ix in range(n + 1, self.size):
+            value = (value * (n - 1) + tr[:, ix - 1]) / n
+            result[:, ix] = value
+
+        if array:
+            return result
+        return result[:, -1]
+
+    def donchian(self, n, array=False):
+        """
+        Donchian Channel.
+        """
+        if not array:
+            return self.high[:, -n:].max(axis=1), self.low[:, -n:].min(axis=1)
+
+        up = rolling_apply(self.high, n, np.maximum)
+        down = rolling_apply(self.low, n, np.minimum)
+        return up, down
+
+    def rank(self, values: np.ndarray):
+        """
+        Rank of symbols from 0 (smallest) along the first axis, ties are
+        ranked by order of vt_symbols.
+        """
+        return values.argsort(axis=0, kind="stable").argsort(axis=0, kind="stable")
+
+    def zscore(self, values: np.ndarray):
+        """
+        Z-score of symbols along the first axis.
+        """
+        std = values.std(axis=0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            result = (values - values.mean(axis=0)) / std
+        return np.where(std > 0, result, 0)
+
+    def corr(self, n):
+        """
+        Correlation matrix (symbols x symbols) of close price returns in
+        last n bars.
+        """
+        close = self.close[:, -n - 1:]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            returns = close[:, 1:] / close[:, :-1] - 1
+            return np.corrcoef(returns)
+
+
+def rolling_sum(values: np.ndarray, n: int):
+    """
+    Sum of last n values along the last axis, nan for first n - 1 ones.
+    """
+    result = np.full(values.shape, np.nan)
+
+    total = np.cumsum(values, axis=-1)
+    result[..., n - 1] = total[..., n - 1]
+    result[..., n:] = total[..., n:] - total[..., :-n]
+    return result
+
+
+def rolling_window(values: np.ndarray, n: int):
+    """
+    Read-only view of last n values for each position along the last
+    axis, starting from the n-th one.
+    """
+    shape = values.shape[:-1] + (values.shape[-1] - n + 1, n)
+    strides = values.strides + values.strides[-1:]
+    return np.lib.stride_tricks.as_strided(
+        values, shape=shape, strides=strides, writeable=False
+    )
+
+
+def rolling_apply(values: np.ndarray, n: int, func: np.ufunc):
+    """
+    Reduce last n values along the last axis by binary ufunc, nan for
+    first n - 1 ones.
+    """
+    result = np.full(values.shape, np.nan)
+
+    reduced = values[..., n - 1:].copy()
+    for i in range(1, n):
+        reduced = func(reduced, values[..., n - 1 - i:values.shape[-1] - i])
+
+    result[..., n - 1:] = reduced
+    return result
+
+
 def virtual(func: "callable"):
     """
     mark a function as "virtual", which means that this function can be override.